@@ -0,0 +1,27 @@
+"""add finished game hand uid
+
+Revision ID: 4a7d2e9c1f05
+Revises: 9e3b7c41d2a8
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "4a7d2e9c1f05"
+down_revision: Union[str, Sequence[str], None] = "9e3b7c41d2a8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("finished_games", sa.Column("hand_uid", sa.String(length=32), nullable=True))
+    op.create_unique_constraint("uq_finished_games_hand_uid", "finished_games", ["hand_uid"])
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_finished_games_hand_uid", "finished_games", type_="unique")
+    op.drop_column("finished_games", "hand_uid")
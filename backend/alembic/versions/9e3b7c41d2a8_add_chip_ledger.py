@@ -0,0 +1,44 @@
+"""add chip ledger
+
+Revision ID: 9e3b7c41d2a8
+Revises: 5c1c0a8f2c3d
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "9e3b7c41d2a8"
+down_revision: Union[str, Sequence[str], None] = "5c1c0a8f2c3d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "chip_ledger",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("amount", sa.BigInteger(), nullable=False),
+        sa.Column("reason", sa.String(length=16), nullable=False),
+        sa.Column("table_id", sa.Integer(), nullable=True),
+        sa.Column("compacted", sa.Boolean(), server_default="false", nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_chip_ledger_pending_user_id",
+        "chip_ledger",
+        ["user_id"],
+        unique=False,
+        postgresql_where=sa.text("NOT compacted"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_chip_ledger_pending_user_id", table_name="chip_ledger")
+    op.drop_table("chip_ledger")
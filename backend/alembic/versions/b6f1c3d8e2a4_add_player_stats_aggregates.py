@@ -0,0 +1,44 @@
+"""add player stats aggregates
+
+Revision ID: b6f1c3d8e2a4
+Revises: 4a7d2e9c1f05
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "b6f1c3d8e2a4"
+down_revision: Union[str, Sequence[str], None] = "4a7d2e9c1f05"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_POSITIONS = ("sb", "bb", "early", "late", "button")
+
+_COUNTERS: list[tuple[str, type[sa.types.TypeEngine]]] = [
+    ("vpip_hands", sa.Integer),
+    ("pfr_hands", sa.Integer),
+    ("three_bet_hands", sa.Integer),
+    ("three_bet_chances", sa.Integer),
+    ("aggressive_actions", sa.Integer),
+    ("passive_actions", sa.Integer),
+    ("flops_seen", sa.Integer),
+    ("showdowns", sa.Integer),
+    ("showdowns_won", sa.Integer),
+]
+for _position in _POSITIONS:
+    _COUNTERS.append((f"hands_{_position}", sa.Integer))
+    _COUNTERS.append((f"net_{_position}", sa.BigInteger))
+
+
+def upgrade() -> None:
+    for name, type_ in _COUNTERS:
+        op.add_column("player_stats", sa.Column(name, type_(), server_default="0", nullable=False))
+
+
+def downgrade() -> None:
+    for name, _type in reversed(_COUNTERS):
+        op.drop_column("player_stats", name)
@@ -0,0 +1,149 @@
+"""partition hand history by finished_at
+
+Revision ID: c4e8a1f7b9d2
+Revises: b6f1c3d8e2a4
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "c4e8a1f7b9d2"
+down_revision: Union[str, Sequence[str], None] = "b6f1c3d8e2a4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_FINISHED_GAMES_COLUMNS = "uuid, hand_uid, table_id, pot, board, winners"
+_PLAYER_GAMES_COLUMNS = (
+    "id, finished_game_uuid, table_id, user_id, hole_cards, bet, net_stack_delta, resulting_balance, won_hand"
+)
+# Monthly partitions created here: the month of the migration and the two after it. Later
+# ones are created at runtime by ``HistoryPartitions.ensure``.
+_INITIAL_MONTHS = 3
+
+
+def _month_start(index: int) -> datetime:
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def _create_monthly_partitions(table: str, now: datetime) -> None:
+    first = now.year * 12 + now.month - 1
+    for index in range(first, first + _INITIAL_MONTHS):
+        start, end = _month_start(index), _month_start(index + 1)
+        op.execute(
+            f'CREATE TABLE IF NOT EXISTS "{table}_p{start:%Y%m}" PARTITION OF "{table}" '
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        op.add_column("finished_games", sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True))
+        op.add_column("player_games", sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True))
+        return
+
+    op.execute("ALTER TABLE player_games DROP CONSTRAINT IF EXISTS player_games_finished_game_uuid_fkey")
+    op.execute("ALTER TABLE finished_games RENAME TO finished_games_legacy")
+    op.execute("ALTER TABLE player_games RENAME TO player_games_legacy")
+    op.execute("ALTER SEQUENCE finished_games_uuid_seq OWNED BY NONE")
+    op.execute("ALTER SEQUENCE player_games_id_seq OWNED BY NONE")
+    # Renaming a table keeps its index names; free them for the new tables.
+    op.execute("ALTER TABLE finished_games_legacy DROP CONSTRAINT finished_games_pkey")
+    op.execute("ALTER TABLE player_games_legacy DROP CONSTRAINT player_games_pkey")
+    op.drop_index("ix_player_games_user_id", table_name="player_games_legacy")
+    op.drop_index("ix_player_games_finished_game_uuid", table_name="player_games_legacy")
+
+    op.execute(
+        """
+        CREATE TABLE finished_games (
+            uuid integer NOT NULL DEFAULT nextval('finished_games_uuid_seq'),
+            finished_at timestamptz NOT NULL DEFAULT now(),
+            hand_uid varchar(32),
+            table_id integer NOT NULL,
+            pot bigint NOT NULL DEFAULT 0,
+            board varchar[] NOT NULL,
+            winners integer[] NOT NULL DEFAULT '{}',
+            PRIMARY KEY (uuid, finished_at)
+        ) PARTITION BY RANGE (finished_at)
+        """
+    )
+    op.execute(
+        """
+        CREATE TABLE player_games (
+            id integer NOT NULL DEFAULT nextval('player_games_id_seq'),
+            finished_at timestamptz NOT NULL,
+            finished_game_uuid integer NOT NULL,
+            table_id integer NOT NULL,
+            user_id integer NOT NULL REFERENCES users (id),
+            hole_cards varchar[] NOT NULL,
+            bet bigint NOT NULL DEFAULT 0,
+            net_stack_delta bigint NOT NULL DEFAULT 0,
+            resulting_balance bigint,
+            won_hand boolean NOT NULL DEFAULT false,
+            PRIMARY KEY (id, finished_at)
+        ) PARTITION BY RANGE (finished_at)
+        """
+    )
+    op.execute("ALTER SEQUENCE finished_games_uuid_seq OWNED BY finished_games.uuid")
+    op.execute("ALTER SEQUENCE player_games_id_seq OWNED BY player_games.id")
+
+    # Existing rows have no timestamp; they land in the partition of the migration time.
+    now = datetime.now(timezone.utc)
+    _create_monthly_partitions("finished_games", now)
+    _create_monthly_partitions("player_games", now)
+
+    op.execute(
+        f"INSERT INTO finished_games ({_FINISHED_GAMES_COLUMNS}, finished_at) "
+        f"SELECT {_FINISHED_GAMES_COLUMNS}, now() FROM finished_games_legacy"
+    )
+    op.execute(
+        f"INSERT INTO player_games ({_PLAYER_GAMES_COLUMNS}, finished_at) "
+        f"SELECT {_PLAYER_GAMES_COLUMNS}, now() FROM player_games_legacy"
+    )
+    op.execute("DROP TABLE player_games_legacy")
+    op.execute("DROP TABLE finished_games_legacy")
+    # Unique constraints on a partitioned table must include the partition key; replays of a
+    # spooled hand carry the same finished_at, so this still rejects duplicates.
+    op.create_unique_constraint("uq_finished_games_hand_uid", "finished_games", ["hand_uid", "finished_at"])
+    op.create_index("ix_player_games_finished_game_uuid", "player_games", ["finished_game_uuid"])
+    op.create_index("ix_player_games_user_id_id", "player_games", ["user_id", "id"])
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        op.drop_column("player_games", "finished_at")
+        op.drop_column("finished_games", "finished_at")
+        return
+
+    op.execute("ALTER TABLE finished_games RENAME TO finished_games_partitioned")
+    op.execute("ALTER TABLE player_games RENAME TO player_games_partitioned")
+    op.execute("ALTER SEQUENCE finished_games_uuid_seq OWNED BY NONE")
+    op.execute("ALTER SEQUENCE player_games_id_seq OWNED BY NONE")
+    op.execute(
+        f"CREATE TABLE finished_games AS SELECT {_FINISHED_GAMES_COLUMNS} FROM finished_games_partitioned WITH DATA"
+    )
+    op.execute(f"CREATE TABLE player_games AS SELECT {_PLAYER_GAMES_COLUMNS} FROM player_games_partitioned WITH DATA")
+    op.execute("DROP TABLE player_games_partitioned")
+    op.execute("DROP TABLE finished_games_partitioned")
+    op.execute("ALTER TABLE finished_games ADD PRIMARY KEY (uuid)")
+    op.execute("ALTER TABLE player_games ADD PRIMARY KEY (id)")
+    op.execute("ALTER TABLE finished_games ALTER COLUMN uuid SET DEFAULT nextval('finished_games_uuid_seq')")
+    op.execute("ALTER TABLE player_games ALTER COLUMN id SET DEFAULT nextval('player_games_id_seq')")
+    op.execute("ALTER SEQUENCE finished_games_uuid_seq OWNED BY finished_games.uuid")
+    op.execute("ALTER SEQUENCE player_games_id_seq OWNED BY player_games.id")
+    op.create_unique_constraint("uq_finished_games_hand_uid", "finished_games", ["hand_uid"])
+    op.create_foreign_key(
+        "player_games_finished_game_uuid_fkey",
+        "player_games",
+        "finished_games",
+        ["finished_game_uuid"],
+        ["uuid"],
+        ondelete="CASCADE",
+    )
+    op.create_foreign_key("player_games_user_id_fkey", "player_games", "users", ["user_id"], ["id"])
+    op.create_index("ix_player_games_user_id", "player_games", ["user_id"])
+    op.create_index("ix_player_games_finished_game_uuid", "player_games", ["finished_game_uuid"])
@@ -1,10 +1,22 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, TypeVar
+
 from passlib.context import CryptContext
 
+from backend.rest.core.config import settings
+
 pwd_context = CryptContext(
     schemes=["pbkdf2_sha256"],
     deprecated="auto",
 )
 
+T = TypeVar("T")
+
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
@@ -12,3 +24,87 @@ def hash_password(password: str) -> str:
 
 def verify_password(password: str, password_hash: str) -> bool:
     return pwd_context.verify(password, password_hash)
+
+
+class HashingBusyError(Exception):
+    pass
+
+
+@dataclass(slots=True)
+class HashingMetrics:
+    completed: int = 0
+    rejected: int = 0
+    total_hash_seconds: float = 0.0
+    max_hash_seconds: float = 0.0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+    def observe(self, wait_seconds: float, hash_seconds: float) -> None:
+        self.completed += 1
+        self.total_wait_seconds += wait_seconds
+        self.total_hash_seconds += hash_seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+        self.max_hash_seconds = max(self.max_hash_seconds, hash_seconds)
+
+    def snapshot(self) -> dict[str, float | int]:
+        completed = self.completed or 1
+        return {
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_hash_ms": round(self.total_hash_seconds / completed * 1000, 3),
+            "max_hash_ms": round(self.max_hash_seconds * 1000, 3),
+            "avg_wait_ms": round(self.total_wait_seconds / completed * 1000, 3),
+            "max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+        }
+
+
+class PasswordHasher:
+    """Runs passlib hashing on a dedicated bounded thread pool.
+
+    At most ``max_workers`` hashes run at once and at most ``max_queue`` more may wait
+    for a worker; anything beyond that is rejected with ``HashingBusyError`` instead of
+    piling up behind a login storm.
+    """
+
+    def __init__(self, *, max_workers: int, max_queue: int) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+        self._capacity = max_workers + max_queue
+        self._pending = 0
+        self.metrics = HashingMetrics()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        return await self._run(verify_password, password, password_hash)
+
+    async def _run(self, fn: Callable[..., T], *args: str) -> T:
+        if self._pending >= self._capacity:
+            self.metrics.rejected += 1
+            raise HashingBusyError("Password hashing queue is full")
+
+        submitted_at = time.perf_counter()
+
+        def _timed() -> tuple[T, float, float]:
+            started_at = time.perf_counter()
+            result = fn(*args)
+            return result, started_at - submitted_at, time.perf_counter() - started_at
+
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result, wait_seconds, hash_seconds = await loop.run_in_executor(self._executor, _timed)
+        finally:
+            self._pending -= 1
+        self.metrics.observe(wait_seconds, hash_seconds)
+        return result
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.password_hash_workers,
+    max_queue=settings.password_hash_queue,
+)
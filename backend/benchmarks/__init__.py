@@ -0,0 +1 @@
+"""Microbenchmarks runnable with ``python -m backend.benchmarks.<name>``."""
@@ -0,0 +1,94 @@
+"""Requests/second through the JWT auth layer: BaseHTTPMiddleware vs pure ASGI.
+
+Drives the ASGI apps directly (no server, no HTTP client) so the numbers isolate the
+middleware overhead::
+
+    python -m backend.benchmarks.auth_middleware --requests 20000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import Awaitable, Callable
+
+from jose import JWTError
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse, Response
+from starlette.routing import Route
+from starlette.types import ASGIApp, Message
+
+from backend.auth.jwt_tokens import create_access_token, decode_access_token
+from backend.rest.api.middleware import AUTH_HEADER_PREFIX, JWTAuthMiddleware, _is_public_path
+
+
+async def _endpoint(request: Request) -> Response:
+    return PlainTextResponse(str(request.state.user_id))
+
+
+async def _legacy_dispatch(request: Request, call_next: Callable[[Request], Awaitable[Response]]) -> Response:
+    """The previous ``@app.middleware("http")`` implementation."""
+    if request.method.upper() == "OPTIONS" or _is_public_path(request.url.path):
+        return await call_next(request)
+    auth_header = request.headers.get("Authorization")
+    if not auth_header or not auth_header.startswith(AUTH_HEADER_PREFIX):
+        return JSONResponse({"detail": "missing_auth_header"}, status_code=401)
+    try:
+        request.state.user_id = decode_access_token(auth_header[len(AUTH_HEADER_PREFIX) :])
+    except JWTError:
+        return JSONResponse({"detail": "invalid_token"}, status_code=401)
+    return await call_next(request)
+
+
+def _build_app(middleware: Middleware) -> Starlette:
+    return Starlette(routes=[Route("/api/bench", _endpoint)], middleware=[middleware])
+
+
+async def _drive(app: ASGIApp, token: str, requests: int) -> float:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/bench",
+        "raw_path": b"/api/bench",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"authorization", f"Bearer {token}".encode())],
+        "client": ("127.0.0.1", 1234),
+        "server": ("127.0.0.1", 80),
+    }
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:
+        if message["type"] == "http.response.start" and message["status"] != 200:
+            raise RuntimeError(f"unexpected status {message['status']}")
+
+    started = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return requests / (time.perf_counter() - started)
+
+
+async def _main(requests: int) -> None:
+    token = create_access_token(1)
+    legacy = _build_app(Middleware(BaseHTTPMiddleware, dispatch=_legacy_dispatch))
+    pure = _build_app(Middleware(JWTAuthMiddleware))
+    for app in (legacy, pure):
+        await _drive(app, token, min(requests, 500))
+    legacy_rps = await _drive(legacy, token, requests)
+    pure_rps = await _drive(pure, token, requests)
+    print(f"BaseHTTPMiddleware: {legacy_rps:10.0f} req/s")
+    print(f"JWTAuthMiddleware:  {pure_rps:10.0f} req/s ({pure_rps / legacy_rps:.2f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20_000)
+    asyncio.run(_main(parser.parse_args().requests))
@@ -0,0 +1,88 @@
+"""Bytes per seated player and per spectator: slotted engine types vs the previous dataclasses.
+
+Allocations are measured with ``tracemalloc`` while building the objects, so the numbers
+include the per-object containers (hole cards, ``__dict__``) but not shared enum members::
+
+    python -m backend.benchmarks.table_memory --count 20000
+"""
+from __future__ import annotations
+
+import argparse
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+from backend.poker_engine.cards import CARDS, Card
+from backend.poker_engine.player_state import PlayerAction, PlayerState, PlayerStatus
+from backend.poker_engine.table import Table
+
+
+@dataclass
+class _LegacyPlayerState:
+    """The previous ``PlayerState``: a plain dataclass with a list of cards and a str action."""
+
+    user_id: int
+    stack: int
+    position: int
+    status: PlayerStatus = PlayerStatus.ACTIVE
+    hole_cards: List[Card] = field(default_factory=list)
+    bet: int = 0
+    last_action: Optional[str] = None
+    is_small_blind: bool = False
+    is_big_blind: bool = False
+    has_acted_in_round: bool = False
+
+
+def _measure(build: Callable[[int], object], count: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    keep = build(count)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del keep
+    return (after - before) / count
+
+
+def _legacy_players(count: int) -> list[_LegacyPlayerState]:
+    return [
+        _LegacyPlayerState(user_id=1_000_000 + i, stack=10_000 + i, position=i % 9,
+                           hole_cards=[CARDS[i % 52], CARDS[(i + 1) % 52]], bet=100 + i, last_action="call")
+        for i in range(count)
+    ]
+
+
+def _players(count: int) -> list[PlayerState]:
+    return [
+        PlayerState(user_id=1_000_000 + i, stack=10_000 + i, position=i % 9,
+                    hole_cards=(CARDS[i % 52], CARDS[(i + 1) % 52]), bet=100 + i, last_action=PlayerAction.CALL)
+        for i in range(count)
+    ]
+
+
+def _legacy_spectators(count: int) -> list[_LegacyPlayerState]:
+    return [
+        _LegacyPlayerState(user_id=1_000_000 + i, stack=-1, position=-1, status=PlayerStatus.SPECTATOR)
+        for i in range(count)
+    ]
+
+
+def _spectators(count: int) -> Table:
+    table = Table()
+    for i in range(count):
+        table.seat_player(1_000_000 + i, 0, is_spectator=True)
+    return table
+
+
+def main(count: int) -> None:
+    rows = [
+        ("seated player", _measure(_legacy_players, count), _measure(_players, count)),
+        ("spectator", _measure(_legacy_spectators, count), _measure(_spectators, count)),
+    ]
+    for name, legacy, compact in rows:
+        print(f"{name:14} previous: {legacy:7.1f} B  slotted: {compact:7.1f} B  ({legacy / compact:.2f}x smaller)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=20_000)
+    main(parser.parse_args().count)
@@ -1,14 +1,127 @@
+from __future__ import annotations
+
+import time
 from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Any
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from fastapi import Request
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
 
 from backend.rest.core.config import settings
 
-engine = create_async_engine(settings.database_url, echo=False)
+READ_ONLY_METHODS = frozenset({"GET", "HEAD"})
+
+
+@dataclass(slots=True)
+class PoolMetrics:
+    checkouts: int = 0
+    timeouts: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+    def observe(self, wait_seconds: float) -> None:
+        self.checkouts += 1
+        self.total_wait_seconds += wait_seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+
+    def snapshot(self) -> dict[str, float | int]:
+        checkouts = self.checkouts or 1
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "avg_wait_ms": round(self.total_wait_seconds / checkouts * 1000, 3),
+            "max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+        }
+
+
+pool_metrics: dict[str, PoolMetrics] = {}
+
+
+class MeteredQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection.
+
+    Metrics are keyed by the pool's ``logging_name`` (the engine role), so they survive
+    ``dispose()``/``recreate()``.
+    """
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        metrics = pool_metrics.setdefault(self._orig_logging_name or "default", PoolMetrics())
+        started_at = time.perf_counter()
+        try:
+            entry = super()._do_get()
+        except exc.TimeoutError:
+            metrics.timeouts += 1
+            raise
+        metrics.observe(time.perf_counter() - started_at)
+        return entry
+
+
+def build_engine(url: str, role: str) -> AsyncEngine:
+    """Create the engine for one role (``primary`` or ``replica``) from the pool settings."""
+    parsed = make_url(url)
+    options: dict[str, Any] = {
+        "echo": False,
+        "query_cache_size": settings.db_query_cache_size,
+        "pool_logging_name": role,
+    }
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        # In-memory SQLite lives and dies with one connection; keep SQLAlchemy's default pool.
+        return create_async_engine(url, **options)
+    options.update(
+        poolclass=MeteredQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_recycle=settings.db_pool_recycle_seconds,
+        pool_timeout=settings.db_pool_timeout_seconds,
+        pool_pre_ping=True,
+    )
+    if parsed.get_driver_name() == "asyncpg":
+        options["connect_args"] = {"prepared_statement_cache_size": settings.db_prepared_statement_cache_size}
+    pool_metrics.setdefault(role, PoolMetrics())
+    return create_async_engine(url, **options)
+
+
+engine = build_engine(settings.database_url, "primary")
+replica_engine = build_engine(settings.database_replica_url, "replica") if settings.database_replica_url else None
 
 SessionLocal = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+# Read-only work (stats, history, lookups) goes to the replica when one is configured.
+ReadSessionLocal = (
+    async_sessionmaker(bind=replica_engine, class_=AsyncSession, expire_on_commit=False)
+    if replica_engine is not None
+    else SessionLocal
+)
+
+
+def session_factory_for(method: str) -> async_sessionmaker[AsyncSession]:
+    return ReadSessionLocal if method in READ_ONLY_METHODS else SessionLocal
 
 
-async def get_db() -> AsyncIterator[AsyncSession]:
+async def get_db(request: Request) -> AsyncIterator[AsyncSession]:
+    """Per-request session: GET/HEAD read from the replica, everything else uses the primary."""
+    async with session_factory_for(request.method)() as session:
+        yield session
+
+
+async def get_primary_db() -> AsyncIterator[AsyncSession]:
+    """Session on the primary, for reads that must see the caller's own latest writes."""
     async with SessionLocal() as session:
         yield session
+
+
+def pool_status() -> dict[str, dict[str, float | int]]:
+    engines = {"primary": engine, "replica": replica_engine}
+    status: dict[str, dict[str, float | int]] = {}
+    for role, role_engine in engines.items():
+        if role_engine is None:
+            continue
+        pool = role_engine.pool
+        entry = pool_metrics.get(role, PoolMetrics()).snapshot()
+        if isinstance(pool, AsyncAdaptedQueuePool):
+            entry.update(size=pool.size(), checked_out=pool.checkedout(), overflow=pool.overflow())
+        status[role] = entry
+    return status
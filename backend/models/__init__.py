@@ -1,6 +1,7 @@
+from .chip_ledger import ChipLedgerEntry
 from .finished_game import FinishedGame
 from .player_game import PlayerGame
 from .player_stats import PlayerStats
 from .user import User
 
-__all__ = ["User", "PlayerStats", "FinishedGame", "PlayerGame"]
+__all__ = ["User", "PlayerStats", "FinishedGame", "PlayerGame", "ChipLedgerEntry"]
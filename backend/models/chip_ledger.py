@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import BigInteger, Boolean, DateTime, ForeignKey, Index, Integer, String, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.database.base import Base
+
+# Chips that move between the user's balance and a table.
+BALANCE_REASONS: tuple[str, ...] = ("buy_in", "cashout")
+# Net chip movement of one hand at a table; audit only, the chips stay on the table.
+HAND_REASON = "hand"
+
+
+class ChipLedgerEntry(Base):
+    __tablename__ = "chip_ledger"
+
+    id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer, "sqlite"),
+        primary_key=True,
+        autoincrement=True,
+    )
+
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False)
+
+    amount: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+    reason: Mapped[str] = mapped_column(String(16), nullable=False)
+
+    table_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+
+    compacted: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False, server_default="false")
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+
+    __table_args__ = (
+        Index(
+            "ix_chip_ledger_pending_user_id",
+            "user_id",
+            postgresql_where=text("NOT compacted"),
+            sqlite_where=text("NOT compacted"),
+        ),
+    )
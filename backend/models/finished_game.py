@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import BigInteger, Integer, String
+from sqlalchemy import BigInteger, DateTime, Integer, JSON, String, UniqueConstraint
 from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -12,18 +13,38 @@ if TYPE_CHECKING:
     from backend.models.player_game import PlayerGame
 
 
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
 class FinishedGame(Base):
+    """One finished hand.
+
+    On Postgres ``finished_games`` is range-partitioned by ``finished_at`` (see
+    ``backend.services.history_partitions``), so the partition key is part of the primary key.
+    """
+
     __tablename__ = "finished_games"
     uuid: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    finished_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True, default=_utcnow)
+    hand_uid: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
     table_id: Mapped[int] = mapped_column(Integer, nullable=False)
     pot: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
 
-    board: Mapped[list[str]] = mapped_column(ARRAY(String), nullable=False)
+    board: Mapped[list[str]] = mapped_column(ARRAY(String).with_variant(JSON(), "sqlite"), nullable=False)
 
-    winners: Mapped[list[int]] = mapped_column(ARRAY(Integer), nullable=False, default=list)
+    winners: Mapped[list[int]] = mapped_column(
+        ARRAY(Integer).with_variant(JSON(), "sqlite"),
+        nullable=False,
+        default=list,
+    )
 
     players: Mapped[list[PlayerGame]] = relationship(
         "PlayerGame",
         back_populates="game",
+        primaryjoin="and_(FinishedGame.uuid == foreign(PlayerGame.finished_game_uuid), "
+        "FinishedGame.finished_at == foreign(PlayerGame.finished_at))",
         cascade="all, delete-orphan",
     )
+
+    __table_args__ = (UniqueConstraint("hand_uid", "finished_at", name="uq_finished_games_hand_uid"),)
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import BigInteger, Boolean, ForeignKey, Integer, String
+from sqlalchemy import BigInteger, Boolean, DateTime, ForeignKey, Index, Integer, JSON, String
 from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -18,17 +19,17 @@ class PlayerGame(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
 
-    finished_game_uuid: Mapped[int] = mapped_column(
-        Integer,
-        ForeignKey("finished_games.uuid", ondelete="CASCADE"),
-        nullable=False,
-    )
+    # Partition key, copied from the finished game. There is no foreign key to
+    # finished_games: Postgres can't reference a partitioned table by uuid alone.
+    finished_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+
+    finished_game_uuid: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
 
     table_id: Mapped[int] = mapped_column(Integer, nullable=False)
 
     user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False)
 
-    hole_cards: Mapped[list[str]] = mapped_column(ARRAY(String), nullable=False)
+    hole_cards: Mapped[list[str]] = mapped_column(ARRAY(String).with_variant(JSON(), "sqlite"), nullable=False)
 
     bet: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
 
@@ -41,6 +42,10 @@ class PlayerGame(Base):
     game: Mapped[FinishedGame] = relationship(
         "FinishedGame",
         back_populates="players",
+        primaryjoin="and_(FinishedGame.uuid == foreign(PlayerGame.finished_game_uuid), "
+        "FinishedGame.finished_at == foreign(PlayerGame.finished_at))",
     )
 
     user: Mapped[User] = relationship("User")
+
+    __table_args__ = (Index("ix_player_games_user_id_id", "user_id", "id"),)
@@ -7,6 +7,7 @@ from sqlalchemy import BigInteger, Integer
 from sqlalchemy.orm import Mapped, mapped_column
 
 from backend.database.base import Base
+from backend.poker_engine.hand_stats import POSITIONS
 
 
 class PlayerStats(Base):
@@ -23,6 +24,48 @@ class PlayerStats(Base):
     lost_stack: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
     won_stack: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
 
+    vpip_hands: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    pfr_hands: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    three_bet_hands: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    three_bet_chances: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    aggressive_actions: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    passive_actions: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    flops_seen: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    showdowns: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    showdowns_won: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+
+    # Hands played and net chips per seat position (see POSITIONS).
+    hands_sb: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    net_sb: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0", nullable=False)
+    hands_bb: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    net_bb: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0", nullable=False)
+    hands_early: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    net_early: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0", nullable=False)
+    hands_late: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    net_late: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0", nullable=False)
+    hands_button: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    net_button: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0", nullable=False)
+
+
+COUNTER_COLUMNS: tuple[str, ...] = (
+    "hands_won",
+    "hands_lost",
+    "max_balance",
+    "max_bet",
+    "lost_stack",
+    "won_stack",
+    "vpip_hands",
+    "pfr_hands",
+    "three_bet_hands",
+    "three_bet_chances",
+    "aggressive_actions",
+    "passive_actions",
+    "flops_seen",
+    "showdowns",
+    "showdowns_won",
+    *(f"{prefix}_{position}" for position in POSITIONS for prefix in ("hands", "net")),
+)
+
 
 @dataclass(frozen=True)
 class StatsDelta:
@@ -36,6 +79,7 @@ class StatsDelta:
         > 0 игрок в плюсе
         < 0 игрок в минусе
     resulting_balance — баланс игрока ПОСЛЕ раздачи (для max_balance)
+    position, vpip, pfr, ... — флаги раздачи из HandStatsTracker (см. PlayerHandStats)
     """
 
     user_id: int
@@ -43,15 +87,20 @@ class StatsDelta:
     bet: int
     net_stack_delta: int
     resulting_balance: Optional[int] = None
+    position: Optional[str] = None
+    vpip: bool = False
+    pfr: bool = False
+    three_bet: bool = False
+    three_bet_chance: bool = False
+    aggressive_actions: int = 0
+    passive_actions: int = 0
+    saw_flop: bool = False
+    showdown: bool = False
 
 
 def update_stats(current: PlayerStats, deltas: Iterable[StatsDelta]) -> PlayerStats:
-    current.hands_won = int(current.hands_won or 0)
-    current.hands_lost = int(current.hands_lost or 0)
-    current.max_balance = int(current.max_balance or 0)
-    current.max_bet = int(current.max_bet or 0)
-    current.lost_stack = int(current.lost_stack or 0)
-    current.won_stack = int(current.won_stack or 0)
+    for column in COUNTER_COLUMNS:
+        setattr(current, column, int(getattr(current, column) or 0))
 
     for d in deltas:
         if d.user_id != current.user_id:
@@ -73,4 +122,18 @@ def update_stats(current: PlayerStats, deltas: Iterable[StatsDelta]) -> PlayerSt
         if d.resulting_balance is not None and d.resulting_balance > current.max_balance:
             current.max_balance = d.resulting_balance
 
+        current.vpip_hands += d.vpip
+        current.pfr_hands += d.pfr
+        current.three_bet_hands += d.three_bet
+        current.three_bet_chances += d.three_bet_chance
+        current.aggressive_actions += d.aggressive_actions
+        current.passive_actions += d.passive_actions
+        current.flops_seen += d.saw_flop
+        current.showdowns += d.showdown
+        current.showdowns_won += d.showdown and d.won_hand
+
+        if d.position in POSITIONS:
+            setattr(current, f"hands_{d.position}", getattr(current, f"hands_{d.position}") + 1)
+            setattr(current, f"net_{d.position}", getattr(current, f"net_{d.position}") + d.net_stack_delta)
+
     return current
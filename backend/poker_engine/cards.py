@@ -50,6 +50,8 @@ RANK_ORDER = [
 
 RANK_VALUE = {rank: index + 2 for index, rank in enumerate(RANK_ORDER)}
 
+SUIT_ORDER = [Suit.HEARTS, Suit.DIAMONDS, Suit.CLUBS, Suit.SPADES]
+
 
 @dataclass(frozen=True)
 class Card:
@@ -64,6 +66,10 @@ class Card:
         return f"{self.rank.value}{self.suit.value[0].upper()}"
 
 
+# Every card in a fixed order.
+CARDS: tuple[Card, ...] = tuple(Card(rank=rank, suit=suit) for suit in SUIT_ORDER for rank in RANK_ORDER)
+
+
 class HandRank(Enum):
     HIGH_CARD = 0
     ONE_PAIR = 1
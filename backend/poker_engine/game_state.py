@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 from enum import Enum
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from backend.poker_engine.cards import Card, HandEvaluation, HandEvaluator
 from backend.poker_engine.deck import Deck
-from backend.poker_engine.player_state import PlayerState, PlayerStatus
+from backend.poker_engine.hand_stats import HandStatsTracker, assign_positions
+from backend.poker_engine.player_state import PlayerAction, PlayerState, PlayerStatus
 
 
 class GamePhase(str, Enum):
@@ -17,15 +18,6 @@ class GamePhase(str, Enum):
     FINISHED = "finished"
 
 
-class PlayerAction(str, Enum):
-    FOLD = "fold"
-    CHECK = "check"
-    CALL = "call"
-    BET = "bet"
-    RAISE = "raise"
-    ALL_IN = "all_in"
-
-
 class GameState:
     """Manages a single hand of Texas Hold'em."""
 
@@ -56,6 +48,9 @@ class GameState:
         self.hand_active = False
         self.winners: List[PlayerState] = []
         self.best_hand: HandEvaluation | None = None
+        self.hand_stats = HandStatsTracker()
+        # Stacks before the blinds of the current hand, so an interrupted hand can be undone.
+        self.start_stacks: Dict[int, int] = {}
 
     def start_game(self) -> None:
         """Prepare deck, deal cards and move to the preflop round."""
@@ -92,9 +87,13 @@ class GameState:
         if player.status not in (PlayerStatus.ACTIVE, PlayerStatus.ALL_IN):
             raise RuntimeError("Player cannot act right now.")
 
+        preflop = self.phase == GamePhase.PREFLOP
+        table_bet_before = self.current_bet
+        player_bet_before = player.bet
         if action == PlayerAction.FOLD:
             player.fold()
             player.has_acted_in_round = True
+            self.hand_stats.record(player.user_id, preflop=preflop, aggressive=False, passive=False)
             if len(self._players_still_in_hand()) <= 1:
                 self._finish_with_single_player()
                 return
@@ -152,6 +151,10 @@ class GameState:
         else:
             raise ValueError(f"Unsupported action {action}")
 
+        if action != PlayerAction.FOLD:
+            aggressive = self.current_bet > table_bet_before
+            passive = not aggressive and player.bet > player_bet_before
+            self.hand_stats.record(player.user_id, preflop=preflop, aggressive=aggressive, passive=passive)
         self._advance_turn()
 
     def force_fold(self, player: PlayerState) -> None:
@@ -187,6 +190,7 @@ class GameState:
         while True:
             if self.phase == GamePhase.PREFLOP:
                 self.phase = GamePhase.FLOP
+                self.hand_stats.mark_saw_flop(p.user_id for p in self._players_still_in_hand())
                 self._deal_board_cards(3)
                 start_index = self._next_index(self.dealer_position)
                 self.current_player_index = self._start_betting_round(start_index)
@@ -218,6 +222,7 @@ class GameState:
             continue
 
     def _prepare_new_hand(self) -> None:
+        self.start_stacks = {player.user_id: player.stack for player in self.players}
         self.deck.reset()
         self.board = []
         self.pot = 0
@@ -235,6 +240,18 @@ class GameState:
         self.current_bet = max(p.bet for p in self.players)
         self.minimum_raise = self.big_blind_amount
         self._deal_private_cards()
+        self._start_hand_stats()
+
+    def _start_hand_stats(self) -> None:
+        seat_order: List[int] = []
+        index = self.small_blind_index
+        for _ in range(len(self.players)):
+            player = self.players[index]
+            if player.hole_cards:
+                seat_order.append(player.user_id)
+            index = self._next_index(index)
+        dealer_user_id = self.players[self.dealer_position].user_id
+        self.hand_stats.start_hand(assign_positions(seat_order, dealer_user_id))
 
     def _post_blind(self, player_index: int, amount: int) -> None:
         player = self.players[player_index]
@@ -251,7 +268,7 @@ class GameState:
             for player in self.players:
                 if player.status in (PlayerStatus.SPECTATOR, PlayerStatus.OUT, PlayerStatus.WAITING):
                     continue
-                player.hole_cards.append(self.deck.draw_card())
+                player.hole_cards += (self.deck.draw_card(),)
 
     def _deal_board_cards(self, amount: int) -> None:
         self.deck.draw_card()
@@ -311,6 +328,7 @@ class GameState:
             self.phase = GamePhase.FINISHED
             self.hand_active = False
             return
+        self.hand_stats.mark_showdown(p.user_id for p in contenders)
         winners, best_hand = HandEvaluator.determine_winners(contenders, self.board)
         self.winners = winners
         self.best_hand = best_hand
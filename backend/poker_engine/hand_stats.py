@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List
+
+# Seat roles relative to the button, from first to act preflop to last.
+POSITIONS = ("sb", "bb", "early", "late", "button")
+
+
+@dataclass(slots=True)
+class PlayerHandStats:
+    """What one player did in one hand, as counted for the long-term aggregates."""
+
+    position: str
+    vpip: bool = False
+    pfr: bool = False
+    three_bet: bool = False
+    three_bet_chance: bool = False
+    aggressive_actions: int = 0
+    passive_actions: int = 0
+    saw_flop: bool = False
+    showdown: bool = False
+
+
+def assign_positions(seat_order: List[int], dealer_user_id: int | None) -> Dict[int, str]:
+    """Map user ids to positions.
+
+    ``seat_order`` lists the dealt-in players starting with the small blind and going
+    clockwise. The last seat is the button when it is the dealer, the one before it is
+    ``late``, everyone else between the big blind and those is ``early``.
+    """
+    positions: Dict[int, str] = {}
+    if not seat_order:
+        return positions
+    positions[seat_order[0]] = "sb"
+    if len(seat_order) > 1:
+        positions[seat_order[1]] = "bb"
+    rest = seat_order[2:]
+    if rest and rest[-1] == dealer_user_id:
+        positions[rest.pop()] = "button"
+    if rest:
+        positions[rest.pop()] = "late"
+    for user_id in rest:
+        positions[user_id] = "early"
+    return positions
+
+
+class HandStatsTracker:
+    """Collects ``PlayerHandStats`` from the actions of a single hand.
+
+    ``GameState`` feeds it every applied action; nothing here looks at the history, so the
+    per-hand flags are ready as soon as the hand ends.
+    """
+
+    def __init__(self) -> None:
+        self.players: Dict[int, PlayerHandStats] = {}
+        self._preflop_raises = 0
+
+    def start_hand(self, positions: Dict[int, str]) -> None:
+        self.players = {user_id: PlayerHandStats(position=position) for user_id, position in positions.items()}
+        self._preflop_raises = 0
+
+    def record(self, user_id: int, *, preflop: bool, aggressive: bool, passive: bool) -> None:
+        stats = self.players.get(user_id)
+        if stats is None:
+            return
+        if preflop:
+            if self._preflop_raises == 1:
+                stats.three_bet_chance = True
+            if aggressive:
+                stats.vpip = stats.pfr = True
+                if self._preflop_raises == 1:
+                    stats.three_bet = True
+                self._preflop_raises += 1
+            elif passive:
+                stats.vpip = True
+        if aggressive:
+            stats.aggressive_actions += 1
+        elif passive:
+            stats.passive_actions += 1
+
+    def mark_saw_flop(self, user_ids: Iterable[int]) -> None:
+        for user_id in user_ids:
+            if user_id in self.players:
+                self.players[user_id].saw_flop = True
+
+    def mark_showdown(self, user_ids: Iterable[int]) -> None:
+        for user_id in user_ids:
+            if user_id in self.players:
+                self.players[user_id].showdown = True
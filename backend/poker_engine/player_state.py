@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from enum import Enum
-from typing import List, Optional
+from typing import Optional, Tuple
 
 from backend.poker_engine.cards import Card
 
@@ -16,25 +16,38 @@ class PlayerStatus(str, Enum):
     SPECTATOR = "spectator"
 
 
-@dataclass
+class PlayerAction(str, Enum):
+    FOLD = "fold"
+    CHECK = "check"
+    CALL = "call"
+    BET = "bet"
+    RAISE = "raise"
+    ALL_IN = "all_in"
+
+
+@dataclass(slots=True)
 class PlayerState:
+    """A seat at the table. Slotted, with enum members and a tuple for the hole cards, to stay small."""
+
     user_id: int
     stack: int
     position: int
     status: PlayerStatus = PlayerStatus.ACTIVE
-    hole_cards: List[Card] = field(default_factory=list)
+    hole_cards: Tuple[Card, ...] = ()
     bet: int = 0
-    last_action: Optional[str] = None
+    last_action: Optional[PlayerAction] = None
     is_small_blind: bool = False
     is_big_blind: bool = False
     has_acted_in_round: bool = False
+    # Left during a hand: hidden from the table now, removed once the hand is over.
+    leaving: bool = False
 
     def reset_for_new_hand(self) -> None:
         if self.stack <= 0:
             self.status = PlayerStatus.OUT
         elif self.status != PlayerStatus.SPECTATOR:
             self.status = PlayerStatus.ACTIVE
-        self.hole_cards.clear()
+        self.hole_cards = ()
         self.bet = 0
         self.last_action = None
         self.is_small_blind = False
@@ -48,27 +61,27 @@ class PlayerState:
     def fold(self) -> None:
         if self.status == PlayerStatus.ACTIVE:
             self.status = PlayerStatus.FOLDED
-            self.last_action = "fold"
+            self.last_action = PlayerAction.FOLD
 
     def check(self) -> None:
-        self.last_action = "check"
+        self.last_action = PlayerAction.CHECK
         self.has_acted_in_round = True
 
     def call(self, amount: int) -> int:
         committed = self._commit(amount, allow_partial=True)
-        self.last_action = "call"
+        self.last_action = PlayerAction.CALL
         self.has_acted_in_round = True
         return committed
 
     def bet_chips(self, amount: int) -> int:
         committed = self._commit(amount, allow_partial=False)
-        self.last_action = "bet"
+        self.last_action = PlayerAction.BET
         self.has_acted_in_round = True
         return committed
 
     def raise_bet(self, amount: int) -> int:
         committed = self._commit(amount, allow_partial=False)
-        self.last_action = "raise"
+        self.last_action = PlayerAction.RAISE
         self.has_acted_in_round = True
         return committed
 
@@ -76,7 +89,7 @@ class PlayerState:
         if self.stack <= 0:
             raise RuntimeError("Player has no chips left to go all-in.")
         committed = self._commit(self.stack, allow_partial=False)
-        self.last_action = "all_in"
+        self.last_action = PlayerAction.ALL_IN
         self.has_acted_in_round = True
         return committed
 
@@ -97,3 +110,10 @@ class PlayerState:
 
     def is_active_in_hand(self) -> bool:
         return self.status in (PlayerStatus.ACTIVE, PlayerStatus.ALL_IN)
+
+
+@dataclass(frozen=True, slots=True)
+class Spectator:
+    """Someone watching a table; nothing but the id is kept."""
+
+    user_id: int
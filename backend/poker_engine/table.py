@@ -1,12 +1,26 @@
 from __future__ import annotations
 
-from typing import Any, List, Optional, Set
+from typing import Any, Callable, Dict, List, Optional
 
 from backend.poker_engine.game_state import GameState, PlayerAction
-from backend.poker_engine.player_state import PlayerState, PlayerStatus
+from backend.poker_engine.player_state import PlayerState, PlayerStatus, Spectator
 
 
 class Table:
+    __slots__ = (
+        "max_players",
+        "small_blind",
+        "big_blind",
+        "players",
+        "spectators",
+        "_players_by_id",
+        "dealer",
+        "game_state",
+        "table_id",
+        "last_hand_snapshot",
+        "on_seats_changed",
+    )
+
     def __init__(
             self,
             max_players: int = 9,
@@ -18,12 +32,19 @@ class Table:
         self.small_blind = small_blind
         self.big_blind = big_blind
         self.players: List[PlayerState] = []
-        self.spectators: List[PlayerState] = []
-        self._pending_leave_user_ids: Set[int] = set()
+        # Spectators by user id, in the order they joined.
+        self.spectators: Dict[int, Spectator] = {}
+        # Index over ``players`` for the per-message membership checks.
+        self._players_by_id: Dict[int, PlayerState] = {}
         self.dealer = 0
         self.game_state: Optional[GameState] = None
         self.table_id = table_id
         self.last_hand_snapshot: Optional[List[dict[str, Any]]] = None
+        self.on_seats_changed: Optional[Callable[[Table], None]] = None
+
+    def _seats_changed(self) -> None:
+        if self.on_seats_changed is not None:
+            self.on_seats_changed(self)
 
     def _snapshot_last_hand(self) -> None:
         self.last_hand_snapshot = [
@@ -45,10 +66,10 @@ class Table:
         *,
         is_spectator: bool = False,
         initial_status: PlayerStatus | None = None,
-    ) -> PlayerState:
+    ) -> PlayerState | Spectator:
         if is_spectator:
-            spectator = PlayerState(user_id=user_id, stack=-1, position=-1, status=PlayerStatus.SPECTATOR)
-            self.spectators.append(spectator)
+            spectator = self.spectators[user_id] = Spectator(user_id)
+            self._seats_changed()
             return spectator
 
         if len(self.players) >= self.max_players:
@@ -57,19 +78,21 @@ class Table:
         player = PlayerState(user_id=user_id,
                              stack=stack, position=position, status=initial_status or PlayerStatus.ACTIVE)
         self.players.append(player)
+        self._players_by_id[user_id] = player
+        self._seats_changed()
         return player
 
     def leave(self, user_id: int) -> int:
-        self.spectators[:] = [spectator for spectator in self.spectators if spectator.user_id != user_id]
+        self.spectators.pop(user_id, None)
 
-        player = next((p for p in self.players if p.user_id == user_id), None)
+        player = self._players_by_id.get(user_id)
         if player is None:
-            self._pending_leave_user_ids.discard(user_id)
+            self._seats_changed()
             return 0
 
         cashout = max(0, int(getattr(player, "stack", 0)))
         if self.game_state is not None and bool(getattr(self.game_state, "hand_active", False)):
-            self._pending_leave_user_ids.add(user_id)
+            player.leaving = True
             try:
                 self.game_state.force_fold(player)
             except Exception:
@@ -79,12 +102,12 @@ class Table:
                 self._snapshot_last_hand()
                 self._advance_dealer_button()
                 self._evict_pending_leavers()
+            self._seats_changed()
             return cashout
 
-        self._pending_leave_user_ids.discard(user_id)
         self.players[:] = [p for p in self.players if p.user_id != user_id]
-        for idx, p in enumerate(self.players):
-            p.position = idx
+        self._reindex_players()
+        self._seats_changed()
         return cashout
 
     def start_game(self) -> GameState:
@@ -116,21 +139,40 @@ class Table:
             self._evict_pending_leavers()
 
     def public_players(self) -> list[PlayerState]:
-        return [p for p in self.players if p.user_id not in self._pending_leave_user_ids]
+        return [p for p in self.players if not p.leaving]
+
+    def public_spectators(self) -> list[Spectator]:
+        return list(self.spectators.values())
 
-    def public_spectators(self) -> list[PlayerState]:
-        return list(self.spectators)
+    def get_player(self, user_id: int) -> Optional[PlayerState]:
+        return self._players_by_id.get(user_id)
+
+    def is_seated(self, user_id: int) -> bool:
+        """True for a player in a seat who has not left mid-hand."""
+        player = self._players_by_id.get(user_id)
+        return player is not None and not player.leaving
+
+    def is_spectator(self, user_id: int) -> bool:
+        return user_id in self.spectators
 
     def is_effectively_empty(self) -> bool:
         return not self.players and not self.spectators
 
+    def open_seats(self) -> int:
+        return max(0, self.max_players - len(self.players))
+
     def _evict_pending_leavers(self) -> None:
-        if not self._pending_leave_user_ids:
+        if not any(p.leaving for p in self.players):
             return
-        self.players[:] = [p for p in self.players if p.user_id not in self._pending_leave_user_ids]
-        self._pending_leave_user_ids.clear()
+        self.players[:] = [p for p in self.players if not p.leaving]
+        self._reindex_players()
+        self._seats_changed()
+
+    def _reindex_players(self) -> None:
+        self._players_by_id = {}
         for idx, p in enumerate(self.players):
             p.position = idx
+            self._players_by_id[p.user_id] = p
 
     def _advance_dealer_button(self) -> None:
         if not self.players:
@@ -145,7 +187,7 @@ class Table:
             next_index = (next_index + 1) % len(self.players)
 
     def _get_player_by_id(self, user_id: int) -> PlayerState:
-        for player in self.players:
-            if player.user_id == user_id:
-                return player
+        player = self._players_by_id.get(user_id)
+        if player is not None:
+            return player
         raise RuntimeError(f"Player with id {user_id} is not at the table.")
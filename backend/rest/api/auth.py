@@ -1,19 +1,30 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 
-from backend.auth.hashing import hash_password
-from backend.auth.hashing import verify_password
+from backend.auth.hashing import HashingBusyError, password_hasher
 from backend.auth.jwt_tokens import create_access_token
-from backend.database.session import get_db
+from backend.database.session import get_db, get_primary_db
 from backend.models.user import User
 from backend.rest.errors import http_error
 from backend.rest.api.deps import get_current_user
 from backend.rest.schemas.auth import LoginRequest, MeResponse, RegisterRequest, RegisterResponse
+from backend.services.chip_ledger import chip_ledger
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+HASHING_RETRY_AFTER_SECONDS = 1
+
+
+def _auth_busy() -> HTTPException:
+    return http_error(
+        status.HTTP_503_SERVICE_UNAVAILABLE,
+        code="auth_busy",
+        message="Too many login attempts in progress, retry shortly",
+        headers={"Retry-After": str(HASHING_RETRY_AFTER_SECONDS)},
+    )
+
 
 @router.post("/register", response_model=RegisterResponse, status_code=status.HTTP_201_CREATED)
 async def register_user(
@@ -24,9 +35,14 @@ async def register_user(
     if existing:
         raise http_error(status.HTTP_400_BAD_REQUEST, code="username_taken", message="Username already exists")
 
+    try:
+        password_hash = await password_hasher.hash(payload.password)
+    except HashingBusyError as exc:
+        raise _auth_busy() from exc
+
     user = User(
         username=payload.username,
-        password_hash=hash_password(payload.password),
+        password_hash=password_hash,
         balance=5000,
     )
 
@@ -49,7 +65,11 @@ async def login_user(
     session: AsyncSession = Depends(get_db),
 ) -> RegisterResponse:
     user = await session.scalar(select(User).where(User.username == payload.username))
-    if not user or not verify_password(payload.password, user.password_hash):
+    try:
+        valid = user is not None and await password_hasher.verify(payload.password, user.password_hash)
+    except HashingBusyError as exc:
+        raise _auth_busy() from exc
+    if not user or not valid:
         raise http_error(
             status.HTTP_401_UNAUTHORIZED,
             code="invalid_credentials",
@@ -61,5 +81,9 @@ async def login_user(
 
 
 @router.get("/me", response_model=MeResponse)
-async def me(user: User = Depends(get_current_user)) -> MeResponse:
-    return MeResponse(id=user.id, username=user.username, balance=int(user.balance))
+async def me(
+    user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_primary_db),
+) -> MeResponse:
+    balance = await chip_ledger.available(session, user.id)
+    return MeResponse(id=user.id, username=user.username, balance=int(user.balance if balance is None else balance))
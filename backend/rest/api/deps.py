@@ -3,7 +3,7 @@ from __future__ import annotations
 from fastapi import Depends, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.database.session import get_db
+from backend.database.session import get_primary_db
 from backend.models.user import User
 from backend.services.table_service import TableService
 from backend.rest.errors import http_error
@@ -18,8 +18,9 @@ def get_current_user_id(request: Request) -> int:
 
 async def get_current_user(
     user_id: int = Depends(get_current_user_id),
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_primary_db),
 ) -> User:
+    """The caller's row, read on the primary: a replica may not have it yet right after registration."""
     user = await session.get(User, user_id)
     if not user:
         raise http_error(status.HTTP_404_NOT_FOUND, code="user_not_found", message="User not found")
@@ -2,7 +2,17 @@ from http import HTTPStatus
 
 from fastapi import APIRouter, Response
 
+from backend.auth.hashing import password_hasher
+from backend.database.session import pool_status
+from backend.rest.api.middleware import route_limits_snapshot
 from backend.rest.core.config import settings
+from backend.services.hand_spool import hand_spool
+from backend.services.stats_cache import stats_cache
+from backend.services.table_snapshot import table_snapshotter
+from backend.services.table_store import table_store
+from backend.services.user_directory import user_directory
+from backend.ws_api.admission import admission_metrics
+from backend.ws_api.tables import multiplex_metrics, resume_metrics, spectator_feed_metrics
 
 router = APIRouter(tags=["health"])
 
@@ -18,5 +28,29 @@ def health_settings() -> dict:
         "api_prefix": settings.api_prefix,
         "cors_origins": settings.cors_origins,
         "database_url": settings.database_url_redacted(),
+        "database_replica_url": settings.database_replica_url_redacted(),
         "env_source": settings.env_source(),
     }
+
+
+@router.get("/health/metrics")
+def health_metrics() -> dict:
+    return {
+        "password_hashing": {
+            **password_hasher.metrics.snapshot(),
+            "pending": password_hasher.pending,
+        },
+        "db_pools": pool_status(),
+        "concurrency": route_limits_snapshot(),
+        "stats_cache": stats_cache.snapshot(),
+        "user_directory": user_directory.snapshot(),
+        "tables": table_store.hibernation_snapshot(),
+        "spectator_feed": spectator_feed_metrics.snapshot(),
+        "ws_multiplex": multiplex_metrics.snapshot(),
+        "ws_resume": resume_metrics.snapshot(),
+        "ws_admission": admission_metrics.snapshot(),
+        "table_snapshot": None if table_snapshotter is None else table_snapshotter.metrics.snapshot(),
+        "hand_spool": (
+            None if hand_spool is None else {**hand_spool.metrics.snapshot(), "pending_bytes": hand_spool.pending_bytes}
+        ),
+    }
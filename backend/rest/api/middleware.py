@@ -1,10 +1,14 @@
 from __future__ import annotations
 
-from typing import Awaitable, Callable
+import asyncio
+import re
+from collections import deque
+from dataclasses import dataclass, field
+from urllib.parse import parse_qs
 
-from fastapi import Request, Response
 from fastapi.responses import JSONResponse
 from jose import JWTError
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from backend.auth.jwt_tokens import decode_access_token
 from backend.rest.core.config import settings
@@ -22,40 +26,234 @@ PUBLIC_PATHS: set[str] = {
     "/redoc",
 }
 
-PUBLIC_PREFIXES: tuple[str, ...] = (f"{_API_PREFIX}/health",)
+PUBLIC_PREFIXES: tuple[str, ...] = (f"{_API_PREFIX}/health", f"{_API_PREFIX}/sse")
+
+
+def compile_public_matcher(paths: set[str], prefixes: tuple[str, ...]) -> re.Pattern[str]:
+    alternatives = [re.escape(path) for path in sorted(paths)]
+    alternatives += [re.escape(prefix) + "(?:/.*)?" for prefix in prefixes]
+    return re.compile("(?:" + "|".join(alternatives) + ")", re.DOTALL)
+
+
+_PUBLIC_MATCHER = compile_public_matcher(PUBLIC_PATHS, PUBLIC_PREFIXES)
 
 
 def _is_public_path(path: str) -> bool:
-    if path in PUBLIC_PATHS:
-        return True
-    for prefix in PUBLIC_PREFIXES:
-        if path == prefix or path.startswith(prefix + "/"):
+    return _PUBLIC_MATCHER.fullmatch(path) is not None
+
+
+def _header(scope: Scope, name: bytes) -> str | None:
+    for key, value in scope.get("headers") or ():
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _websocket_token(scope: Scope) -> str | None:
+    auth_header = _header(scope, b"authorization")
+    if auth_header and auth_header.startswith(AUTH_HEADER_PREFIX):
+        return auth_header[len(AUTH_HEADER_PREFIX) :]
+    query = scope.get("query_string", b"").decode("latin-1")
+    tokens = parse_qs(query).get("token")
+    return tokens[0] if tokens else None
+
+
+def _unauthorized(code: str, message: str) -> JSONResponse:
+    detail = ErrorDetail(code=code, message=message).model_dump()
+    return JSONResponse(content={"detail": detail}, status_code=401)
+
+
+class JWTAuthMiddleware:
+    """Pure ASGI bearer-token authentication.
+
+    HTTP requests outside the public paths are rejected with 401 unless they carry a valid
+    ``Authorization: Bearer`` header. WebSocket handshakes go through the same token check
+    (header or ``?token=`` query parameter) but are never rejected here: the socket handlers
+    report auth errors in their own protocol, so the middleware only resolves the identity.
+    The resolved user id is stored in ``scope["state"]`` and is visible as
+    ``request.state.user_id`` / ``websocket.state.user_id``.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        scope_type = scope["type"]
+        if scope_type == "websocket":
+            token = _websocket_token(scope)
+            if token:
+                try:
+                    scope.setdefault("state", {})["user_id"] = decode_access_token(token)
+                except (JWTError, ValueError):
+                    pass
+            await self.app(scope, receive, send)
+            return
+
+        if scope_type != "http" or scope["method"] == "OPTIONS" or _is_public_path(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        auth_header = _header(scope, b"authorization")
+        if not auth_header or not auth_header.startswith(AUTH_HEADER_PREFIX):
+            response = _unauthorized("missing_auth_header", "Missing or invalid authorization header")
+            await response(scope, receive, send)
+            return
+
+        try:
+            user_id = decode_access_token(auth_header[len(AUTH_HEADER_PREFIX) :])
+        except JWTError:
+            response = _unauthorized("invalid_token", "Invalid or expired token")
+            await response(scope, receive, send)
+            return
+
+        scope.setdefault("state", {})["user_id"] = user_id
+        await self.app(scope, receive, send)
+
+
+@dataclass(slots=True)
+class RouteGroupLimit:
+    """Concurrency limit for one group of routes: ``limit`` requests run, ``queue`` more wait.
+
+    A freed slot is handed straight to the oldest waiter, so queued requests are served in
+    order and cannot be overtaken by new arrivals.
+    """
+
+    name: str
+    pattern: re.Pattern[str]
+    limit: int
+    queue: int
+    in_flight: int = 0
+    queued: int = 0
+    admitted: int = 0
+    shed: int = 0
+    _waiters: deque[asyncio.Future[None]] = field(default_factory=deque)
+
+    async def acquire(self, timeout: float) -> bool:
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
             return True
-    return False
+        if self.queued >= self.queue:
+            self.shed += 1
+            return False
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.queued += 1
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except BaseException as exc:
+            handed_over = waiter.done() and not waiter.cancelled()
+            if handed_over and isinstance(exc, asyncio.TimeoutError):
+                # The slot arrived just as the wait timed out; keep it.
+                self.admitted += 1
+                return True
+            if handed_over:
+                self.release()
+            if not isinstance(exc, asyncio.TimeoutError):
+                raise
+            self.shed += 1
+            return False
+        finally:
+            self.queued -= 1
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+        self.admitted += 1
+        return True
+
+    def release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def snapshot(self) -> dict[str, int]:
+        return {
+            "limit": self.limit,
+            "queue": self.queue,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "shed": self.shed,
+        }
+
+
+def _route_groups() -> list[RouteGroupLimit]:
+    # Game writes get the most room; stats and history reads are the first to be shed.
+    # History exports hold their slot for the whole stream, so they get a small group of their
+    # own and are matched before the rest of /stats.
+    return [
+        RouteGroupLimit(
+            name="tables",
+            pattern=re.compile(re.escape(_API_PREFIX) + r"/tables/(?:create|quick-seat|[^/]+/(?:join|leave|spectate))"),
+            limit=settings.concurrency_tables_limit,
+            queue=settings.concurrency_tables_queue,
+        ),
+        RouteGroupLimit(
+            name="auth",
+            pattern=re.compile(re.escape(_API_PREFIX) + r"/auth/(?:login|register)"),
+            limit=settings.concurrency_auth_limit,
+            queue=settings.concurrency_auth_queue,
+        ),
+        RouteGroupLimit(
+            name="export",
+            pattern=re.compile(re.escape(_API_PREFIX) + r"/stats/[^/]+/history/export"),
+            limit=settings.concurrency_export_limit,
+            queue=settings.concurrency_export_queue,
+        ),
+        RouteGroupLimit(
+            name="stats",
+            pattern=re.compile(re.escape(_API_PREFIX) + r"/stats(?:/.*)?", re.DOTALL),
+            limit=settings.concurrency_stats_limit,
+            queue=settings.concurrency_stats_queue,
+        ),
+    ]
+
+
+route_limits: list[RouteGroupLimit] = _route_groups()
+
+
+def route_limits_snapshot() -> dict[str, dict[str, int]]:
+    return {group.name: group.snapshot() for group in route_limits}
+
 
+def _overloaded(group: str) -> JSONResponse:
+    detail = ErrorDetail(code="overloaded", message=f"Too many {group} requests, retry shortly").model_dump()
+    return JSONResponse(
+        content={"detail": detail},
+        status_code=503,
+        headers={"Retry-After": str(settings.concurrency_retry_after_seconds)},
+    )
 
-async def jwt_middleware(
-    request: Request,
-    call_next: Callable[[Request], Awaitable[Response]],
-) -> Response:
-    if request.method.upper() == "OPTIONS":
-        return await call_next(request)
 
-    if _is_public_path(request.url.path):
-        return await call_next(request)
+class ConcurrencyLimitMiddleware:
+    """Pure ASGI load shedding for the database-heavy route groups in ``route_limits``.
 
-    auth_header: str | None = request.headers.get("Authorization")
-    if not auth_header or not auth_header.startswith(AUTH_HEADER_PREFIX):
-        detail = ErrorDetail(code="missing_auth_header", message="Missing or invalid authorization header").model_dump()
-        return JSONResponse(content={"detail": detail}, status_code=401)
+    Requests beyond a group's limit wait in a short queue; when it is full, or a request
+    waited ``concurrency_queue_timeout_seconds``, it gets 503 with ``Retry-After`` right away
+    instead of piling up on the event loop. Other paths (health, lobby, WebSockets, SSE) are
+    never limited.
+    """
 
-    token = auth_header[len(AUTH_HEADER_PREFIX) :]
+    def __init__(self, app: ASGIApp, groups: list[RouteGroupLimit] | None = None) -> None:
+        self.app = app
+        self.groups = route_limits if groups is None else groups
 
-    try:
-        user_id = decode_access_token(token)
-    except JWTError:
-        detail = ErrorDetail(code="invalid_token", message="Invalid or expired token").model_dump()
-        return JSONResponse(content={"detail": detail}, status_code=401)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+        path = scope["path"]
+        group = next((g for g in self.groups if g.pattern.fullmatch(path)), None)
+        if group is None:
+            await self.app(scope, receive, send)
+            return
 
-    request.state.user_id = user_id
-    return await call_next(request)
+        if not await group.acquire(settings.concurrency_queue_timeout_seconds):
+            await _overloaded(group.name)(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            group.release()
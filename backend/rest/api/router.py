@@ -4,6 +4,7 @@ from .table import router as t_router
 from .stats import router as s_router
 from .auth import router as a_router
 from .users import router as u_router
+from .sse import router as e_router
 
 
 router = APIRouter()
@@ -12,3 +13,4 @@ router.include_router(t_router)
 router.include_router(s_router)
 router.include_router(a_router)
 router.include_router(u_router)
+router.include_router(e_router)
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, status
+from fastapi.responses import StreamingResponse
+
+from backend.rest.core.config import settings
+from backend.rest.errors import http_error
+from backend.ws_api.tables import subscribe_public_state, unsubscribe_public_state
+
+router = APIRouter(prefix="/sse", tags=["sse"])
+
+KEEPALIVE_FRAME = b": keepalive\n\n"
+
+
+async def _table_events(table_id: int, queue: asyncio.Queue[bytes | None]) -> AsyncIterator[bytes]:
+    try:
+        while True:
+            try:
+                frame = await asyncio.wait_for(queue.get(), timeout=settings.sse_keepalive_seconds)
+            except asyncio.TimeoutError:
+                yield KEEPALIVE_FRAME
+                continue
+            if frame is None:
+                return
+            yield frame
+    finally:
+        unsubscribe_public_state(table_id, queue)
+
+
+@router.get("/tables/{table_id}", response_class=StreamingResponse)
+async def stream_table(table_id: int) -> StreamingResponse:
+    """Public state of a table as ``text/event-stream``; no token needed, private tables are hidden."""
+    queue = subscribe_public_state(table_id)
+    if queue is None:
+        raise http_error(status.HTTP_404_NOT_FOUND, code="table_not_found", message="Table not found")
+    return StreamingResponse(
+        _table_events(table_id, queue),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
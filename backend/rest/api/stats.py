@@ -1,83 +1,165 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, Query
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from fastapi import APIRouter, Depends, Header, Query, Response
 from fastapi import status
-from sqlalchemy import select
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.database.session import get_db
-from backend.models.player_stats import PlayerStats
+from backend.database.session import ReadSessionLocal, SessionLocal, get_db
+from backend.models.player_stats import COUNTER_COLUMNS, PlayerStats
+from backend.poker_engine.hand_stats import POSITIONS
 from backend.models.player_game import PlayerGame
 from backend.rest.api.deps import get_current_user_id
+from backend.rest.api.table import NEXT_CURSOR_HEADER
+from backend.rest.conditional import etag_matches, not_modified
 from backend.rest.errors import http_error
-from backend.rest.schemas.stats import PlayerHistoryEntry, PlayerStatsOut
+from backend.rest.schemas.stats import (
+    LeaderboardEntry,
+    LeaderboardOut,
+    PlayerHistoryEntry,
+    PlayerStatsOut,
+    PositionStatsOut,
+)
+from backend.services.hand_archive import hand_archive, history_row
+from backend.services.history_export import encode_ndjson, iter_history
+from backend.services.leaderboard import LeaderboardMetric, leaderboard
+from backend.services.stats_cache import stats_cache
 
 
 router = APIRouter(prefix="/stats", tags=["stats"])
 
 
+def _stats_out(stats: PlayerStats) -> PlayerStatsOut:
+    counters = {column: int(getattr(stats, column) or 0) for column in COUNTER_COLUMNS}
+    positions = {
+        position: PositionStatsOut(hands=counters.pop(f"hands_{position}"), net=counters.pop(f"net_{position}"))
+        for position in POSITIONS
+    }
+    return PlayerStatsOut(user_id=stats.user_id, positions=positions, **counters)
+
+
 async def _get_player_stats(db: AsyncSession, user_id: int) -> PlayerStatsOut:
     stats = await db.get(PlayerStats, user_id)
-    if stats is None:
-        return PlayerStatsOut(
-            user_id=user_id,
-            hands_won=0,
-            hands_lost=0,
-            max_balance=0,
-            max_bet=0,
-            lost_stack=0,
-            won_stack=0,
-        )
-    return PlayerStatsOut(
-        user_id=stats.user_id,
-        hands_won=stats.hands_won,
-        hands_lost=stats.hands_lost,
-        max_balance=stats.max_balance,
-        max_bet=stats.max_bet,
-        lost_stack=stats.lost_stack,
-        won_stack=stats.won_stack,
-    )
+    return _stats_out(stats if stats is not None else PlayerStats(user_id=user_id))
+
 
+async def _get_player_history(
+    db: AsyncSession,
+    user_id: int,
+    *,
+    limit: int,
+    offset: int,
+    before: int | None = None,
+    response: Response | None = None,
+) -> list[PlayerHistoryEntry]:
+    """Newest-first history from the live partitions, continued from the archive when they run out.
 
-async def _get_player_history(db: AsyncSession, user_id: int, *, limit: int, offset: int) -> list[PlayerHistoryEntry]:
+    ``before`` is a keyset cursor (a history entry id); the id of the last returned entry is
+    sent back in ``X-Next-Cursor`` when the page is full.
+    """
+    conditions = [PlayerGame.user_id == user_id]
+    if before is not None:
+        conditions.append(PlayerGame.id < before)
     query = (
         select(PlayerGame)
         .options(selectinload(PlayerGame.game))
-        .where(PlayerGame.user_id == user_id)
+        .where(*conditions)
         .order_by(PlayerGame.id.desc())
         .limit(limit)
         .offset(offset)
     )
     result = await db.execute(query)
-    games = list(result.scalars().all())
-    history: list[PlayerHistoryEntry] = []
-    for pg in games:
-        game = pg.game
-        history.append(
-            PlayerHistoryEntry(
-                game_id=str(pg.finished_game_uuid) if pg.finished_game_uuid is not None else None,
-                table_id=pg.table_id,
-                user_id=pg.user_id,
-                hole_cards=pg.hole_cards,
-                bet=pg.bet,
-                net_stack_delta=pg.net_stack_delta,
-                resulting_balance=pg.resulting_balance,
-                won_hand=pg.won_hand,
-                board=game.board if game else [],
-                winners=game.winners if game else [],
-                pot=game.pot if game else 0,
-            )
-        )
-    return history
+    rows = [history_row(pg, pg.game) for pg in result.scalars().all()]
+    if len(rows) < limit and hand_archive.segments():
+        skip = 0
+        if not rows and offset:
+            live = await db.scalar(select(func.count()).select_from(PlayerGame).where(*conditions))
+            skip = max(0, offset - int(live or 0))
+        cursor = rows[-1]["id"] if rows else before
+        archived = await asyncio.to_thread(hand_archive.history, user_id, before=cursor, limit=skip + limit - len(rows))
+        rows += archived[skip:]
+    if response is not None and rows and len(rows) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = str(rows[-1]["id"])
+    return [PlayerHistoryEntry(**row) for row in rows]
+
+
+@asynccontextmanager
+async def _miss_session(db: AsyncSession, user_id: int) -> AsyncIterator[AsyncSession]:
+    """Session for filling a cache miss.
+
+    After an invalidation the replica may not have the commit that caused it yet; what it
+    returns would be cached under the new ETag, so those misses are read from the primary.
+    """
+    if not stats_cache.invalidated(user_id):
+        yield db
+        return
+    async with SessionLocal() as session:
+        yield session
+
+
+async def _cached_stats(
+    db: AsyncSession,
+    user_id: int,
+    response: Response,
+    if_none_match: str | None,
+) -> PlayerStatsOut | Response:
+    etag = stats_cache.etag("stats", user_id)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    stats = stats_cache.stats.get(user_id)
+    if stats is None:
+        async with _miss_session(db, user_id) as session:
+            stats = await _get_player_stats(session, user_id)
+        if stats_cache.etag("stats", user_id) == etag:
+            stats_cache.stats.set(user_id, stats)
+    response.headers["ETag"] = etag
+    return stats
+
+
+async def _cached_history(
+    db: AsyncSession,
+    user_id: int,
+    *,
+    limit: int,
+    offset: int,
+    before: int | None,
+    response: Response,
+    if_none_match: str | None,
+) -> list[PlayerHistoryEntry] | Response:
+    """Only the first page (no offset, no cursor) is cached and carries an ETag."""
+    if offset or before is not None:
+        return await _get_player_history(db, user_id, limit=limit, offset=offset, before=before, response=response)
+    etag = stats_cache.etag(f"history{limit}", user_id)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    cached = stats_cache.get_history(user_id, limit)
+    if cached is None:
+        async with _miss_session(db, user_id) as session:
+            page = await _get_player_history(session, user_id, limit=limit, offset=0, response=response)
+        cached = (page, response.headers.get(NEXT_CURSOR_HEADER))
+        if stats_cache.etag(f"history{limit}", user_id) == etag:
+            stats_cache.set_history(user_id, limit, cached)
+    page, next_cursor = cached
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    response.headers["ETag"] = etag
+    return page
 
 
 @router.get("/me/stats", response_model=PlayerStatsOut)
 async def get_my_stats(
+    response: Response,
     user_id: int = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
-) -> PlayerStatsOut:
-    return await _get_player_stats(db, user_id)
+    if_none_match: str | None = Header(None),
+) -> PlayerStatsOut | Response:
+    return await _cached_stats(db, user_id, response, if_none_match)
 
 
 @router.get("/me/history", response_model=list[PlayerHistoryEntry])
@@ -86,20 +168,104 @@ async def get_my_history(
     *,
     limit: int = Query(50, ge=1, le=500),
     offset: int = Query(0, ge=0),
+    before: int | None = Query(None, ge=1),
+    response: Response,
     db: AsyncSession = Depends(get_db),
-) -> list[PlayerHistoryEntry]:
-    return await _get_player_history(db, user_id, limit=limit, offset=offset)
+    if_none_match: str | None = Header(None),
+) -> list[PlayerHistoryEntry] | Response:
+    return await _cached_history(
+        db,
+        user_id,
+        limit=limit,
+        offset=offset,
+        before=before,
+        response=response,
+        if_none_match=if_none_match,
+    )
+
+
+def _history_export_response(user_id: int, *, compress: bool) -> StreamingResponse:
+    body = encode_ndjson(iter_history(ReadSessionLocal, hand_archive, user_id), compress=compress)
+    if compress:
+        filename = f"history-{user_id}.ndjson.gz"
+        media_type = "application/gzip"
+    else:
+        filename = f"history-{user_id}.ndjson"
+        media_type = "application/x-ndjson"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/me/history/export", response_class=StreamingResponse)
+async def export_my_history(
+    user_id: int = Depends(get_current_user_id),
+    gzip: bool = Query(False),
+) -> StreamingResponse:
+    return _history_export_response(user_id, compress=gzip)
+
+
+@router.get("/leaderboard/{metric}", response_model=LeaderboardOut)
+async def get_leaderboard(
+    metric: LeaderboardMetric,
+    *,
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db),
+) -> LeaderboardOut:
+    await leaderboard.ensure_loaded(db)
+    entries = [
+        LeaderboardEntry(rank=rank, user_id=user_id, value=value)
+        for rank, user_id, value in leaderboard.top(metric, limit=limit, offset=offset)
+    ]
+    return LeaderboardOut(metric=metric.value, total=leaderboard.size(metric), entries=entries)
+
+
+@router.get("/leaderboard/{metric}/me", response_model=LeaderboardEntry)
+async def get_my_leaderboard_rank(
+    metric: LeaderboardMetric,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+) -> LeaderboardEntry:
+    await leaderboard.ensure_loaded(db)
+    ranked = leaderboard.rank(metric, user_id)
+    if ranked is None:
+        raise http_error(
+            status.HTTP_404_NOT_FOUND,
+            code="not_ranked",
+            message="Игрок ещё не сыграл ни одной раздачи",
+        )
+    rank, value = ranked
+    return LeaderboardEntry(rank=rank, user_id=user_id, value=value)
 
 
 @router.get("/{user_id}/stats", response_model=PlayerStatsOut)
-async def get_user_stats(user_id: int, db: AsyncSession = Depends(get_db)) -> PlayerStatsOut:
+async def get_user_stats(
+    user_id: int,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    if_none_match: str | None = Header(None),
+) -> PlayerStatsOut | Response:
     if user_id <= 0:
         raise http_error(
             status.HTTP_400_BAD_REQUEST,
             code="invalid_user_id",
             message="user_id должен быть положительным",
         )
-    return await _get_player_stats(db, user_id)
+    return await _cached_stats(db, user_id, response, if_none_match)
+
+
+@router.get("/{user_id}/history/export", response_class=StreamingResponse)
+async def export_user_history(user_id: int, gzip: bool = Query(False)) -> StreamingResponse:
+    if user_id <= 0:
+        raise http_error(
+            status.HTTP_400_BAD_REQUEST,
+            code="invalid_user_id",
+            message="user_id должен быть положительным",
+        )
+    return _history_export_response(user_id, compress=gzip)
 
 
 @router.get("/{user_id}/history", response_model=list[PlayerHistoryEntry])
@@ -108,12 +274,23 @@ async def get_user_history(
     *,
     limit: int = Query(50, ge=1, le=500),
     offset: int = Query(0, ge=0),
+    before: int | None = Query(None, ge=1),
+    response: Response,
     db: AsyncSession = Depends(get_db),
-) -> list[PlayerHistoryEntry]:
+    if_none_match: str | None = Header(None),
+) -> list[PlayerHistoryEntry] | Response:
     if user_id <= 0:
         raise http_error(
             status.HTTP_400_BAD_REQUEST,
             code="invalid_user_id",
             message="user_id должен быть положительным",
         )
-    return await _get_player_history(db, user_id, limit=limit, offset=offset)
+    return await _cached_history(
+        db,
+        user_id,
+        limit=limit,
+        offset=offset,
+        before=before,
+        response=response,
+        if_none_match=if_none_match,
+    )
@@ -1,21 +1,58 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Header, Query, Response, status
 
 from backend.database.session import get_db
 from backend.rest.api.deps import get_current_user_id, get_table_service
+from backend.rest.conditional import etag_matches, not_modified
 from backend.rest.errors import http_error
 from backend.rest.schemas.common import OkResponse
-from backend.rest.schemas.table import TableCreateRequest, TableDetail, TableSummary
-from backend.services.table_service import InsufficientBalanceError, TableNotFoundError, TableService, UserNotFoundError
+from backend.rest.schemas.table import QuickSeatRequest, TableCreateRequest, TableDetail, TableSummary
+from backend.services.table_service import (
+    InsufficientBalanceError,
+    TableFullError,
+    TableNotFoundError,
+    TableService,
+    UserNotFoundError,
+)
+from backend.services.table_store import LobbyQuery
 from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter(prefix="/tables", tags=["tables"])
 
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
 @router.get("/", response_model=list[TableSummary])
-def list_tables(service: TableService = Depends(get_table_service)) -> list[TableSummary]:
-    return service.list_tables()
+def list_tables(
+    response: Response,
+    service: TableService = Depends(get_table_service),
+    *,
+    min_buy_in: int | None = Query(None, ge=0),
+    max_buy_in: int | None = Query(None, ge=0),
+    min_open_seats: int | None = Query(None, ge=1, le=9),
+    not_full: bool = False,
+    cursor: int | None = Query(None, ge=0),
+    limit: int | None = Query(None, ge=1, le=200),
+    if_none_match: str | None = Header(None),
+) -> list[TableSummary] | Response:
+    query = LobbyQuery(
+        min_buy_in=min_buy_in,
+        max_buy_in=max_buy_in,
+        min_open_seats=min_open_seats,
+        not_full=not_full,
+    )
+    if query == LobbyQuery() and cursor is None and limit is None:
+        snapshot = service.lobby_snapshot()
+        if etag_matches(if_none_match, snapshot.etag):
+            return not_modified(snapshot.etag)
+        return Response(content=snapshot.body, media_type="application/json", headers={"ETag": snapshot.etag})
+
+    tables, next_cursor = service.query_lobby(query, cursor=cursor, limit=limit)
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = str(next_cursor)
+    return tables
 
 
 @router.post("/create", response_model=TableSummary)
@@ -26,6 +63,25 @@ def create_table(
     return service.create_table(payload)
 
 
+@router.post("/quick-seat", response_model=TableSummary)
+async def quick_seat(
+    payload: QuickSeatRequest,
+    user_id: int = Depends(get_current_user_id),
+    service: TableService = Depends(get_table_service),
+    db: AsyncSession = Depends(get_db),
+) -> TableSummary:
+    try:
+        return await service.quick_seat(payload, user_id=user_id, db=db)
+    except UserNotFoundError as exc:
+        raise http_error(status.HTTP_404_NOT_FOUND, code="user_not_found", message="User not found") from exc
+    except InsufficientBalanceError as exc:
+        raise http_error(
+            status.HTTP_400_BAD_REQUEST,
+            code="insufficient_balance",
+            message="Not enough balance for buy-in",
+        ) from exc
+
+
 @router.get("/{table_id}", response_model=TableDetail)
 def get_table_info(
     table_id: int,
@@ -56,6 +112,8 @@ async def join_table(
             code="insufficient_balance",
             message="Not enough balance for buy-in",
         ) from exc
+    except TableFullError as exc:
+        raise http_error(status.HTTP_409_CONFLICT, code="table_full", message="The table is full") from exc
 
 
 @router.post("/{table_id}/leave", response_model=OkResponse)
@@ -1,14 +1,42 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.database.session import get_db
-from backend.models.user import User
+from backend.rest.core.config import settings
 from backend.rest.errors import http_error
 from backend.rest.schemas.users import UserPublic
+from backend.services.user_directory import user_directory
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 
+def _parse_ids(raw: str) -> list[int]:
+    try:
+        ids = [int(part) for part in raw.split(",") if part.strip()]
+    except ValueError:
+        raise http_error(status.HTTP_400_BAD_REQUEST, code="invalid_user_id", message="ids must be integers") from None
+    if any(user_id < 0 for user_id in ids):
+        raise http_error(status.HTTP_400_BAD_REQUEST, code="invalid_user_id", message="user_id must be positive")
+    if len(ids) > settings.users_batch_max_ids:
+        raise http_error(
+            status.HTTP_400_BAD_REQUEST,
+            code="too_many_ids",
+            message=f"At most {settings.users_batch_max_ids} ids per request",
+        )
+    return list(dict.fromkeys(ids))
+
+
+@router.get("", response_model=list[UserPublic])
+async def get_users_public(
+    ids: str = Query(..., description="Comma-separated user ids"),
+    session: AsyncSession = Depends(get_db),
+) -> list[UserPublic]:
+    """Resolve many users at once; unknown ids are omitted, the rest keep the requested order."""
+    user_ids = _parse_ids(ids)
+    names = await user_directory.resolve(session, user_ids)
+    return [UserPublic(id=user_id, username=names[user_id]) for user_id in user_ids if user_id in names]
+
+
 @router.get("/{user_id}", response_model=UserPublic)
 async def get_user_public(
     user_id: int,
@@ -17,8 +45,8 @@ async def get_user_public(
     if user_id < 0:
         raise http_error(status.HTTP_400_BAD_REQUEST, code="invalid_user_id", message="user_id must be positive")
 
-    user = await session.get(User, user_id)
-    if not user:
+    names = await user_directory.resolve(session, [user_id])
+    if user_id not in names:
         raise http_error(status.HTTP_404_NOT_FOUND, code="user_not_found", message="User not found")
 
-    return UserPublic(id=int(user.id), username=str(user.username))
+    return UserPublic(id=user_id, username=names[user_id])
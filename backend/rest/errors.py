@@ -5,5 +5,15 @@ from fastapi import HTTPException
 from backend.rest.schemas.error import ErrorDetail
 
 
-def http_error(status_code: int, *, code: str, message: str) -> HTTPException:
-    return HTTPException(status_code=status_code, detail=ErrorDetail(code=code, message=message).model_dump())
+def http_error(
+    status_code: int,
+    *,
+    code: str,
+    message: str,
+    headers: dict[str, str] | None = None,
+) -> HTTPException:
+    return HTTPException(
+        status_code=status_code,
+        detail=ErrorDetail(code=code, message=message).model_dump(),
+        headers=headers,
+    )
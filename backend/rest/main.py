@@ -1,16 +1,28 @@
+import asyncio
 import logging
-from typing import Awaitable, Callable
 
-from fastapi import FastAPI, Request, Response
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from .api.middleware import jwt_middleware
+from .api.middleware import ConcurrencyLimitMiddleware, JWTAuthMiddleware
 from .api.router import router as api_router
 from .core.config import settings
+from backend.database.session import ReadSessionLocal, SessionLocal
 from backend.ws_api.router import router as ws_router
+from backend.services.chip_ledger import chip_ledger
+from backend.services.hand_archive import hand_archive, history_partitions, run_archiver
+from backend.services.hand_spool import hand_spool
+from backend.services.leaderboard import leaderboard
 from backend.services.table_service import TableService
+from backend.services.table_snapshot import table_snapshotter
 from backend.services.table_store import table_store
-from backend.ws_api.tables import maybe_start_game, notify_table_changed
+from backend.ws_api.tables import (
+    maybe_start_game,
+    notify_table_changed,
+    resolve_usernames,
+    schedule_reconnect_grace,
+    table_members,
+)
 
 logger = logging.getLogger("hsepoker")
 
@@ -20,6 +32,11 @@ app.state.table_service = TableService(
     notify_table_changed=notify_table_changed,
     maybe_start_game=maybe_start_game,
 )
+if settings.concurrency_limits_enabled:
+    # Added before the auth middleware so unauthenticated requests are rejected without taking a slot.
+    app.add_middleware(ConcurrencyLimitMiddleware)
+app.add_middleware(JWTAuthMiddleware)
+# Added last so it is outermost: 401 and 503 responses from the middlewares above carry CORS headers too.
 _cors_origins = settings.cors_list()
 app.add_middleware(
     CORSMiddleware,
@@ -42,9 +59,66 @@ async def _log_settings() -> None:
     )
 
 
-@app.middleware("http")
-async def jwt_middleware_app(
-    request: Request,
-    call_next: Callable[[Request], Awaitable[Response]],
-) -> Response:
-    return await jwt_middleware(request, call_next)
+@app.on_event("startup")
+async def _restore_tables() -> None:
+    if table_snapshotter is None:
+        return
+    records = table_snapshotter.restore(table_store)
+    if records:
+        async with SessionLocal() as session:
+            records = await table_snapshotter.reconcile(session, table_store, records)
+        await resolve_usernames(user_id for record in records for user_id in table_members(record))
+    schedule_reconnect_grace(records)
+
+
+@app.on_event("startup")
+async def _start_background_tasks() -> None:
+    if not settings.background_tasks_enabled:
+        app.state.background_tasks = []
+        return
+    app.state.background_tasks = [
+        asyncio.create_task(chip_ledger.run_compaction(SessionLocal, settings.ledger_compaction_seconds)),
+        asyncio.create_task(leaderboard.preload(ReadSessionLocal)),
+        asyncio.create_task(
+            run_archiver(
+                SessionLocal,
+                hand_archive,
+                history_partitions,
+                settings.history_archive_seconds,
+                persistent=settings.history_archive_persistent,
+            )
+        ),
+    ]
+    if settings.table_hibernation_enabled:
+        app.state.background_tasks.append(
+            asyncio.create_task(
+                table_store.run_hibernator(
+                    settings.table_hibernate_idle_seconds,
+                    settings.table_hibernate_interval_seconds,
+                )
+            )
+        )
+    if table_snapshotter is not None:
+        app.state.background_tasks.append(
+            asyncio.create_task(table_snapshotter.run(table_store, settings.table_snapshot_seconds))
+        )
+    if hand_spool is not None:
+        app.state.background_tasks.append(
+            asyncio.create_task(
+                hand_spool.run_drainer(
+                    SessionLocal,
+                    settings.hand_spool_drain_seconds,
+                    batch_size=settings.hand_spool_drain_batch,
+                )
+            )
+        )
+
+
+@app.on_event("shutdown")
+async def _stop_background_tasks() -> None:
+    for task in getattr(app.state, "background_tasks", []):
+        task.cancel()
+    if table_snapshotter is not None:
+        table_snapshotter.write(table_store)
+    if hand_spool is not None:
+        hand_spool.close()
@@ -1,4 +1,13 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, computed_field
+
+
+def _percent(part: int, whole: int) -> float:
+    return round(100.0 * part / whole, 1) if whole else 0.0
+
+
+class PositionStatsOut(BaseModel):
+    hands: int = 0
+    net: int = 0
 
 
 class PlayerStatsOut(BaseModel):
@@ -9,6 +18,53 @@ class PlayerStatsOut(BaseModel):
     max_bet: int
     lost_stack: int
     won_stack: int
+    vpip_hands: int = 0
+    pfr_hands: int = 0
+    three_bet_hands: int = 0
+    three_bet_chances: int = 0
+    aggressive_actions: int = 0
+    passive_actions: int = 0
+    flops_seen: int = 0
+    showdowns: int = 0
+    showdowns_won: int = 0
+    positions: dict[str, PositionStatsOut] = {}
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def hands_played(self) -> int:
+        return self.hands_won + self.hands_lost
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def vpip(self) -> float:
+        return _percent(self.vpip_hands, self.hands_played)
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def pfr(self) -> float:
+        return _percent(self.pfr_hands, self.hands_played)
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def three_bet(self) -> float:
+        return _percent(self.three_bet_hands, self.three_bet_chances)
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def aggression_factor(self) -> float:
+        """(bets + raises) / calls."""
+        return round(self.aggressive_actions / (self.passive_actions or 1), 2)
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def showdown_rate(self) -> float:
+        """Went to showdown, % of hands that saw the flop."""
+        return _percent(self.showdowns, self.flops_seen)
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def showdown_win_rate(self) -> float:
+        return _percent(self.showdowns_won, self.showdowns)
 
 
 class PlayerHistoryEntry(BaseModel):
@@ -23,3 +79,15 @@ class PlayerHistoryEntry(BaseModel):
     board: list[str]
     winners: list[int]
     pot: int
+
+
+class LeaderboardEntry(BaseModel):
+    rank: int
+    user_id: int
+    value: int
+
+
+class LeaderboardOut(BaseModel):
+    metric: str
+    total: int
+    entries: list[LeaderboardEntry]
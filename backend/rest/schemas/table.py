@@ -7,6 +7,11 @@ class TableCreateRequest(BaseModel):
     private: bool = False
 
 
+class QuickSeatRequest(BaseModel):
+    buy_in: int = Field(ge=0)
+    max_players: int | None = Field(default=None, ge=2, le=9)
+
+
 class TableSummary(BaseModel):
     id: str
     max_players: int
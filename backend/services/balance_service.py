@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+
+from sqlalchemy import case, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models.user import User
+
+
+class BalanceService:
+    """Single-statement updates of ``users.balance``.
+
+    Every operation is one ``UPDATE ... RETURNING`` so no row is loaded into Python first.
+    Methods don't commit; the caller owns the transaction.
+    """
+
+    async def credit_many(self, db: AsyncSession, credits: Mapping[int, int]) -> dict[int, int]:
+        """Apply many per-user amounts in one ``UPDATE``; return the new balances by user id."""
+        amounts = {int(user_id): int(amount) for user_id, amount in credits.items() if amount}
+        if not amounts:
+            return {}
+        stmt = (
+            update(User)
+            .where(User.id.in_(amounts))
+            .values(balance=User.balance + case(amounts, value=User.id, else_=0))
+            .returning(User.id, User.balance)
+            .execution_options(synchronize_session="fetch")
+        )
+        result = await db.execute(stmt)
+        return {int(user_id): int(balance) for user_id, balance in result.all()}
+
+
+balance_service = BalanceService()
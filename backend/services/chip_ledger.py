@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import OrderedDict
+from collections.abc import Mapping
+
+from sqlalchemy import Select, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from backend.models.chip_ledger import BALANCE_REASONS, HAND_REASON, ChipLedgerEntry
+from backend.models.user import User
+from backend.services.balance_service import BalanceService, balance_service
+
+logger = logging.getLogger("hsepoker.ledger")
+
+COMPACTION_BATCH_SIZE = 5000
+CACHED_BALANCES = 10_000
+
+
+class ChipLedger:
+    """Append-only chip movements on top of ``users.balance``.
+
+    Buy-ins and cashouts are INSERTs into ``chip_ledger``; the ``users`` row is not touched
+    on the hot path. A user's spendable balance is ``users.balance`` plus their entries that
+    have not been compacted yet. ``compact`` periodically folds those entries into
+    ``users.balance`` with one batched UPDATE.
+
+    Running totals of the ``max_cached`` most recently used users are cached for balance
+    reads; an evicted user is summed again on the next lookup. The cache only sees this
+    process's writes, so buy-ins are checked against the database instead (see ``debit``).
+    """
+
+    def __init__(
+        self,
+        balances: BalanceService = balance_service,
+        *,
+        batch_size: int = COMPACTION_BATCH_SIZE,
+        max_cached: int = CACHED_BALANCES,
+    ) -> None:
+        self._balances = balances
+        self._batch_size = batch_size
+        self._max_cached = max_cached
+        self._totals: OrderedDict[int, int] = OrderedDict()
+
+    async def available(self, db: AsyncSession, user_id: int) -> int | None:
+        """Return the user's spendable balance, or None if the user doesn't exist."""
+        cached = self._totals.get(user_id)
+        if cached is not None:
+            self._totals.move_to_end(user_id)
+            return cached
+        pending = self._pending(user_id).scalar_subquery()
+        total = await db.scalar(select(User.balance + pending).where(User.id == user_id))
+        if total is None:
+            return None
+        cached = self._totals.get(user_id)
+        if cached is not None:
+            # Another request filled it while this one was reading; keep its newer value.
+            return cached
+        return self._remember(user_id, int(total))
+
+    async def debit(self, db: AsyncSession, user_id: int, amount: int, *, table_id: int | None = None) -> int | None:
+        """Record a buy-in if the balance covers it; return the new balance or None.
+
+        The check never trusts the cache: the ``users`` row is locked until the entry is
+        committed and the total is summed under that lock, so concurrent buy-ins from any
+        worker are checked one after another and cannot overdraw the balance.
+        """
+        balance = await db.scalar(select(User.balance).where(User.id == user_id).with_for_update())
+        if balance is None:
+            await db.rollback()
+            return None
+        total = self._remember(user_id, int(balance) + int(await db.scalar(self._pending(user_id)) or 0))
+        if total < amount:
+            await db.rollback()
+            return None
+        return await self._append(db, user_id, -amount, "buy_in", table_id, self._remember(user_id, total - amount))
+
+    async def credit(self, db: AsyncSession, user_id: int, amount: int, *, table_id: int | None = None) -> int | None:
+        """Record a cashout; return the new balance or None if the user doesn't exist."""
+        total = await self.available(db, user_id)
+        if total is None:
+            return None
+        return await self._append(db, user_id, amount, "cashout", table_id, self._remember(user_id, total + amount))
+
+    async def credit_many(
+        self,
+        db: AsyncSession,
+        credits: Mapping[int, int],
+        *,
+        table_id: int | None = None,
+    ) -> None:
+        """Record many cashouts with one bulk insert and a single commit."""
+        amounts = {int(user_id): int(amount) for user_id, amount in credits.items() if amount}
+        if not amounts:
+            return
+        db.add_all(
+            [
+                ChipLedgerEntry(user_id=user_id, amount=amount, reason="cashout", table_id=table_id)
+                for user_id, amount in amounts.items()
+            ]
+        )
+        await db.commit()
+        for user_id, amount in amounts.items():
+            if user_id in self._totals:
+                self._totals[user_id] += amount
+
+    def record_hand(self, db: AsyncSession, table_id: int, deltas: Mapping[int, int]) -> None:
+        """Add audit entries for a finished hand; the caller commits with the hand results."""
+        for user_id, amount in deltas.items():
+            db.add(ChipLedgerEntry(user_id=user_id, amount=int(amount), reason=HAND_REASON, table_id=table_id))
+
+    async def compact(self, db: AsyncSession) -> int:
+        """Fold up to one batch of pending entries into ``users.balance``; return how many."""
+        picked = (
+            select(ChipLedgerEntry.id)
+            .where(ChipLedgerEntry.compacted.is_(False))
+            .order_by(ChipLedgerEntry.id)
+            .limit(self._batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(ChipLedgerEntry)
+            .where(ChipLedgerEntry.id.in_(picked))
+            .values(compacted=True)
+            .returning(ChipLedgerEntry.user_id, ChipLedgerEntry.amount, ChipLedgerEntry.reason)
+            .execution_options(synchronize_session=False)
+        )
+        rows = (await db.execute(stmt)).all()
+        sums: dict[int, int] = {}
+        for user_id, amount, reason in rows:
+            if reason in BALANCE_REASONS:
+                sums[int(user_id)] = sums.get(int(user_id), 0) + int(amount)
+        await self._balances.credit_many(db, sums)
+        await db.commit()
+        return len(rows)
+
+    async def run_compaction(self, session_factory: async_sessionmaker[AsyncSession], interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                async with session_factory() as session:
+                    while await self.compact(session) >= self._batch_size:
+                        pass
+            except Exception:
+                logger.exception("chip ledger compaction failed")
+
+    def _pending(self, user_id: int) -> Select[int]:
+        return select(func.coalesce(func.sum(ChipLedgerEntry.amount), 0)).where(
+            ChipLedgerEntry.user_id == user_id,
+            ChipLedgerEntry.compacted.is_(False),
+            ChipLedgerEntry.reason.in_(BALANCE_REASONS),
+        )
+
+    def _remember(self, user_id: int, total: int) -> int:
+        self._totals[user_id] = total
+        self._totals.move_to_end(user_id)
+        while len(self._totals) > self._max_cached:
+            self._totals.popitem(last=False)
+        return total
+
+    async def _append(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        amount: int,
+        reason: str,
+        table_id: int | None,
+        balance: int,
+    ) -> int:
+        if amount:
+            db.add(ChipLedgerEntry(user_id=user_id, amount=amount, reason=reason, table_id=table_id))
+            try:
+                await db.commit()
+            except Exception:
+                if user_id in self._totals:
+                    self._totals[user_id] -= amount
+                raise
+        return balance
+
+
+chip_ledger = ChipLedger()
@@ -1,19 +1,39 @@
 from __future__ import annotations
 
+import time
+from dataclasses import asdict
 from typing import Dict, List
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.poker_engine.table import Table
 from backend.poker_engine.game_state import PlayerAction
-from backend.models.finished_game import FinishedGame
-from backend.models.player_game import PlayerGame
-from backend.models.player_stats import PlayerStats, StatsDelta, update_stats
+from backend.services.chip_ledger import ChipLedger, chip_ledger
+from backend.services.hand_history import HandHistoryWriter, HandRecord, PlayerHandRecord
+from backend.services.hand_spool import HandSpool
+from backend.services.leaderboard import Leaderboard, leaderboard
+from backend.services.stats_cache import StatsCache, stats_cache
 
 
 class GameService:
-    def __init__(self) -> None:
+    """Drives hands on a table and persists every finished hand.
+
+    With a ``spool`` the finished hand is only appended to the local spool file and the
+    drainer writes it to the database later; without one it is written and committed
+    right away.
+    """
+
+    def __init__(
+        self,
+        ledger: ChipLedger = chip_ledger,
+        spool: HandSpool | None = None,
+        board: Leaderboard = leaderboard,
+        cache: StatsCache = stats_cache,
+    ) -> None:
         self._start_stacks: Dict[int, Dict[int, int]] = {}
+        self._writer = HandHistoryWriter(ledger, board, cache)
+        self._spool = spool
+        self._cache = cache
 
     async def start_hand(self, table: Table) -> None:
         self._start_stacks[table.table_id] = {player.user_id: player.stack for player in table.players}
@@ -35,47 +55,47 @@ class GameService:
             await self._record_finished_hand(table, db)
 
     async def _record_finished_hand(self, table: Table, db: AsyncSession) -> None:
+        record = self._build_record(table)
+        if record is None:
+            return
+        # The writer invalidates again after its commit; with a spool that is when the drainer
+        # catches up, so anything cached in between is dropped too.
+        self._cache.invalidate(p.user_id for p in record.players)
+        if self._spool is not None:
+            self._spool.append(record)
+            return
+        await self._writer.write_batch(db, [record])
+
+    def _build_record(self, table: Table) -> HandRecord | None:
         game_state = table.game_state
         if game_state is None:
-            return
+            return None
         start_stacks = self._start_stacks.pop(table.table_id, None)
         if start_stacks is None:
-            return
-        winner_ids: List[int] = [p.user_id for p in (game_state.winners or [])]
-        board_str = [str(card) for card in game_state.board]
-        finished_game = FinishedGame(
+            return None
+        winners = game_state.winners or []
+        winner_ids: List[int] = [p.user_id for p in winners]
+        hand_stats = game_state.hand_stats.players
+        players: List[PlayerHandRecord] = []
+        for p in game_state.players:
+            flags = hand_stats.get(p.user_id)
+            players.append(
+                PlayerHandRecord(
+                    user_id=p.user_id,
+                    hole_cards=[str(c) for c in p.hole_cards],
+                    bet=p.bet,
+                    net_stack_delta=p.stack - start_stacks.get(p.user_id, 0),
+                    resulting_balance=p.stack,
+                    won_hand=p in winners,
+                    **(asdict(flags) if flags is not None else {}),
+                )
+            )
+        return HandRecord(
+            hand_uid=HandRecord.new_uid(),
             table_id=table.table_id,
             pot=game_state.pot,
-            board=board_str,
+            board=[str(card) for card in game_state.board],
             winners=winner_ids,
+            players=players,
+            finished_at=time.time(),
         )
-        db.add(finished_game)
-        await db.flush()
-        for p in game_state.players:
-            initial_stack = start_stacks.get(p.user_id, 0)
-            net_delta = p.stack - initial_stack
-            player_game = PlayerGame(
-                finished_game_uuid=finished_game.uuid,
-                table_id=table.table_id,
-                user_id=p.user_id,
-                hole_cards=[str(c) for c in p.hole_cards],
-                bet=p.bet,
-                net_stack_delta=net_delta,
-                resulting_balance=p.stack,
-                won_hand=p in game_state.winners if game_state.winners else False,
-            )
-            db.add(player_game)
-            existing = await db.get(PlayerStats, p.user_id)
-            if existing is None:
-                existing = PlayerStats(user_id=p.user_id)
-                db.add(existing)
-                await db.flush()
-            delta = StatsDelta(
-                user_id=p.user_id,
-                won_hand=p in game_state.winners if game_state.winners else False,
-                bet=p.bet,
-                net_stack_delta=net_delta,
-                resulting_balance=p.stack,
-            )
-            update_stats(existing, [delta])
-        await db.commit()
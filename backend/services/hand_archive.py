@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import logging
+import os
+from collections.abc import AsyncIterator, Iterable
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import Select, and_, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from backend.models.finished_game import FinishedGame
+from backend.models.player_game import PlayerGame
+from backend.rest.core.config import settings
+from backend.services.history_partitions import HistoryPartitions, PartitionRange
+
+logger = logging.getLogger("hsepoker.archive")
+
+MANIFEST_NAME = "manifest.json"
+
+HistoryRow = dict[str, Any]
+
+
+def history_row(pg: PlayerGame, game: FinishedGame | None) -> HistoryRow:
+    """Flatten one ``player_games`` row (plus its hand) the way the history endpoints return it."""
+    return {
+        "id": pg.id,
+        "game_id": str(pg.finished_game_uuid) if pg.finished_game_uuid is not None else None,
+        "table_id": pg.table_id,
+        "user_id": pg.user_id,
+        "hole_cards": pg.hole_cards,
+        "bet": pg.bet,
+        "net_stack_delta": pg.net_stack_delta,
+        "resulting_balance": pg.resulting_balance,
+        "won_hand": pg.won_hand,
+        "board": game.board if game else [],
+        "winners": game.winners if game else [],
+        "pot": game.pot if game else 0,
+        "finished_at": pg.finished_at.isoformat() if pg.finished_at else None,
+    }
+
+
+class HandArchive:
+    """Cold hand history: one compressed segment file per archived partition.
+
+    A segment is a concatenation of gzip members, one per user, each holding that user's
+    history rows as JSON lines, newest first. The ``.idx.json`` next to it maps user id to
+    ``[offset, length, count]`` of their member, so reading one user's history decompresses
+    only their block. ``manifest.json`` lists the segments, newest first.
+    """
+
+    def __init__(self, directory: str | Path) -> None:
+        self.directory = Path(directory)
+        self._manifest: list[dict[str, str]] | None = None
+        self._indexes: dict[str, dict[str, list[int]]] = {}
+
+    def segments(self) -> list[dict[str, str]]:
+        if self._manifest is None:
+            try:
+                self._manifest = json.loads((self.directory / MANIFEST_NAME).read_text())
+            except FileNotFoundError:
+                self._manifest = []
+        return self._manifest
+
+    def open_segment(self, partition: PartitionRange) -> SegmentWriter:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        return SegmentWriter(self, partition)
+
+    def write_segment(self, partition: PartitionRange, rows_by_user: Iterable[tuple[int, list[HistoryRow]]]) -> Path:
+        """Write one segment from ``(user_id, rows newest first)`` groups and register it."""
+        writer = self.open_segment(partition)
+        for user_id, rows in rows_by_user:
+            writer.add(user_id, rows)
+        return writer.close()
+
+    def _register(self, name: str, partition: PartitionRange, index: dict[str, list[int]]) -> None:
+        _write_json_atomic(self.directory / f"{name}.idx.json", index)
+        entry = {"name": name, "start": partition.start.isoformat(), "end": partition.end.isoformat()}
+        manifest = [segment for segment in self.segments() if segment["name"] != name] + [entry]
+        manifest.sort(key=lambda segment: segment["start"], reverse=True)
+        _write_json_atomic(self.directory / MANIFEST_NAME, manifest)
+        self._manifest = manifest
+        self._indexes[name] = index
+
+    def history(self, user_id: int, *, before: int | None, limit: int) -> list[HistoryRow]:
+        """Return up to ``limit`` archived rows of ``user_id`` with id below ``before``, newest first."""
+        result: list[HistoryRow] = []
+        for segment in self.segments():
+            if len(result) >= limit:
+                break
+            for row in self.user_rows(segment["name"], user_id):
+                if before is not None and row["id"] >= before:
+                    continue
+                result.append(row)
+                if len(result) >= limit:
+                    break
+        return result
+
+    def user_rows(self, name: str, user_id: int) -> list[HistoryRow]:
+        """Return all rows of ``user_id`` in segment ``name``, newest first."""
+        index = self._indexes.get(name)
+        if index is None:
+            index = self._indexes[name] = json.loads((self.directory / f"{name}.idx.json").read_text())
+        location = index.get(str(user_id))
+        if location is None:
+            return []
+        offset, length, _count = location
+        with open(self.directory / f"{name}.seg", "rb") as fh:
+            fh.seek(offset)
+            block = gzip.decompress(fh.read(length))
+        return [json.loads(line) for line in block.splitlines()]
+
+
+class SegmentWriter:
+    """Appends per-user blocks to a new segment; ``close`` makes it visible in the manifest."""
+
+    def __init__(self, archive: HandArchive, partition: PartitionRange) -> None:
+        self._archive = archive
+        self._partition = partition
+        self.name = f"history-{partition.suffix}"
+        self.path = archive.directory / f"{self.name}.seg"
+        self._file = open(self.path, "wb")
+        self._index: dict[str, list[int]] = {}
+
+    def add(self, user_id: int, rows: list[HistoryRow]) -> None:
+        block = gzip.compress(b"".join(json.dumps(row, separators=(",", ":")).encode() + b"\n" for row in rows))
+        self._index[str(user_id)] = [self._file.tell(), len(block), len(rows)]
+        self._file.write(block)
+
+    def close(self) -> Path:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        self._archive._register(self.name, self._partition, self._index)
+        return self.path
+
+
+def _write_json_atomic(path: Path, payload: Any) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w") as fh:
+        json.dump(payload, fh)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
+
+
+def history_select() -> Select[PlayerGame, FinishedGame]:
+    """``player_games`` joined with their hand, partition key included so pruning applies."""
+    return select(PlayerGame, FinishedGame).join(
+        FinishedGame,
+        and_(
+            FinishedGame.uuid == PlayerGame.finished_game_uuid,
+            FinishedGame.finished_at == PlayerGame.finished_at,
+        ),
+    )
+
+
+async def _rows_by_user(db: AsyncSession, partition: PartitionRange) -> AsyncIterator[tuple[int, list[HistoryRow]]]:
+    stmt = (
+        history_select()
+        .where(PlayerGame.finished_at >= partition.start, PlayerGame.finished_at < partition.end)
+        .order_by(PlayerGame.user_id, PlayerGame.id.desc())
+    )
+    current_user: int | None = None
+    rows: list[HistoryRow] = []
+    async for pg, game in await db.stream(stmt):
+        if pg.user_id != current_user:
+            if current_user is not None:
+                yield current_user, rows
+            current_user, rows = pg.user_id, []
+        rows.append(history_row(pg, game))
+    if current_user is not None:
+        yield current_user, rows
+
+
+async def archive_partition(db: AsyncSession, archive: HandArchive, partition: PartitionRange) -> Path:
+    """Export ``partition`` into a segment file; the rows stay in the database."""
+    writer = archive.open_segment(partition)
+    async for user_id, rows in _rows_by_user(db, partition):
+        writer.add(user_id, rows)
+    return writer.close()
+
+
+async def run_archiver(
+    session_factory: async_sessionmaker[AsyncSession],
+    archive: HandArchive,
+    partitions: HistoryPartitions,
+    interval: float,
+    *,
+    persistent: bool,
+) -> None:
+    """Keep future partitions created and move expired ones into the archive.
+
+    Archiving drops the partition, so it only happens when ``persistent`` says the archive
+    directory survives a redeploy; otherwise expired partitions simply stay in the database.
+    """
+    while True:
+        try:
+            async with session_factory() as session:
+                if session.get_bind().dialect.name != "postgresql":
+                    logger.info("hand history partitioning needs postgresql; archiver disabled")
+                    return
+                now = datetime.now(timezone.utc)
+                await partitions.ensure(session, now)
+                expired = await partitions.expired(session, now)
+                if expired and not persistent:
+                    logger.warning(
+                        "%d expired hand history partitions kept: the archive directory %s is not marked "
+                        "persistent (HISTORY_ARCHIVE_PERSISTENT)",
+                        len(expired),
+                        archive.directory,
+                    )
+                    expired = []
+                for partition in expired:
+                    path = await archive_partition(session, archive, partition)
+                    await partitions.detach(session, partition)
+                    logger.info("archived hand history partition %s to %s", partition.suffix, path)
+        except Exception:
+            logger.exception("hand history archival failed")
+        await asyncio.sleep(interval)
+
+
+hand_archive = HandArchive(settings.history_archive_dir)
+history_partitions = HistoryPartitions(
+    ahead=settings.history_partitions_ahead,
+    keep=settings.history_hot_partitions,
+)
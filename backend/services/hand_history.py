@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import json
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Sequence
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models.finished_game import FinishedGame
+from backend.models.player_game import PlayerGame
+from backend.models.player_stats import PlayerStats, StatsDelta, update_stats
+from backend.services.chip_ledger import ChipLedger, chip_ledger
+from backend.services.leaderboard import Leaderboard, leaderboard
+from backend.services.stats_cache import StatsCache, stats_cache
+
+
+@dataclass(frozen=True, slots=True)
+class PlayerHandRecord:
+    user_id: int
+    hole_cards: list[str]
+    bet: int
+    net_stack_delta: int
+    resulting_balance: int
+    won_hand: bool
+    position: str | None = None
+    vpip: bool = False
+    pfr: bool = False
+    three_bet: bool = False
+    three_bet_chance: bool = False
+    aggressive_actions: int = 0
+    passive_actions: int = 0
+    saw_flop: bool = False
+    showdown: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class HandRecord:
+    """Everything needed to persist one finished hand, independent of the engine objects."""
+
+    hand_uid: str
+    table_id: int
+    pot: int
+    board: list[str]
+    winners: list[int]
+    players: list[PlayerHandRecord]
+    finished_at: float
+
+    def __post_init__(self) -> None:
+        # ``finished_at`` is half of the dedupe key, so a record without it could never be
+        # recognised when a spool segment is replayed.
+        if self.finished_at <= 0:
+            raise ValueError(f"hand {self.hand_uid} has no finished_at")
+
+    @staticmethod
+    def new_uid() -> str:
+        return uuid.uuid4().hex
+
+    def to_json(self) -> bytes:
+        return json.dumps(asdict(self), separators=(",", ":")).encode("utf-8")
+
+    @classmethod
+    def from_json(cls, payload: bytes) -> HandRecord:
+        data: dict[str, Any] = json.loads(payload)
+        players = [PlayerHandRecord(**player) for player in data.pop("players")]
+        return cls(players=players, **data)
+
+
+class HandHistoryWriter:
+    """Writes finished hands into ``finished_games`` / ``player_games`` / ``player_stats``.
+
+    Shared by the direct path (one hand, right after it finishes) and the spool drainer
+    (many hands at once). After the commit the updated stats are pushed to the leaderboard
+    and the players' cached stats are invalidated.
+    """
+
+    def __init__(
+        self,
+        ledger: ChipLedger = chip_ledger,
+        board: Leaderboard = leaderboard,
+        cache: StatsCache = stats_cache,
+    ) -> None:
+        self._ledger = ledger
+        self._board = board
+        self._cache = cache
+
+    async def write_batch(self, db: AsyncSession, records: Sequence[HandRecord], *, dedupe: bool = False) -> int:
+        """Write and commit ``records``; return how many hands were written.
+
+        With ``dedupe`` hands that are already stored hit ``uq_finished_games_hand_uid`` and
+        are skipped (``ON CONFLICT DO NOTHING``), so replaying a spool segment after a crash
+        between commit and offset update is harmless.
+        """
+        if not records:
+            return 0
+
+        stmt = insert(FinishedGame).values(
+            [
+                {
+                    "finished_at": datetime.fromtimestamp(record.finished_at, timezone.utc),
+                    "hand_uid": record.hand_uid,
+                    "table_id": record.table_id,
+                    "pot": record.pot,
+                    "board": record.board,
+                    "winners": record.winners,
+                }
+                for record in records
+            ]
+        )
+        if dedupe:
+            stmt = stmt.on_conflict_do_nothing(constraint="uq_finished_games_hand_uid")
+        result = await db.execute(stmt.returning(FinishedGame.uuid, FinishedGame.hand_uid, FinishedGame.finished_at))
+        inserted = {hand_uid: (game_uuid, finished_at) for game_uuid, hand_uid, finished_at in result.all()}
+        records = [record for record in records if record.hand_uid in inserted]
+        if not records:
+            await db.rollback()
+            return 0
+
+        deltas: dict[int, list[StatsDelta]] = {}
+        for record in records:
+            game_uuid, finished_at = inserted[record.hand_uid]
+            for p in record.players:
+                db.add(
+                    PlayerGame(
+                        finished_at=finished_at,
+                        finished_game_uuid=game_uuid,
+                        table_id=record.table_id,
+                        user_id=p.user_id,
+                        hole_cards=p.hole_cards,
+                        bet=p.bet,
+                        net_stack_delta=p.net_stack_delta,
+                        resulting_balance=p.resulting_balance,
+                        won_hand=p.won_hand,
+                    )
+                )
+                deltas.setdefault(p.user_id, []).append(
+                    StatsDelta(
+                        user_id=p.user_id,
+                        won_hand=p.won_hand,
+                        bet=p.bet,
+                        net_stack_delta=p.net_stack_delta,
+                        resulting_balance=p.resulting_balance,
+                        position=p.position,
+                        vpip=p.vpip,
+                        pfr=p.pfr,
+                        three_bet=p.three_bet,
+                        three_bet_chance=p.three_bet_chance,
+                        aggressive_actions=p.aggressive_actions,
+                        passive_actions=p.passive_actions,
+                        saw_flop=p.saw_flop,
+                        showdown=p.showdown,
+                    )
+                )
+            self._ledger.record_hand(db, record.table_id, {p.user_id: p.net_stack_delta for p in record.players})
+
+        touched: list[PlayerStats] = []
+        for user_id, user_deltas in deltas.items():
+            existing = await db.get(PlayerStats, user_id)
+            if existing is None:
+                existing = PlayerStats(user_id=user_id)
+                db.add(existing)
+                await db.flush()
+            touched.append(update_stats(existing, user_deltas))
+        await db.commit()
+        self._board.observe(touched)
+        self._cache.invalidate(deltas)
+        return len(records)
+
+
+hand_history_writer = HandHistoryWriter()
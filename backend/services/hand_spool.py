@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import struct
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from backend.rest.core.config import settings
+from backend.services.hand_history import HandHistoryWriter, HandRecord, hand_history_writer
+
+logger = logging.getLogger("hsepoker.spool")
+
+# Every record is: payload length, crc32 of the payload, payload (HandRecord JSON).
+_HEADER = struct.Struct(">II")
+
+
+@dataclass(slots=True)
+class SpoolMetrics:
+    appended: int = 0
+    drained: int = 0
+    duplicates: int = 0
+    fsyncs: int = 0
+    drain_errors: int = 0
+    truncated_bytes: int = 0
+
+    def snapshot(self) -> dict[str, int]:
+        return {
+            "appended": self.appended,
+            "drained": self.drained,
+            "duplicates": self.duplicates,
+            "fsyncs": self.fsyncs,
+            "drain_errors": self.drain_errors,
+            "truncated_bytes": self.truncated_bytes,
+        }
+
+
+class HandSpool:
+    """Append-only local file of finished hands waiting to be written to the database.
+
+    ``append`` only writes to the file, so finishing a hand never waits on Postgres. Each
+    record is flushed to the OS immediately (a process crash loses nothing) and fsynced in
+    groups: after ``fsync_batch`` records or ``fsync_interval`` seconds, whichever comes
+    first, so a power loss can cost at most one unsynced group.
+
+    The drained position lives in a ``<path>.offset`` sidecar that is replaced atomically
+    after each committed batch. Once everything is drained the file is truncated. A torn
+    record at the tail (crash mid-write) is detected by length/crc and cut off on open.
+    """
+
+    def __init__(self, path: str | Path, *, fsync_batch: int = 32, fsync_interval: float = 0.05) -> None:
+        self.path = Path(path)
+        self._offset_path = self.path.with_name(self.path.name + ".offset")
+        self._fsync_batch = fsync_batch
+        self._fsync_interval = fsync_interval
+        self._file: BinaryIO | None = None
+        self._offset = 0
+        self._size = 0
+        self._unsynced = 0
+        self._sync_handle: asyncio.TimerHandle | None = None
+        self.metrics = SpoolMetrics()
+
+    @property
+    def pending_bytes(self) -> int:
+        return self._size - self._offset
+
+    def append(self, record: HandRecord) -> None:
+        payload = record.to_json()
+        fh = self._open()
+        fh.write(_HEADER.pack(len(payload), zlib.crc32(payload)) + payload)
+        fh.flush()
+        self._size += _HEADER.size + len(payload)
+        self._unsynced += 1
+        self.metrics.appended += 1
+        if self._unsynced >= self._fsync_batch:
+            self.sync()
+        elif self._sync_handle is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                self.sync()
+            else:
+                self._sync_handle = loop.call_later(self._fsync_interval, self.sync)
+
+    def sync(self) -> None:
+        if self._sync_handle is not None:
+            self._sync_handle.cancel()
+            self._sync_handle = None
+        if self._file is None or not self._unsynced:
+            return
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self.metrics.fsyncs += 1
+
+    def read(self, limit: int) -> tuple[list[HandRecord], int]:
+        """Return up to ``limit`` undrained records and the offset just past the last one."""
+        self._open()
+        records: list[HandRecord] = []
+        offset = self._offset
+        if offset >= self._size:
+            return records, offset
+        with open(self.path, "rb") as fh:
+            fh.seek(offset)
+            while len(records) < limit and offset < self._size:
+                payload = self._read_record(fh)
+                if payload is None:
+                    break
+                records.append(HandRecord.from_json(payload))
+                offset += _HEADER.size + len(payload)
+        return records, offset
+
+    def commit(self, offset: int) -> None:
+        """Mark everything before ``offset`` as drained."""
+        self._open()
+        if offset >= self._size:
+            # Nothing is left: start the file over instead of growing it forever.
+            self.sync()
+            assert self._file is not None
+            self._file.truncate(0)
+            self._size = 0
+            offset = 0
+        self._offset = offset
+        self._write_offset(offset)
+
+    def close(self) -> None:
+        self.sync()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    async def drain(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        writer: HandHistoryWriter = hand_history_writer,
+        *,
+        batch_size: int = 500,
+    ) -> int:
+        """Replay one batch of spooled hands into the database; return how many were read."""
+        records, offset = self.read(batch_size)
+        if not records:
+            return 0
+        async with session_factory() as session:
+            written = await writer.write_batch(session, records, dedupe=True)
+        self.commit(offset)
+        self.metrics.drained += written
+        self.metrics.duplicates += len(records) - written
+        return len(records)
+
+    async def run_drainer(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        interval: float,
+        *,
+        batch_size: int = 500,
+    ) -> None:
+        while True:
+            try:
+                while await self.drain(session_factory, batch_size=batch_size) >= batch_size:
+                    pass
+            except Exception:
+                self.metrics.drain_errors += 1
+                logger.exception("hand spool drain failed")
+            await asyncio.sleep(interval)
+
+    def _open(self) -> BinaryIO:
+        if self._file is not None:
+            return self._file
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fh = open(self.path, "a+b")
+        size = fh.seek(0, os.SEEK_END)
+        offset = self._read_offset()
+        if offset > size:
+            offset = 0
+        valid = self._scan(fh, offset, size)
+        if valid < size:
+            logger.warning("hand spool %s: dropping %d bytes of torn tail", self.path, size - valid)
+            fh.truncate(valid)
+            self.metrics.truncated_bytes += size - valid
+        self._file, self._offset, self._size = fh, offset, valid
+        return fh
+
+    @staticmethod
+    def _scan(fh: BinaryIO, offset: int, size: int) -> int:
+        """Return the end of the last intact record at or after ``offset``."""
+        fh.seek(offset)
+        while offset < size:
+            payload = HandSpool._read_record(fh)
+            if payload is None:
+                break
+            offset += _HEADER.size + len(payload)
+        return offset
+
+    @staticmethod
+    def _read_record(fh: BinaryIO) -> bytes | None:
+        header = fh.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            return None
+        length, crc = _HEADER.unpack(header)
+        payload = fh.read(length)
+        if len(payload) < length or zlib.crc32(payload) != crc:
+            return None
+        return payload
+
+    def _read_offset(self) -> int:
+        try:
+            return int(self._offset_path.read_text().strip() or 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def _write_offset(self, offset: int) -> None:
+        tmp = self._offset_path.with_name(self._offset_path.name + ".tmp")
+        with open(tmp, "w") as fh:
+            fh.write(str(offset))
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, self._offset_path)
+
+
+hand_spool: HandSpool | None = (
+    HandSpool(
+        settings.hand_spool_path,
+        fsync_batch=settings.hand_spool_fsync_batch,
+        fsync_interval=settings.hand_spool_fsync_seconds,
+    )
+    if settings.hand_spool_enabled
+    else None
+)
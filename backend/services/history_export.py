@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import zlib
+from collections.abc import AsyncIterable, AsyncIterator
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from backend.models.player_game import PlayerGame
+from backend.services.hand_archive import HandArchive, HistoryRow, history_row, history_select
+
+EXPORT_FETCH_SIZE = 500
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+
+async def iter_history(
+    session_factory: async_sessionmaker[AsyncSession],
+    archive: HandArchive,
+    user_id: int,
+    *,
+    fetch_size: int = EXPORT_FETCH_SIZE,
+) -> AsyncIterator[HistoryRow]:
+    """Yield every history row of ``user_id``, newest first: live partitions, then the archive.
+
+    Live rows come through a server-side cursor, ``fetch_size`` at a time, in a session owned
+    by the generator so it stays open for as long as the response is streaming.
+    """
+    stmt = (
+        history_select()
+        .where(PlayerGame.user_id == user_id)
+        .order_by(PlayerGame.id.desc())
+        .execution_options(yield_per=fetch_size)
+    )
+    last_id: int | None = None
+    async with session_factory() as session:
+        result = await session.stream(stmt)
+        async for pg, game in result:
+            row = history_row(pg, game)
+            last_id = row["id"]
+            yield row
+    for segment in archive.segments():
+        for row in await asyncio.to_thread(archive.user_rows, segment["name"], user_id):
+            if last_id is None or row["id"] < last_id:
+                yield row
+
+
+async def encode_ndjson(
+    rows: AsyncIterable[HistoryRow],
+    *,
+    compress: bool = False,
+    chunk_bytes: int = EXPORT_CHUNK_BYTES,
+) -> AsyncIterator[bytes]:
+    """Encode rows as NDJSON, optionally gzip-compressed, in chunks of about ``chunk_bytes``."""
+    compressor = zlib.compressobj(wbits=31) if compress else None
+    buffer: list[bytes] = []
+    buffered = 0
+    async for row in rows:
+        line = json.dumps(row, separators=(",", ":")).encode("utf-8") + b"\n"
+        buffer.append(line)
+        buffered += len(line)
+        if buffered >= chunk_bytes:
+            chunk = b"".join(buffer)
+            buffer, buffered = [], 0
+            if compressor is not None:
+                chunk = compressor.compress(chunk)
+            if chunk:
+                yield chunk
+    tail = b"".join(buffer)
+    if compressor is not None:
+        tail = compressor.compress(tail) + compressor.flush()
+    if tail:
+        yield tail
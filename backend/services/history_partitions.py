@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Hand history tables range-partitioned by ``finished_at`` into calendar months; they always
+# share partition bounds. The initial migration creates monthly partitions too.
+PARTITIONED_TABLES: tuple[str, ...] = ("finished_games", "player_games")
+
+_PARTITION_SUFFIX = re.compile(r"_p(\d{4})(\d{2})$")
+
+
+@dataclass(frozen=True, slots=True)
+class PartitionRange:
+    start: datetime
+    end: datetime
+
+    @property
+    def suffix(self) -> str:
+        return f"p{self.start:%Y%m}"
+
+    def name(self, table: str) -> str:
+        return f"{table}_{self.suffix}"
+
+
+def add_months(moment: datetime, months: int) -> datetime:
+    index = moment.year * 12 + moment.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def partition_for(moment: datetime) -> PartitionRange:
+    """Return the monthly partition holding ``moment``."""
+    start = datetime(moment.year, moment.month, 1, tzinfo=timezone.utc)
+    return PartitionRange(start=start, end=add_months(start, 1))
+
+
+def create_partition_sql(table: str, partition: PartitionRange) -> str:
+    return (
+        f'CREATE TABLE IF NOT EXISTS "{partition.name(table)}" PARTITION OF "{table}" '
+        f"FOR VALUES FROM ('{partition.start.isoformat()}') TO ('{partition.end.isoformat()}')"
+    )
+
+
+class HistoryPartitions:
+    """Creates upcoming hand-history partitions and finds/detaches the expired ones.
+
+    Partitions are one month long; the current one and ``ahead`` more are kept created so
+    inserts never miss a partition. Everything older than the newest ``keep`` partitions is
+    due for archival. Postgres only.
+    """
+
+    def __init__(self, *, ahead: int = 2, keep: int = 6) -> None:
+        self.ahead = ahead
+        self.keep = keep
+
+    async def ensure(self, db: AsyncSession, now: datetime) -> None:
+        partition = partition_for(now)
+        for _ in range(self.ahead + 1):
+            for table in PARTITIONED_TABLES:
+                await db.execute(text(create_partition_sql(table, partition)))
+            partition = partition_for(partition.end)
+        await db.commit()
+
+    async def attached(self, db: AsyncSession) -> list[PartitionRange]:
+        """Return the attached partitions of ``finished_games``, oldest first."""
+        rows = await db.execute(
+            text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "JOIN pg_class p ON p.oid = i.inhparent "
+                "WHERE p.relname = :parent"
+            ),
+            {"parent": PARTITIONED_TABLES[0]},
+        )
+        partitions: list[PartitionRange] = []
+        for (name,) in rows.all():
+            match = _PARTITION_SUFFIX.search(name)
+            if match is None:
+                continue
+            start = datetime(int(match.group(1)), int(match.group(2)), 1, tzinfo=timezone.utc)
+            partitions.append(PartitionRange(start=start, end=add_months(start, 1)))
+        return sorted(partitions, key=lambda partition: partition.start)
+
+    async def expired(self, db: AsyncSession, now: datetime) -> list[PartitionRange]:
+        oldest_kept = add_months(partition_for(now).start, -(self.keep - 1))
+        return [partition for partition in await self.attached(db) if partition.end <= oldest_kept]
+
+    async def detach(self, db: AsyncSession, partition: PartitionRange) -> None:
+        """Detach and drop ``partition`` from every history table; the caller archived it first."""
+        for table in PARTITIONED_TABLES:
+            name = partition.name(table)
+            await db.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"'))
+            await db.execute(text(f'DROP TABLE "{name}"'))
+        await db.commit()
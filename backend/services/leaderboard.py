@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from bisect import bisect_left, insort
+from collections.abc import Iterable
+from enum import Enum
+from typing import Callable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from backend.models.player_stats import PlayerStats
+
+logger = logging.getLogger("hsepoker.leaderboard")
+
+
+class LeaderboardMetric(str, Enum):
+    NET_WINNINGS = "net_winnings"
+    HANDS_WON = "hands_won"
+    MAX_BALANCE = "max_balance"
+
+
+_METRIC_VALUES: dict[LeaderboardMetric, Callable[[PlayerStats], int]] = {
+    LeaderboardMetric.NET_WINNINGS: lambda s: int(s.won_stack or 0) - int(s.lost_stack or 0),
+    LeaderboardMetric.HANDS_WON: lambda s: int(s.hands_won or 0),
+    LeaderboardMetric.MAX_BALANCE: lambda s: int(s.max_balance or 0),
+}
+
+
+class RankedList:
+    """Users ordered by a score, best first; ties are broken by user id.
+
+    Keys are ``(-score, user_id)`` in a sorted list, so the top N is a slice and a
+    user's rank is one ``bisect`` away from their current score.
+    """
+
+    def __init__(self) -> None:
+        self._keys: list[tuple[int, int]] = []
+        self._scores: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def set(self, user_id: int, score: int) -> None:
+        previous = self._scores.get(user_id)
+        if previous == score:
+            return
+        if previous is not None:
+            del self._keys[bisect_left(self._keys, (-previous, user_id))]
+        self._scores[user_id] = score
+        insort(self._keys, (-score, user_id))
+
+    def rank(self, user_id: int) -> tuple[int, int] | None:
+        """Return ``(1-based rank, score)`` or None if the user is not ranked."""
+        score = self._scores.get(user_id)
+        if score is None:
+            return None
+        return bisect_left(self._keys, (-score, user_id)) + 1, score
+
+    def page(self, offset: int, limit: int) -> list[tuple[int, int]]:
+        """Return ``(user_id, score)`` pairs for ranks ``offset + 1`` .. ``offset + limit``."""
+        return [(user_id, -neg_score) for neg_score, user_id in self._keys[offset : offset + limit]]
+
+
+class Leaderboard:
+    """In-memory leaderboards over ``player_stats``, one ranked list per metric.
+
+    Rebuilt from ``player_stats`` once, then kept current by ``observe`` whenever the hand
+    history writer commits new stats, so page views never sort the table.
+    """
+
+    def __init__(self) -> None:
+        self._boards = {metric: RankedList() for metric in LeaderboardMetric}
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def observe(self, stats: Iterable[PlayerStats]) -> None:
+        for row in stats:
+            for metric, value in _METRIC_VALUES.items():
+                self._boards[metric].set(row.user_id, value(row))
+
+    async def ensure_loaded(self, db: AsyncSession) -> None:
+        if self._loaded:
+            return
+        async with self._load_lock:
+            if self._loaded:
+                return
+            result = await db.stream_scalars(select(PlayerStats))
+            async for row in result:
+                self.observe([row])
+            self._loaded = True
+
+    async def preload(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        try:
+            async with session_factory() as session:
+                await self.ensure_loaded(session)
+        except Exception:
+            logger.exception("leaderboard preload failed; it will be loaded on first request")
+
+    def size(self, metric: LeaderboardMetric) -> int:
+        return len(self._boards[metric])
+
+    def top(self, metric: LeaderboardMetric, *, limit: int, offset: int = 0) -> list[tuple[int, int, int]]:
+        """Return ``(rank, user_id, score)`` rows."""
+        page = self._boards[metric].page(offset, limit)
+        return [(offset + index + 1, user_id, score) for index, (user_id, score) in enumerate(page)]
+
+    def rank(self, metric: LeaderboardMetric, user_id: int) -> tuple[int, int] | None:
+        return self._boards[metric].rank(user_id)
+
+
+leaderboard = Leaderboard()
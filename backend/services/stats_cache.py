@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import secrets
+import time
+from collections import OrderedDict
+from collections.abc import Hashable, Iterable
+from dataclasses import dataclass
+from typing import Callable, Generic, TypeVar
+
+from backend.rest.core.config import settings
+from backend.rest.schemas.stats import PlayerHistoryEntry, PlayerStatsOut
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+# A first history page and the X-Next-Cursor value sent with it.
+HistoryPage = tuple[list[PlayerHistoryEntry], str | None]
+
+
+@dataclass(slots=True)
+class CacheMetrics:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+    def snapshot(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+class TTLCache(Generic[K, V]):
+    """Bounded LRU map whose entries also expire ``ttl`` seconds after they were stored."""
+
+    def __init__(self, *, max_entries: int, ttl: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._clock = clock
+        self.metrics = CacheMetrics()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> V | None:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= self._clock():
+            if entry is not None:
+                del self._entries[key]
+            self.metrics.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.metrics.hits += 1
+        return entry[1]
+
+    def set(self, key: K, value: V) -> None:
+        self._entries[key] = (self._clock() + self._ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self.metrics.evictions += 1
+
+    def discard(self, key: K) -> None:
+        if self._entries.pop(key, None) is not None:
+            self.metrics.invalidations += 1
+
+
+class StatsCache:
+    """Per-user cache of ``PlayerStatsOut`` and the first history page.
+
+    Every user has a version that ``invalidate`` bumps; ETags are derived from it, so a
+    conditional request is answered without looking at the cached body or the database.
+
+    Versions are ticks of one counter and only the ``max_users`` most recently invalidated
+    users keep theirs. Forgotten users share ``_floor``, the highest tick ever evicted, so an
+    ETag handed out before an eviction can never come back for changed data.
+    """
+
+    def __init__(self, *, max_users: int, ttl: float) -> None:
+        self._epoch = secrets.token_hex(4)
+        self._versions: OrderedDict[int, int] = OrderedDict()
+        self._max_versions = max_users
+        self._tick = 0
+        self._floor = 0
+        self.stats: TTLCache[int, PlayerStatsOut] = TTLCache(max_entries=max_users, ttl=ttl)
+        self.history: TTLCache[tuple[int, int], HistoryPage] = TTLCache(max_entries=max_users, ttl=ttl)
+        self._history_limits: dict[int, set[int]] = {}
+
+    def etag(self, kind: str, user_id: int) -> str:
+        return f'"{kind}-{self._epoch}-{user_id}-{self._versions.get(user_id, self._floor)}"'
+
+    def invalidated(self, user_id: int) -> bool:
+        """Whether the user's cache was recently invalidated, i.e. a replica may still lag behind."""
+        return user_id in self._versions
+
+    def get_history(self, user_id: int, limit: int) -> HistoryPage | None:
+        return self.history.get((user_id, limit))
+
+    def set_history(self, user_id: int, limit: int, page: HistoryPage) -> None:
+        self._history_limits.setdefault(user_id, set()).add(limit)
+        self.history.set((user_id, limit), page)
+
+    def invalidate(self, user_ids: Iterable[int]) -> None:
+        for user_id in user_ids:
+            self._tick += 1
+            self._versions[user_id] = self._tick
+            self._versions.move_to_end(user_id)
+            while len(self._versions) > self._max_versions:
+                _, version = self._versions.popitem(last=False)
+                self._floor = max(self._floor, version)
+            self.stats.discard(user_id)
+            for limit in self._history_limits.pop(user_id, ()):
+                self.history.discard((user_id, limit))
+
+    def snapshot(self) -> dict[str, dict[str, int]]:
+        return {
+            "stats": {**self.stats.metrics.snapshot(), "size": len(self.stats)},
+            "history": {**self.history.metrics.snapshot(), "size": len(self.history)},
+        }
+
+
+stats_cache = StatsCache(max_users=settings.stats_cache_max_users, ttl=settings.stats_cache_ttl_seconds)
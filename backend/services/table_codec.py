@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import struct
+from dataclasses import dataclass, field
+
+from backend.poker_engine.table import Table
+
+# Little-endian throughout; money is int64.
+# Table: id, buy-in, small blind, big blind, seats, spectators, max players, dealer's user id
+# (-1 for none), private, hand in progress.
+_TABLE = struct.Struct("<qqqqHHBq??")
+# Seat: user id, stack. While a hand runs this is the stack from before the blinds: a restore
+# always rolls the hand back, so cards, bets and the deck are never written.
+_SEAT = struct.Struct("<qq")
+_SPECTATOR = struct.Struct("<q")
+
+
+@dataclass(slots=True)
+class SeatImage:
+    user_id: int
+    stack: int
+
+
+@dataclass(slots=True)
+class TableImage:
+    table_id: int
+    buy_in: int
+    small_blind: int
+    big_blind: int
+    max_players: int
+    dealer_id: int | None
+    private: bool
+    hand_active: bool
+    seats: list[SeatImage] = field(default_factory=list)
+    spectators: list[int] = field(default_factory=list)
+
+
+def _dealer_id(table: Table) -> int | None:
+    """The button's user id; if they left mid-hand, the next player still seated."""
+    players = table.players
+    for step in range(len(players)):
+        player = players[(table.dealer + step) % len(players)]
+        if not player.leaving:
+            return player.user_id
+    return None
+
+
+def encode_table(table: Table, *, buy_in: int, private: bool) -> bytes:
+    """Pack ``table`` into the compact binary table image."""
+    game = table.game_state
+    hand_active = game is not None and game.hand_active
+    # Players who left mid-hand were already cashed out; they are not part of the image.
+    seats = table.public_players()
+    spectators = table.public_spectators()
+    start_stacks = game.start_stacks if game is not None and hand_active else {}
+    dealer_id = _dealer_id(table)
+    out = bytearray(
+        _TABLE.pack(
+            table.table_id,
+            buy_in,
+            table.small_blind,
+            table.big_blind,
+            len(seats),
+            len(spectators),
+            table.max_players,
+            -1 if dealer_id is None else dealer_id,
+            private,
+            hand_active,
+        )
+    )
+    for player in seats:
+        out += _SEAT.pack(player.user_id, start_stacks.get(player.user_id, player.stack))
+    for spectator in spectators:
+        out += _SPECTATOR.pack(spectator.user_id)
+    return bytes(out)
+
+
+def decode_table(view: memoryview, offset: int = 0) -> tuple[TableImage, int]:
+    """Unpack one table image starting at ``offset``; return it and the offset just past it."""
+    (table_id, buy_in, small_blind, big_blind, n_seats, n_spectators, max_players, dealer_id, private, hand_active) = (
+        _TABLE.unpack_from(view, offset)
+    )
+    offset += _TABLE.size
+    image = TableImage(
+        table_id=table_id,
+        buy_in=buy_in,
+        small_blind=small_blind,
+        big_blind=big_blind,
+        max_players=max_players,
+        dealer_id=None if dealer_id < 0 else dealer_id,
+        private=private,
+        hand_active=hand_active,
+    )
+    for _ in range(n_seats):
+        user_id, stack = _SEAT.unpack_from(view, offset)
+        offset += _SEAT.size
+        image.seats.append(SeatImage(user_id=user_id, stack=stack))
+    for _ in range(n_spectators):
+        (user_id,) = _SPECTATOR.unpack_from(view, offset)
+        offset += _SPECTATOR.size
+        image.spectators.append(user_id)
+    return image, offset
+
+
+def rebuild_table(image: TableImage) -> Table:
+    """Build a ``Table`` from ``image`` with no hand running.
+
+    A hand that was in progress is rolled back: the image already holds every seat's stack
+    from before the blinds, so the chips in the pot go back to whoever put them in.
+    """
+    table = Table(
+        max_players=image.max_players,
+        small_blind=image.small_blind,
+        big_blind=image.big_blind,
+        table_id=image.table_id,
+    )
+    for seat in image.seats:
+        table.seat_player(seat.user_id, seat.stack)
+    for user_id in image.spectators:
+        table.seat_player(user_id, 0, is_spectator=True)
+    seated = [player.user_id for player in table.players]
+    table.dealer = seated.index(image.dealer_id) if image.dealer_id in seated else 0
+    return table
@@ -3,9 +3,10 @@ from __future__ import annotations
 from typing import Awaitable, Callable
 
 from backend.rest.schemas.common import OkResponse
-from backend.rest.schemas.table import TableCreateRequest, TableDetail, TableSeat, TableSummary
-from backend.models.user import User
-from backend.services.table_store import TableRecord, TableStore
+from backend.rest.schemas.table import QuickSeatRequest, TableCreateRequest, TableDetail, TableSeat, TableSummary
+from backend.services.chip_ledger import ChipLedger, chip_ledger
+from backend.services.table_store import LobbyQuery, LobbySnapshot, TableRecord, TableStore, summarize
+from backend.services.user_directory import UserDirectory, user_directory
 from backend.poker_engine.player_state import PlayerStatus
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -22,6 +23,13 @@ class InsufficientBalanceError(Exception):
     pass
 
 
+class TableFullError(Exception):
+    pass
+
+
+QUICK_SEAT_DEFAULT_MAX_PLAYERS = 6
+
+
 class TableService:
     def __init__(
         self,
@@ -29,16 +37,32 @@ class TableService:
         *,
         notify_table_changed: Callable[[int], Awaitable[None]],
         maybe_start_game: Callable[[int], Awaitable[bool]],
+        ledger: ChipLedger = chip_ledger,
+        directory: UserDirectory = user_directory,
     ) -> None:
         self._store = store
+        self._ledger = ledger
+        self._directory = directory
         self._notify_table_changed = notify_table_changed
         self._maybe_start_game = maybe_start_game
 
     def list_tables(self, *, include_private: bool = False) -> list[TableSummary]:
-        items = self._store.list_items()
-        if not include_private:
-            items = [(table_id, record) for table_id, record in items if not record.private]
-        return [self._serialize_summary(table_id, record) for table_id, record in items]
+        summaries, _ = self.query_lobby(LobbyQuery(include_private=include_private))
+        return summaries
+
+    def query_lobby(
+        self,
+        query: LobbyQuery,
+        *,
+        cursor: int | None = None,
+        limit: int | None = None,
+    ) -> tuple[list[TableSummary], int | None]:
+        table_ids, next_cursor = self._store.query(query, after=cursor, limit=limit)
+        summaries = [summary for table_id in table_ids if (summary := self._store.summary(table_id)) is not None]
+        return summaries, next_cursor
+
+    def lobby_snapshot(self) -> LobbySnapshot:
+        return self._store.lobby_snapshot()
 
     def create_table(self, payload: TableCreateRequest) -> TableSummary:
         table_id, record = self._store.create(
@@ -46,7 +70,7 @@ class TableService:
             buy_in=payload.buy_in,
             private=payload.private,
         )
-        return self._serialize_summary(table_id, record)
+        return summarize(table_id, record)
 
     def get_table_info(self, table_id: int) -> TableDetail:
         record = self._require(table_id)
@@ -54,28 +78,63 @@ class TableService:
 
     async def join_table(self, table_id: int, *, user_id: int, db: AsyncSession) -> OkResponse:
         record = self._require(table_id)
-        user = await self._require_user(db, user_id)
+
+        already_seated = record.table.get_player(user_id) is not None
+        if record.table.open_seats() <= 0 and not already_seated:
+            raise TableFullError("The table is full")
 
         cashout = record.table.leave(user_id)
         if cashout:
-            user.balance = int(user.balance) + cashout
-
-        if int(user.balance) < int(record.buy_in):
+            await self._ledger.credit(db, user_id, cashout, table_id=table_id)
+        balance = await self._ledger.debit(db, user_id, int(record.buy_in), table_id=table_id)
+        if balance is None:
+            if await self._ledger.available(db, user_id) is None:
+                raise UserNotFoundError("User not found")
             raise InsufficientBalanceError("Not enough balance for buy-in")
 
         waiting = bool(record.table.game_state is not None and getattr(record.table.game_state, "hand_active", False))
-        record.table.seat_player(user_id, record.buy_in, initial_status=PlayerStatus.WAITING if waiting else None)
-        user.balance = int(user.balance) - int(record.buy_in)
         try:
-            await db.commit()
-        except Exception:
-            await db.rollback()
-            record.table.leave(user_id)
-            raise
+            record.table.seat_player(user_id, record.buy_in, initial_status=PlayerStatus.WAITING if waiting else None)
+        except RuntimeError as exc:
+            await self._ledger.credit(db, user_id, int(record.buy_in), table_id=table_id)
+            raise TableFullError("The table is full") from exc
+        # Table state broadcasts read usernames from the directory only; load this one now.
+        await self._directory.resolve(db, [user_id])
         await self._notify_table_changed(table_id)
         await self._maybe_start_game(table_id)
         return OkResponse()
 
+    async def quick_seat(self, payload: QuickSeatRequest, *, user_id: int, db: AsyncSession) -> TableSummary:
+        """Seat the user at the best matching public table, creating one when none has room."""
+        tried: set[int] = set()
+        while True:
+            table_id = self._store.best_open_table(
+                payload.buy_in,
+                payload.max_players,
+                user_id=user_id,
+                skip=tried,
+            )
+            if table_id is None:
+                break
+            tried.add(table_id)
+            try:
+                await self.join_table(table_id, user_id=user_id, db=db)
+            except (TableFullError, TableNotFoundError):
+                continue
+            return self._summary(table_id)
+
+        table_id, _record = self._store.create(
+            max_players=payload.max_players or QUICK_SEAT_DEFAULT_MAX_PLAYERS,
+            buy_in=payload.buy_in,
+            private=False,
+        )
+        try:
+            await self.join_table(table_id, user_id=user_id, db=db)
+        except Exception:
+            self._store.delete_if_empty(table_id)
+            raise
+        return self._summary(table_id)
+
     async def leave_table(self, table_id: int, *, user_id: int, db: AsyncSession) -> OkResponse:
         record = self._require(table_id)
         await self._cashout_user(db, record, user_id)
@@ -87,51 +146,33 @@ class TableService:
         record = self._require(table_id)
         await self._cashout_user(db, record, user_id)
         record.table.seat_player(user_id, record.buy_in, is_spectator=True)
+        await self._directory.resolve(db, [user_id])
         await self._notify_table_changed(table_id)
         return OkResponse()
 
+    def _summary(self, table_id: int) -> TableSummary:
+        record = self._require(table_id)
+        return self._store.summary(table_id) or summarize(table_id, record)
+
     def _require(self, table_id: int) -> TableRecord:
         record = self._store.get(table_id)
         if record is None:
             raise TableNotFoundError(f"Table not found: {table_id}")
         return record
 
-    @staticmethod
-    async def _require_user(db: AsyncSession, user_id: int) -> User:
-        user = await db.get(User, user_id)
-        if user is None:
-            raise UserNotFoundError("User not found")
-        return user
-
     async def _cashout_user(self, db: AsyncSession, record: TableRecord, user_id: int) -> int:
-        user = await self._require_user(db, user_id)
         cashout = record.table.leave(user_id)
-        if not cashout:
-            return 0
-        user.balance = int(user.balance) + cashout
-        await db.commit()
+        if await self._ledger.credit(db, user_id, cashout, table_id=record.table.table_id) is None:
+            raise UserNotFoundError("User not found")
         return cashout
 
-    @staticmethod
-    def _serialize_summary(table_id: int, record: TableRecord) -> TableSummary:
-        players = record.table.public_players()
-        spectators = record.table.public_spectators()
-        return TableSummary(
-            id=str(table_id),
-            max_players=record.table.max_players,
-            buy_in=record.buy_in,
-            private=record.private,
-            players_count=len(players),
-            spectators_count=len(spectators),
-        )
-
     def _serialize_detail(self, table_id: int, record: TableRecord) -> TableDetail:
-        info = self._serialize_summary(table_id, record)
+        info = summarize(table_id, record)
         seats: list[TableSeat] = [
             TableSeat(position=player.position, user_id=player.user_id, stack=player.stack, is_spectator=False)
             for player in record.table.public_players()
         ] + [
-            TableSeat(position=-1, user_id=spectator.user_id, stack=spectator.stack, is_spectator=True)
+            TableSeat(position=-1, user_id=spectator.user_id, stack=-1, is_spectator=True)
             for spectator in record.table.public_spectators()
         ]
         return TableDetail(**info.model_dump(), seats=seats)
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import mmap
+import os
+import struct
+import time
+import zlib
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models.chip_ledger import BALANCE_REASONS, ChipLedgerEntry
+from backend.rest.core.config import settings
+from backend.services.chip_ledger import ChipLedger, chip_ledger
+from backend.services.table_codec import TableImage, decode_table, rebuild_table
+from backend.services.table_store import TableRecord, TableStore
+
+logger = logging.getLogger("hsepoker.snapshot")
+
+MAGIC = b"HSTS"
+FORMAT_VERSION = 2
+# File: magic, format version, crc32 of the body, written at (unix time), table count;
+# the body is that many ``table_codec`` table images back to back.
+_FILE_HEADER = struct.Struct("<4sHIdI")
+
+
+class SnapshotError(Exception):
+    pass
+
+
+@dataclass(slots=True)
+class SnapshotMetrics:
+    writes: int = 0
+    write_errors: int = 0
+    last_tables: int = 0
+    last_bytes: int = 0
+    last_write_ms: float = 0.0
+    restored_tables: int = 0
+    rolled_back_hands: int = 0
+    restore_ms: float = 0.0
+    reconciled_seats: int = 0
+    refunded_buy_ins: int = 0
+
+    def snapshot(self) -> dict[str, float | int]:
+        return {
+            "writes": self.writes,
+            "write_errors": self.write_errors,
+            "last_tables": self.last_tables,
+            "last_bytes": self.last_bytes,
+            "last_write_ms": round(self.last_write_ms, 3),
+            "restored_tables": self.restored_tables,
+            "rolled_back_hands": self.rolled_back_hands,
+            "restore_ms": round(self.restore_ms, 3),
+            "reconciled_seats": self.reconciled_seats,
+            "refunded_buy_ins": self.refunded_buy_ins,
+        }
+
+
+def encode_snapshot(tables: Iterable[bytes], *, written_at: float | None = None) -> bytes:
+    """Frame already encoded table images into one snapshot file."""
+    body = bytearray()
+    count = 0
+    for blob in tables:
+        body += blob
+        count += 1
+    header = _FILE_HEADER.pack(
+        MAGIC, FORMAT_VERSION, zlib.crc32(body), time.time() if written_at is None else written_at, count
+    )
+    return header + bytes(body)
+
+
+def decode_snapshot(buffer: bytes | mmap.mmap) -> tuple[float, list[TableImage]]:
+    """Return when the snapshot was written (unix time) and its table images."""
+    if len(buffer) < _FILE_HEADER.size:
+        raise SnapshotError("snapshot is truncated")
+    magic, version, crc, written_at, count = _FILE_HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise SnapshotError(f"unsupported snapshot format {magic!r} v{version}")
+    view = memoryview(buffer)
+    try:
+        if zlib.crc32(view[_FILE_HEADER.size:]) != crc:
+            raise SnapshotError("snapshot checksum mismatch")
+        offset = _FILE_HEADER.size
+        images: list[TableImage] = []
+        for _ in range(count):
+            image, offset = decode_table(view, offset)
+            images.append(image)
+        return written_at, images
+    except (struct.error, IndexError, ValueError) as exc:
+        raise SnapshotError(f"snapshot is malformed: {exc}") from exc
+    finally:
+        view.release()
+
+
+class TableSnapshotter:
+    """Periodically writes every live table to one binary snapshot file and restores it on boot.
+
+    The file is replaced atomically, so there is always one complete snapshot. Restoring maps
+    it into memory and decodes it in place. Anything that happened after the last write is
+    lost, so the interval should stay short; a final snapshot is written on shutdown.
+    Chips that moved in the meantime are settled against the ledger by ``reconcile``.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.metrics = SnapshotMetrics()
+        self.restored_written_at: float | None = None
+
+    def write(self, store: TableStore) -> int:
+        started_at = time.perf_counter()
+        data = encode_snapshot(store.encoded_tables())
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "wb") as fh:
+            fh.write(data)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, self.path)
+        _, _, _, _, count = _FILE_HEADER.unpack_from(data, 0)
+        self.metrics.writes += 1
+        self.metrics.last_tables = count
+        self.metrics.last_bytes = len(data)
+        self.metrics.last_write_ms = (time.perf_counter() - started_at) * 1000
+        return count
+
+    def load(self) -> tuple[float | None, list[TableImage]]:
+        try:
+            fh = open(self.path, "rb")
+        except FileNotFoundError:
+            return None, []
+        with fh:
+            if os.fstat(fh.fileno()).st_size == 0:
+                return None, []
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return decode_snapshot(mapped)
+
+    def restore(self, store: TableStore) -> list[TableRecord]:
+        """Rebuild the tables of the latest snapshot into ``store``; ids already present are skipped."""
+        started_at = time.perf_counter()
+        try:
+            written_at, images = self.load()
+        except SnapshotError:
+            logger.exception("table snapshot %s is unusable; starting with no tables", self.path)
+            return []
+        self.restored_written_at = written_at
+        restored: list[TableRecord] = []
+        for image in images:
+            if image.table_id in store:
+                continue
+            record = TableRecord(table=rebuild_table(image), buy_in=image.buy_in, private=image.private)
+            store.restore(record)
+            restored.append(record)
+            if image.hand_active:
+                self.metrics.rolled_back_hands += 1
+        self.metrics.restored_tables += len(restored)
+        self.metrics.restore_ms = (time.perf_counter() - started_at) * 1000
+        if restored:
+            logger.info("restored %d tables from %s", len(restored), self.path)
+        return restored
+
+    async def reconcile(
+        self,
+        db: AsyncSession,
+        store: TableStore,
+        records: list[TableRecord],
+        *,
+        ledger: ChipLedger = chip_ledger,
+    ) -> list[TableRecord]:
+        """Settle buy-ins and cashouts the ledger recorded after the snapshot was written.
+
+        A player with a newer cashout already has their chips back, so their restored seat is
+        dropped. A player whose latest newer entry is a buy-in paid for a seat the snapshot
+        doesn't have, so the buy-in is refunded. Returns the records that still exist.
+        """
+        if not records or self.restored_written_at is None:
+            return records
+        written_at = datetime.fromtimestamp(self.restored_written_at, timezone.utc)
+        rows = await db.execute(
+            select(ChipLedgerEntry.table_id, ChipLedgerEntry.user_id, ChipLedgerEntry.amount, ChipLedgerEntry.reason)
+            .where(
+                ChipLedgerEntry.table_id.in_([record.table.table_id for record in records]),
+                ChipLedgerEntry.reason.in_(BALANCE_REASONS),
+                ChipLedgerEntry.created_at > written_at,
+            )
+            .order_by(ChipLedgerEntry.id)
+        )
+        latest: dict[tuple[int, int], tuple[int, str]] = {}
+        for table_id, user_id, amount, reason in rows.all():
+            if table_id is not None:
+                latest[(int(table_id), int(user_id))] = (int(amount), reason)
+
+        refunds: dict[int, dict[int, int]] = {}
+        for (table_id, user_id), (amount, reason) in latest.items():
+            record = store.get(table_id)
+            if record is not None and record.table.is_seated(user_id):
+                # The seat was cashed out (and possibly re-bought) after the snapshot.
+                record.table.leave(user_id)
+                self.metrics.reconciled_seats += 1
+            if reason == "buy_in":
+                refunds.setdefault(table_id, {})[user_id] = -amount
+        for table_id, credits in refunds.items():
+            await ledger.credit_many(db, credits, table_id=table_id)
+            self.metrics.refunded_buy_ins += len(credits)
+
+        alive: list[TableRecord] = []
+        for record in records:
+            if not store.delete_if_empty(record.table.table_id):
+                alive.append(record)
+        return alive
+
+    async def run(self, store: TableStore, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.write(store)
+            except Exception:
+                self.metrics.write_errors += 1
+                logger.exception("table snapshot failed")
+
+
+table_snapshotter: TableSnapshotter | None = (
+    TableSnapshotter(settings.table_snapshot_path) if settings.table_snapshot_enabled else None
+)
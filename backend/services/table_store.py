@@ -1,10 +1,23 @@
 from __future__ import annotations
 
+import asyncio
+import heapq
+import logging
+import secrets
+import time
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Collection, Iterator
 from dataclasses import dataclass
-from random import randint
-from typing import Callable
+from itertools import count
+from typing import Callable, Literal
+
+from pydantic import TypeAdapter
 
 from backend.poker_engine.table import Table
+from backend.rest.schemas.table import TableSummary
+from backend.services.table_codec import decode_table, encode_table, rebuild_table
+
+logger = logging.getLogger("hsepoker.tables")
 
 
 @dataclass(slots=True)
@@ -14,38 +27,450 @@ class TableRecord:
     private: bool
 
 
+@dataclass(frozen=True, slots=True)
+class HibernatedTable:
+    """An idle table packed with ``table_codec``; the ids let lookups answer without waking it."""
+
+    blob: bytes
+    buy_in: int
+    private: bool
+    player_ids: frozenset[int]
+    spectator_ids: frozenset[int]
+
+
+@dataclass(slots=True)
+class HibernationMetrics:
+    hibernations: int = 0
+    rehydrations: int = 0
+    total_rehydrate_seconds: float = 0.0
+    max_rehydrate_seconds: float = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.rehydrations += 1
+        self.total_rehydrate_seconds += seconds
+        self.max_rehydrate_seconds = max(self.max_rehydrate_seconds, seconds)
+
+
+@dataclass(frozen=True, slots=True)
+class LobbyEvent:
+    kind: Literal["table_added", "table_updated", "table_removed"]
+    table_id: int
+    version: int
+    summary: TableSummary | None
+
+
+@dataclass(frozen=True, slots=True)
+class LobbySnapshot:
+    version: int
+    etag: str
+    body: bytes
+
+
+@dataclass(frozen=True, slots=True)
+class LobbyQuery:
+    include_private: bool = False
+    min_buy_in: int | None = None
+    max_buy_in: int | None = None
+    min_open_seats: int | None = None
+    not_full: bool = False
+
+
+_SUMMARIES_ADAPTER = TypeAdapter(list[TableSummary])
+
+# (is_empty, fill_ratio, table_id, stamp): partially filled tables first, least filled first.
+_SeatEntry = tuple[int, float, int, int]
+
+
+def summarize(table_id: int, record: TableRecord) -> TableSummary:
+    return TableSummary(
+        id=str(table_id),
+        max_players=record.table.max_players,
+        buy_in=record.buy_in,
+        private=record.private,
+        players_count=len(record.table.public_players()),
+        spectators_count=len(record.table.public_spectators()),
+    )
+
+
 class TableStore:
-    def __init__(self, *, id_factory: Callable[[], int] | None = None) -> None:
+    """In-memory table registry with secondary indexes for lobby queries.
+
+    Indexes (privacy, buy-in, open seats) are kept in sync through ``Table.on_seats_changed``,
+    so a lobby query only touches the tables that match its filters.
+
+    Every change to a public table bumps ``lobby_version`` and is pushed to lobby listeners
+    as a ``LobbyEvent``; the encoded public lobby is cached per version.
+
+    Public tables with a free seat are also kept in per-(buy-in, max players) heaps for
+    quick-seat matchmaking. Entries are invalidated lazily through a per-table stamp.
+
+    Tables nobody has looked up for a while, and that are not in the middle of a hand, can be
+    hibernated: packed into a compact byte blob and their object graph dropped. The lobby
+    indexes and summaries stay in place; ``get`` rehydrates the table transparently.
+    """
+
+    def __init__(
+        self,
+        *,
+        id_factory: Callable[[], int] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
         self._records: dict[int, TableRecord] = {}
-        self._id_factory = id_factory or (lambda: randint(0, 100_000))
+        self._hibernated: dict[int, HibernatedTable] = {}
+        self._hibernated_bytes = 0
+        self._touched: dict[int, float] = {}
+        self._clock = clock
+        self.hibernation = HibernationMetrics()
+        self._id_factory = id_factory or count(1).__next__
+        self._by_privacy: dict[bool, set[int]] = {False: set(), True: set()}
+        self._by_buy_in: dict[int, set[int]] = {}
+        self._buy_in_keys: list[int] = []
+        self._by_open_seats: dict[int, set[int]] = {}
+        self._open_seats: dict[int, int] = {}
+        self._summaries: dict[int, TableSummary] = {}
+        self._listeners: list[Callable[[LobbyEvent], None]] = []
+        self._epoch = secrets.token_hex(4)
+        self._snapshot: LobbySnapshot | None = None
+        self.lobby_version = 0
+        self._seat_heaps: dict[tuple[int, int], list[_SeatEntry]] = {}
+        self._seat_stamps: dict[int, int] = {}
+        self._next_stamp = count(1).__next__
 
-    def list_items(self) -> list[tuple[int, TableRecord]]:
-        return list(self._records.items())
+    def __contains__(self, table_id: object) -> bool:
+        return table_id in self._records or table_id in self._hibernated
 
     def get(self, table_id: int) -> TableRecord | None:
-        return self._records.get(table_id)
+        record = self._records.get(table_id)
+        if record is None:
+            if table_id not in self._hibernated:
+                return None
+            record = self._rehydrate(table_id)
+        self._touched[table_id] = self._clock()
+        return record
+
+    def encoded_tables(self) -> Iterator[bytes]:
+        """Yield the ``table_codec`` image of every table that seats someone, without waking any."""
+        for record in self._records.values():
+            if not record.table.is_effectively_empty():
+                yield encode_table(record.table, buy_in=record.buy_in, private=record.private)
+        for hibernated in self._hibernated.values():
+            if hibernated.player_ids or hibernated.spectator_ids:
+                yield hibernated.blob
+
+    def hibernate_idle(self, idle_seconds: float) -> int:
+        """Hibernate every table untouched for ``idle_seconds`` with no hand running."""
+        deadline = self._clock() - idle_seconds
+        idle = [
+            table_id
+            for table_id, record in self._records.items()
+            if self._touched.get(table_id, 0.0) <= deadline and not _hand_running(record.table)
+        ]
+        for table_id in idle:
+            self._hibernate(table_id)
+        return len(idle)
+
+    async def run_hibernator(self, idle_seconds: float, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.hibernate_idle(idle_seconds)
+            except Exception:
+                logger.exception("table hibernation failed")
+
+    def hibernation_snapshot(self) -> dict[str, float | int]:
+        metrics = self.hibernation
+        rehydrations = metrics.rehydrations or 1
+        return {
+            "resident": len(self._records),
+            "hibernated": len(self._hibernated),
+            "hibernated_bytes": self._hibernated_bytes,
+            "hibernations": metrics.hibernations,
+            "rehydrations": metrics.rehydrations,
+            "avg_rehydrate_ms": round(metrics.total_rehydrate_seconds / rehydrations * 1000, 3),
+            "max_rehydrate_ms": round(metrics.max_rehydrate_seconds * 1000, 3),
+        }
+
+    def _hibernate(self, table_id: int) -> None:
+        record = self._records.pop(table_id)
+        table = record.table
+        table.on_seats_changed = None
+        blob = encode_table(table, buy_in=record.buy_in, private=record.private)
+        self._hibernated[table_id] = HibernatedTable(
+            blob=blob,
+            buy_in=record.buy_in,
+            private=record.private,
+            player_ids=frozenset(p.user_id for p in table.players),
+            spectator_ids=frozenset(table.spectators),
+        )
+        self._hibernated_bytes += len(blob)
+        self.hibernation.hibernations += 1
+
+    def _rehydrate(self, table_id: int) -> TableRecord:
+        started_at = time.perf_counter()
+        hibernated = self._hibernated.pop(table_id)
+        self._hibernated_bytes -= len(hibernated.blob)
+        image, _ = decode_table(memoryview(hibernated.blob))
+        record = TableRecord(table=rebuild_table(image), buy_in=hibernated.buy_in, private=hibernated.private)
+        record.table.on_seats_changed = self._on_seats_changed
+        self._records[table_id] = record
+        self.hibernation.observe(time.perf_counter() - started_at)
+        return record
+
+    def summary(self, table_id: int) -> TableSummary | None:
+        return self._summaries.get(table_id)
+
+    def add_listener(self, listener: Callable[[LobbyEvent], None]) -> None:
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[LobbyEvent], None]) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def lobby_snapshot(self) -> LobbySnapshot:
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.version != self.lobby_version:
+            public = sorted(self._by_privacy[False])
+            body = _SUMMARIES_ADAPTER.dump_json([self._summaries[table_id] for table_id in public])
+            etag = f'"{self._epoch}-{self.lobby_version}"'
+            snapshot = self._snapshot = LobbySnapshot(version=self.lobby_version, etag=etag, body=body)
+        return snapshot
 
     def delete(self, table_id: int) -> bool:
-        return self._records.pop(table_id, None) is not None
+        record = self._records.pop(table_id, None)
+        if record is not None:
+            record.table.on_seats_changed = None
+            buy_in, private = record.buy_in, record.private
+        else:
+            hibernated = self._hibernated.pop(table_id, None)
+            if hibernated is None:
+                return False
+            self._hibernated_bytes -= len(hibernated.blob)
+            buy_in, private = hibernated.buy_in, hibernated.private
+        self._unindex(table_id, buy_in, private)
+        summary = self._summaries.pop(table_id, None)
+        if not private:
+            self._publish("table_removed", table_id, summary)
+        return True
 
     def delete_if_empty(self, table_id: int) -> bool:
         record = self._records.get(table_id)
-        if record is None:
-            return False
-        if not record.table.is_effectively_empty():
+        if record is not None:
+            empty = record.table.is_effectively_empty()
+        else:
+            hibernated = self._hibernated.get(table_id)
+            if hibernated is None:
+                return False
+            empty = not hibernated.player_ids and not hibernated.spectator_ids
+        if not empty:
             return False
-        del self._records[table_id]
-        return True
+        return self.delete(table_id)
 
     def create(self, *, max_players: int, buy_in: int, private: bool) -> tuple[int, TableRecord]:
         table_id = self._id_factory()
-        while table_id in self._records:
+        while table_id in self:
             table_id = self._id_factory()
 
         table = Table(table_id=table_id, max_players=max_players)
         record = TableRecord(table=table, buy_in=buy_in, private=private)
-        self._records[table_id] = record
+        self._add(table_id, record)
         return table_id, record
 
+    def restore(self, record: TableRecord) -> None:
+        """Register a table rebuilt elsewhere (a snapshot) under its own ``table_id``."""
+        table_id = record.table.table_id
+        if table_id in self:
+            raise ValueError(f"table {table_id} already exists")
+        self._add(table_id, record)
+
+    def _add(self, table_id: int, record: TableRecord) -> None:
+        self._records[table_id] = record
+        self._touched[table_id] = self._clock()
+        self._index(table_id, record)
+        self._summaries[table_id] = summary = summarize(table_id, record)
+        record.table.on_seats_changed = self._on_seats_changed
+        if not record.private:
+            self._publish("table_added", table_id, summary)
+
+    def best_open_table(
+        self,
+        buy_in: int,
+        max_players: int | None = None,
+        *,
+        user_id: int | None = None,
+        skip: Collection[int] = (),
+    ) -> int | None:
+        """Pick the public table with a free seat that quick-seat should fill next.
+
+        Tables already seating ``user_id`` or listed in ``skip`` are passed over.
+        """
+        sizes = [max_players] if max_players is not None else range(2, 10)
+        best: tuple[_SeatEntry, tuple[int, int]] | None = None
+        for size in sizes:
+            key = (buy_in, size)
+            entry = self._peek_seat_heap(key, user_id, skip)
+            if entry is not None and (best is None or entry < best[0]):
+                best = (entry, key)
+        return None if best is None else best[0][2]
+
+    def _peek_seat_heap(self, key: tuple[int, int], user_id: int | None, skip: Collection[int]) -> _SeatEntry | None:
+        heap = self._seat_heaps.get(key)
+        if not heap:
+            return None
+        passed_over: list[_SeatEntry] = []
+        found: _SeatEntry | None = None
+        while heap:
+            entry = heap[0]
+            table_id = entry[2]
+            if self._seat_stamps.get(table_id) != entry[3]:
+                heapq.heappop(heap)
+                continue
+            if table_id in skip or (user_id is not None and self._is_seated(table_id, user_id)):
+                passed_over.append(heapq.heappop(heap))
+                continue
+            found = entry
+            break
+        for entry in passed_over:
+            heapq.heappush(heap, entry)
+        return found
+
+    def _is_seated(self, table_id: int, user_id: int) -> bool:
+        record = self._records.get(table_id)
+        if record is None:
+            return user_id in self._hibernated[table_id].player_ids
+        return record.table.get_player(user_id) is not None
+
+    def query(
+        self,
+        query: LobbyQuery,
+        *,
+        after: int | None = None,
+        limit: int | None = None,
+    ) -> tuple[list[int], int | None]:
+        """Return ids of tables matching ``query`` ordered by id, starting after the ``after`` cursor.
+
+        The second element is the cursor for the next page, or ``None`` on the last page.
+        """
+        candidates: list[set[int]] = []
+        if not query.include_private:
+            candidates.append(self._by_privacy[False])
+        if query.min_buy_in is not None or query.max_buy_in is not None:
+            candidates.append(self._ids_in_buy_in_range(query.min_buy_in, query.max_buy_in))
+        min_open_seats = max(query.min_open_seats or 0, 1 if query.not_full else 0)
+        if min_open_seats > 0:
+            candidates.append(self._ids_with_open_seats(min_open_seats))
+
+        if candidates:
+            candidates.sort(key=len)
+            matched = candidates[0].intersection(*candidates[1:])
+        else:
+            matched = set(self._summaries)
+
+        ordered = sorted(matched)
+        if after is not None:
+            ordered = ordered[bisect_right(ordered, after) :]
+        next_cursor: int | None = None
+        if limit is not None and len(ordered) > limit:
+            ordered = ordered[:limit]
+            next_cursor = ordered[-1]
+        return ordered, next_cursor
+
+    def _ids_in_buy_in_range(self, low: int | None, high: int | None) -> set[int]:
+        start = 0 if low is None else bisect_left(self._buy_in_keys, low)
+        stop = len(self._buy_in_keys) if high is None else bisect_right(self._buy_in_keys, high)
+        result: set[int] = set()
+        for buy_in in self._buy_in_keys[start:stop]:
+            result |= self._by_buy_in[buy_in]
+        return result
+
+    def _ids_with_open_seats(self, minimum: int) -> set[int]:
+        result: set[int] = set()
+        for seats, ids in self._by_open_seats.items():
+            if seats >= minimum:
+                result |= ids
+        return result
+
+    def _on_seats_changed(self, table: Table) -> None:
+        table_id = table.table_id
+        record = self._records.get(table_id)
+        if record is None:
+            return
+        self._reindex_open_seats(table_id, table)
+        summary = summarize(table_id, record)
+        if summary == self._summaries.get(table_id):
+            return
+        self._summaries[table_id] = summary
+        if not record.private:
+            self._publish("table_updated", table_id, summary)
+
+    def _publish(
+        self,
+        kind: Literal["table_added", "table_updated", "table_removed"],
+        table_id: int,
+        summary: TableSummary | None,
+    ) -> None:
+        self.lobby_version += 1
+        event = LobbyEvent(kind=kind, table_id=table_id, version=self.lobby_version, summary=summary)
+        for listener in list(self._listeners):
+            listener(event)
+
+    def _reindex_open_seats(self, table_id: int, table: Table) -> None:
+        seats = table.open_seats()
+        previous = self._open_seats.get(table_id)
+        if previous == seats:
+            return
+        self._reindex_seat_heap(table_id, table, seats)
+        if previous is not None:
+            self._discard(self._by_open_seats, previous, table_id)
+        self._by_open_seats.setdefault(seats, set()).add(table_id)
+        self._open_seats[table_id] = seats
+
+    def _reindex_seat_heap(self, table_id: int, table: Table, open_seats: int) -> None:
+        stamp = self._seat_stamps[table_id] = self._next_stamp()
+        record = self._records.get(table_id)
+        if record is None or record.private or open_seats <= 0:
+            return
+        key = (record.buy_in, table.max_players)
+        heap = self._seat_heaps.setdefault(key, [])
+        seated = table.max_players - open_seats
+        heapq.heappush(heap, (0 if seated else 1, seated / table.max_players, table_id, stamp))
+        if len(heap) > 2 * len(self._by_buy_in.get(record.buy_in, ())) + 32:
+            heap[:] = [entry for entry in heap if self._seat_stamps.get(entry[2]) == entry[3]]
+            heapq.heapify(heap)
+
+    def _index(self, table_id: int, record: TableRecord) -> None:
+        self._by_privacy[record.private].add(table_id)
+        bucket = self._by_buy_in.get(record.buy_in)
+        if bucket is None:
+            bucket = self._by_buy_in[record.buy_in] = set()
+            insort(self._buy_in_keys, record.buy_in)
+        bucket.add(table_id)
+        self._reindex_open_seats(table_id, record.table)
+
+    def _unindex(self, table_id: int, buy_in: int, private: bool) -> None:
+        self._touched.pop(table_id, None)
+        self._by_privacy[private].discard(table_id)
+        if self._discard(self._by_buy_in, buy_in, table_id):
+            del self._buy_in_keys[bisect_left(self._buy_in_keys, buy_in)]
+        seats = self._open_seats.pop(table_id, None)
+        if seats is not None:
+            self._discard(self._by_open_seats, seats, table_id)
+        self._seat_stamps.pop(table_id, None)
+
+    @staticmethod
+    def _discard(index: dict[int, set[int]], key: int, table_id: int) -> bool:
+        """Remove ``table_id`` from ``index[key]``; return True if the bucket became empty."""
+        bucket = index.get(key)
+        if bucket is None:
+            return False
+        bucket.discard(table_id)
+        if bucket:
+            return False
+        del index[key]
+        return True
+
+
+def _hand_running(table: Table) -> bool:
+    return table.game_state is not None and table.game_state.hand_active
+
 
 table_store = TableStore()
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models.user import User
+from backend.rest.core.config import settings
+from backend.services.stats_cache import CacheMetrics
+
+
+class UserDirectory:
+    """Bounded in-process LRU of ``user_id -> username``.
+
+    Usernames never change after registration, so entries need no expiry; the bound only
+    limits memory. ``resolve`` fills misses with one ``IN`` query, ``username`` is the
+    synchronous lookup the WebSocket state builder uses and never touches the database.
+    """
+
+    def __init__(self, *, max_entries: int) -> None:
+        self._names: OrderedDict[int, str] = OrderedDict()
+        self._max_entries = max_entries
+        self.metrics = CacheMetrics()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def username(self, user_id: int) -> str | None:
+        name = self._names.get(user_id)
+        if name is not None:
+            self._names.move_to_end(user_id)
+        return name
+
+    def remember(self, user_id: int, username: str) -> None:
+        self._names[user_id] = username
+        self._names.move_to_end(user_id)
+        while len(self._names) > self._max_entries:
+            self._names.popitem(last=False)
+            self.metrics.evictions += 1
+
+    async def resolve(self, db: AsyncSession, user_ids: Iterable[int]) -> dict[int, str]:
+        """Return usernames for the known ids among ``user_ids``; unknown ids are left out."""
+        found: dict[int, str] = {}
+        missing: list[int] = []
+        for user_id in dict.fromkeys(user_ids):
+            name = self.username(user_id)
+            if name is None:
+                missing.append(user_id)
+            else:
+                found[user_id] = name
+        self.metrics.hits += len(found)
+        self.metrics.misses += len(missing)
+        if missing:
+            rows = await db.execute(select(User.id, User.username).where(User.id.in_(missing)))
+            for user_id, name in rows.all():
+                self.remember(int(user_id), str(name))
+                found[int(user_id)] = str(name)
+        return found
+
+    def snapshot(self) -> dict[str, int]:
+        return {**self.metrics.snapshot(), "size": len(self)}
+
+
+user_directory = UserDirectory(max_entries=settings.user_directory_max_entries)
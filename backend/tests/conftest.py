@@ -0,0 +1,33 @@
+"""Keep test runs off the configured database workers and the repo's ``backend/var``.
+
+Settings are read when ``backend`` is first imported, so the environment is set here, before
+any test module imports the app. The app's startup then neither restores nor rewrites a table
+snapshot, starts no background workers, and spools hands into a throwaway directory. Code that
+opens its own sessions gets an empty in-memory SQLite database unless a test patches it.
+"""
+
+import os
+import shutil
+import tempfile
+from collections.abc import Iterator
+
+import pytest
+
+_VAR_DIR = tempfile.mkdtemp(prefix="hsepoker-tests-")
+
+os.environ.update(
+    {
+        "DATABASE_URL": "sqlite+aiosqlite:///:memory:",
+        "BACKGROUND_TASKS_ENABLED": "false",
+        "TABLE_SNAPSHOT_ENABLED": "false",
+        "TABLE_SNAPSHOT_PATH": os.path.join(_VAR_DIR, "tables.snap"),
+        "HAND_SPOOL_PATH": os.path.join(_VAR_DIR, "hand_spool.log"),
+        "HISTORY_ARCHIVE_DIR": os.path.join(_VAR_DIR, "archive"),
+    }
+)
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _var_dir() -> Iterator[str]:
+    yield _VAR_DIR
+    shutil.rmtree(_VAR_DIR, ignore_errors=True)
@@ -6,8 +6,12 @@ from collections.abc import AsyncGenerator, Generator
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.pool import StaticPool
 
-from backend.database.session import get_db
+from backend.auth.hashing import HashingBusyError, PasswordHasher
+from backend.auth.jwt_tokens import create_access_token
+from backend.database.session import get_db, get_primary_db
+from backend.models.chip_ledger import ChipLedgerEntry
 from backend.models.user import User
+from backend.rest.api.middleware import _is_public_path
 from backend.rest.main import app
 
 
@@ -22,7 +26,7 @@ def client() -> Generator[TestClient, None, None]:
 
     async def init_models() -> None:
         async with engine.begin() as conn:
-            await conn.run_sync(User.metadata.create_all, tables=[User.__table__])
+            await conn.run_sync(User.metadata.create_all, tables=[User.__table__, ChipLedgerEntry.__table__])
 
     asyncio.run(init_models())
 
@@ -31,6 +35,7 @@ def client() -> Generator[TestClient, None, None]:
             yield session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_primary_db] = override_get_db
 
     with TestClient(app) as test_client:
         yield test_client
@@ -58,6 +63,29 @@ def test_register_login_and_me_flow(client: TestClient) -> None:
     assert profile.json()["username"] == "alice"
 
 
+def test_me_reads_the_primary_in_one_session(client: TestClient) -> None:
+    response = client.post("/api/auth/register", json={"username": "dave", "password": "secret-pass"})
+    token = response.json()["access_token"]
+    primary = app.dependency_overrides[get_primary_db]
+    opened: list[str] = []
+
+    async def lagging_replica() -> AsyncGenerator[AsyncSession, None]:
+        opened.append("replica")
+        raise AssertionError("the replica has not seen the new user yet")
+        yield  # pragma: no cover
+
+    async def counting_primary() -> AsyncGenerator[AsyncSession, None]:
+        opened.append("primary")
+        async for session in primary():
+            yield session
+
+    app.dependency_overrides[get_db] = lagging_replica
+    app.dependency_overrides[get_primary_db] = counting_primary
+    profile = client.get("/api/auth/me", headers={"Authorization": f"Bearer {token}"})
+    assert profile.status_code == 200 and profile.json()["username"] == "dave"
+    assert opened == ["primary"]
+
+
 def test_register_duplicate_username(client: TestClient) -> None:
     payload = {"username": "duplicate", "password": "secret-pass"}
 
@@ -84,3 +112,46 @@ def test_me_requires_auth_header(client: TestClient) -> None:
         "code": "missing_auth_header",
         "message": "Missing or invalid authorization header",
     }
+
+
+def test_password_hasher_rejects_when_queue_is_full() -> None:
+    async def _run() -> None:
+        hasher = PasswordHasher(max_workers=1, max_queue=0)
+        first = asyncio.create_task(hasher.hash("secret-pass"))
+        await asyncio.sleep(0)
+        with pytest.raises(HashingBusyError):
+            await hasher.hash("other-pass")
+        password_hash = await first
+        assert await hasher.verify("secret-pass", password_hash) is True
+
+        snapshot = hasher.metrics.snapshot()
+        assert snapshot["completed"] == 2
+        assert snapshot["rejected"] == 1
+        assert hasher.pending == 0
+
+    asyncio.run(_run())
+
+
+def test_public_path_matcher() -> None:
+    assert _is_public_path("/api/auth/login")
+    assert _is_public_path("/api/health")
+    assert _is_public_path("/api/health/metrics")
+    assert not _is_public_path("/api/healthz")
+    assert not _is_public_path("/api/auth/login/extra")
+    assert not _is_public_path("/api/auth/me")
+
+
+def test_invalid_bearer_token_rejected(client: TestClient) -> None:
+    response = client.get("/api/auth/me", headers={"Authorization": "Bearer not-a-jwt"})
+    assert response.status_code == 401
+    assert response.json()["detail"]["code"] == "invalid_token"
+
+
+def test_websocket_identity_resolved_by_middleware(client: TestClient) -> None:
+    token = create_access_token(1)
+    with client.websocket_connect(f"/ws/tables/999999?token={token}") as ws:
+        assert ws.receive_json()["code"] == "table_not_found"
+    with client.websocket_connect("/ws/tables/999999", headers={"Authorization": f"Bearer {token}"}) as ws:
+        assert ws.receive_json()["code"] == "table_not_found"
+    with client.websocket_connect("/ws/tables/999999?token=garbage") as ws:
+        assert ws.receive_json()["code"] == "invalid_token"
@@ -0,0 +1,116 @@
+import asyncio
+from collections.abc import Generator
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from backend.models.chip_ledger import ChipLedgerEntry
+from backend.models.user import User
+from backend.services.balance_service import BalanceService
+from backend.services.chip_ledger import ChipLedger
+
+
+@pytest.fixture()
+def session_factory() -> Generator[async_sessionmaker[AsyncSession], None, None]:
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    async def init_models() -> None:
+        async with engine.begin() as conn:
+            await conn.run_sync(User.metadata.create_all, tables=[User.__table__, ChipLedgerEntry.__table__])
+        async with async_sessionmaker(engine)() as session:
+            session.add_all(
+                [
+                    User(id=1, username="u1", password_hash="x", balance=1000),
+                    User(id=2, username="u2", password_hash="x", balance=50),
+                    User(id=3, username="u3", password_hash="x", balance=0),
+                ]
+            )
+            await session.commit()
+
+    asyncio.run(init_models())
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    asyncio.run(engine.dispose())
+
+
+def test_batched_credits(session_factory: async_sessionmaker[AsyncSession]) -> None:
+    async def _run() -> None:
+        balances = BalanceService()
+        async with session_factory() as db:
+            updated = await balances.credit_many(db, {1: 10, 2: 20, 3: 0, 999: 5})
+            await db.commit()
+            assert updated == {1: 1010, 2: 70}
+            user3 = await db.get(User, 3)
+            assert user3 is not None and user3.balance == 0
+
+    asyncio.run(_run())
+
+
+def test_ledger_appends_and_compacts(session_factory: async_sessionmaker[AsyncSession]) -> None:
+    async def _run() -> None:
+        ledger = ChipLedger(batch_size=2)
+        async with session_factory() as db:
+            assert await ledger.debit(db, 1, 300, table_id=7) == 700
+            assert await ledger.debit(db, 2, 100, table_id=7) is None
+            assert await ledger.credit(db, 1, 450, table_id=7) == 1150
+            assert await ledger.credit(db, 999, 1) is None
+            await ledger.credit_many(db, {1: 50, 2: 25}, table_id=7)
+            ledger.record_hand(db, 7, {1: 120, 2: -120})
+            await db.commit()
+
+            user1 = await db.get(User, 1)
+            assert user1 is not None and user1.balance == 1000
+
+            assert await ledger.compact(db) == 2
+            assert await ledger.compact(db) == 2
+            assert await ledger.compact(db) == 2
+            assert await ledger.compact(db) == 0
+
+            await db.refresh(user1)
+            user2 = await db.get(User, 2)
+            assert user2 is not None
+            await db.refresh(user2)
+            assert (user1.balance, user2.balance) == (1200, 75)
+
+        async with session_factory() as db:
+            fresh = ChipLedger()
+            assert await fresh.available(db, 1) == 1200
+            assert await fresh.debit(db, 1, 200) == 1000
+            assert await ChipLedger().available(db, 1) == 1000
+
+    asyncio.run(_run())
+
+
+
+def test_ledger_caches_a_bounded_number_of_totals(session_factory: async_sessionmaker[AsyncSession]) -> None:
+    async def _run() -> None:
+        ledger = ChipLedger(max_cached=2)
+        async with session_factory() as db:
+            assert await ledger.available(db, 1) == 1000
+            assert await ledger.available(db, 2) == 50
+            assert await ledger.debit(db, 1, 100) == 900
+            assert await ledger.available(db, 3) == 0
+            assert list(ledger._totals) == [1, 3]
+            # The evicted total is summed from the ledger again.
+            await ledger.credit_many(db, {2: 5})
+            assert await ledger.available(db, 2) == 55
+
+    asyncio.run(_run())
+
+
+def test_debit_checks_the_database_not_the_cache(session_factory: async_sessionmaker[AsyncSession]) -> None:
+    async def _run() -> None:
+        worker_a, worker_b = ChipLedger(), ChipLedger()
+        async with session_factory() as db:
+            assert await worker_a.available(db, 1) == 1000
+            assert await worker_b.debit(db, 1, 800) == 200
+            # worker_a still caches 1000 but must not let a second buy-in overdraw.
+            assert await worker_a.debit(db, 1, 300) is None
+            assert await worker_a.available(db, 1) == 200
+            assert await worker_a.debit(db, 999, 1) is None
+
+    asyncio.run(_run())
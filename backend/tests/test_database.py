@@ -0,0 +1,34 @@
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from backend.database import session as session_module
+
+
+def test_get_db_routes_reads_to_replica(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    async def _run() -> None:
+        primary = session_module.build_engine(f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}", "test-primary")
+        replica = session_module.build_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}", "test-replica")
+        monkeypatch.setattr(session_module, "SessionLocal", async_sessionmaker(primary, class_=AsyncSession))
+        monkeypatch.setattr(session_module, "ReadSessionLocal", async_sessionmaker(replica, class_=AsyncSession))
+        try:
+            seen: dict[str, str] = {}
+            for method in ("GET", "HEAD", "POST"):
+                async for session in session_module.get_db(SimpleNamespace(method=method)):  # type: ignore[arg-type]
+                    await session.execute(text("SELECT 1"))
+                    seen[method] = str(session.get_bind().url)
+            assert seen["GET"].endswith("replica.db") and seen["HEAD"].endswith("replica.db")
+            assert seen["POST"].endswith("primary.db")
+
+            assert isinstance(primary.pool, session_module.MeteredQueuePool)
+            assert session_module.pool_metrics["test-replica"].checkouts == 2
+            assert session_module.pool_metrics["test-primary"].snapshot()["checkouts"] == 1
+        finally:
+            await primary.dispose()
+            await replica.dispose()
+
+    asyncio.run(_run())
@@ -0,0 +1,129 @@
+import asyncio
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from backend.services import hand_archive as hand_archive_module
+from backend.services.hand_archive import HandArchive, run_archiver
+from backend.services.history_partitions import HistoryPartitions, PartitionRange, create_partition_sql, partition_for
+
+
+def _row(entry_id: int, user_id: int) -> dict[str, object]:
+    return {
+        "id": entry_id,
+        "game_id": str(entry_id),
+        "table_id": 1,
+        "user_id": user_id,
+        "hole_cards": ["As", "Kd"],
+        "bet": 100,
+        "net_stack_delta": -100,
+        "resulting_balance": 900,
+        "won_hand": False,
+        "board": [],
+        "winners": [],
+        "pot": 200,
+    }
+
+
+def test_partition_bounds_are_aligned() -> None:
+    moment = datetime(2026, 5, 17, 12, tzinfo=timezone.utc)
+    monthly = partition_for(moment)
+    assert (monthly.start, monthly.end) == (
+        datetime(2026, 5, 1, tzinfo=timezone.utc),
+        datetime(2026, 6, 1, tzinfo=timezone.utc),
+    )
+    assert monthly.suffix == "p202605"
+    assert partition_for(datetime(2026, 12, 31, tzinfo=timezone.utc)).end.year == 2027
+    assert create_partition_sql("player_games", monthly) == (
+        'CREATE TABLE IF NOT EXISTS "player_games_p202605" PARTITION OF "player_games" '
+        "FOR VALUES FROM ('2026-05-01T00:00:00+00:00') TO ('2026-06-01T00:00:00+00:00')"
+    )
+
+
+def test_expired_partitions_are_whole_months() -> None:
+    class _Catalog:
+        async def execute(self, stmt: object, params: object) -> SimpleNamespace:
+            names = ["finished_games_p202602", "finished_games_p202605", "finished_games_p202603", "finished_games_p202604"]
+            return SimpleNamespace(all=lambda: [(name,) for name in names])
+
+    partitions = HistoryPartitions(keep=2)
+    now = datetime(2026, 5, 17, tzinfo=timezone.utc)
+    expired = asyncio.run(partitions.expired(_Catalog(), now))  # type: ignore[arg-type]
+    assert expired == [
+        PartitionRange(datetime(2026, 2, 1, tzinfo=timezone.utc), datetime(2026, 3, 1, tzinfo=timezone.utc)),
+        PartitionRange(datetime(2026, 3, 1, tzinfo=timezone.utc), datetime(2026, 4, 1, tzinfo=timezone.utc)),
+    ]
+
+
+def test_archive_reads_user_blocks_across_segments(tmp_path: Path) -> None:
+    archive = HandArchive(tmp_path)
+    older = partition_for(datetime(2026, 1, 10, tzinfo=timezone.utc))
+    newer = partition_for(datetime(2026, 2, 10, tzinfo=timezone.utc))
+    archive.write_segment(newer, [(7, [_row(40, 7), _row(35, 7)]), (8, [_row(39, 8)])])
+    archive.write_segment(older, [(7, [_row(20, 7), _row(10, 7)])])
+
+    reopened = HandArchive(tmp_path)
+    assert [segment["name"] for segment in reopened.segments()] == ["history-p202602", "history-p202601"]
+    assert [row["id"] for row in reopened.history(7, before=None, limit=10)] == [40, 35, 20, 10]
+    assert [row["id"] for row in reopened.history(7, before=36, limit=2)] == [35, 20]
+    assert reopened.history(9, before=None, limit=10) == []
+
+
+class _FakeSession:
+    async def __aenter__(self) -> "_FakeSession":
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        return None
+
+    def get_bind(self) -> SimpleNamespace:
+        return SimpleNamespace(dialect=SimpleNamespace(name="postgresql"))
+
+
+class _FakePartitions:
+    def __init__(self) -> None:
+        self.detached: list[PartitionRange] = []
+
+    async def ensure(self, db: object, now: datetime) -> None:
+        return None
+
+    async def expired(self, db: object, now: datetime) -> list[PartitionRange]:
+        return [partition_for(datetime(2020, 1, 5, tzinfo=timezone.utc))]
+
+    async def detach(self, db: object, partition: PartitionRange) -> None:
+        self.detached.append(partition)
+
+
+def test_archiver_drops_partitions_only_when_archive_is_persistent(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    archived: list[PartitionRange] = []
+
+    async def fake_archive(db: object, archive: HandArchive, partition: PartitionRange) -> Path:
+        archived.append(partition)
+        return tmp_path / "segment"
+
+    monkeypatch.setattr(hand_archive_module, "archive_partition", fake_archive)
+
+    def _one_pass(persistent: bool) -> _FakePartitions:
+        partitions = _FakePartitions()
+
+        async def _run() -> None:
+            archiver = run_archiver(
+                _FakeSession,  # type: ignore[arg-type]
+                HandArchive(tmp_path),
+                partitions,  # type: ignore[arg-type]
+                3600,
+                persistent=persistent,
+            )
+            task = asyncio.create_task(archiver)
+            await asyncio.sleep(0.01)
+            task.cancel()
+
+        asyncio.run(_run())
+        return partitions
+
+    assert _one_pass(persistent=False).detached == [] and archived == []
+    assert len(_one_pass(persistent=True).detached) == 1 and len(archived) == 1
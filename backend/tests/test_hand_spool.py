@@ -0,0 +1,165 @@
+import asyncio
+from pathlib import Path
+from typing import Any
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from backend.models.player_game import PlayerGame
+from backend.models.player_stats import PlayerStats
+from backend.poker_engine.game_state import PlayerAction
+from backend.poker_engine.table import Table
+from backend.services.game_service import GameService
+from backend.services.hand_history import HandRecord, PlayerHandRecord
+from backend.services.hand_spool import HandSpool
+
+
+def _record(table_id: int = 1) -> HandRecord:
+    return HandRecord(
+        hand_uid=HandRecord.new_uid(),
+        table_id=table_id,
+        pot=40,
+        board=["Ah", "Kd", "7c"],
+        winners=[1],
+        players=[
+            PlayerHandRecord(user_id=1, hole_cards=["As", "Ad"], bet=20, net_stack_delta=20, resulting_balance=1020,
+                             won_hand=True),
+            PlayerHandRecord(user_id=2, hole_cards=["2s", "3d"], bet=20, net_stack_delta=-20, resulting_balance=980,
+                             won_hand=False),
+        ],
+        finished_at=1_700_000_000.0,
+    )
+
+
+class _FakeResult:
+    def __init__(self, values: list[Any]) -> None:
+        self._values = values
+
+    def scalars(self) -> "_FakeResult":
+        return self
+
+    def all(self) -> list[Any]:
+        return self._values
+
+
+class _FakeSession:
+    def __init__(self, stored_uids: set[str]) -> None:
+        self.stored_uids = stored_uids
+        self.added: list[object] = []
+        self.stats: dict[int, PlayerStats] = {}
+        self.commits = 0
+        self.inserted = 0
+
+    async def __aenter__(self) -> "_FakeSession":
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        return None
+
+    async def execute(self, stmt: Any) -> _FakeResult:
+        # The hand insert: emulate ON CONFLICT DO NOTHING RETURNING against stored_uids.
+        params = stmt.compile(dialect=postgresql.dialect()).params
+        rows = []
+        for i in range(len([key for key in params if key.startswith("hand_uid")])):
+            uid = params[f"hand_uid_m{i}"]
+            if uid not in self.stored_uids:
+                self.stored_uids.add(uid)
+                rows.append((len(self.stored_uids), uid, params[f"finished_at_m{i}"]))
+        self.inserted += len(rows)
+        return _FakeResult(rows)
+
+    async def rollback(self) -> None:
+        return None
+
+    def add(self, obj: object) -> None:
+        self.added.append(obj)
+        if isinstance(obj, PlayerStats):
+            self.stats[obj.user_id] = obj
+
+    async def flush(self) -> None:
+        return None
+
+    async def get(self, model: type, pk: int) -> object | None:
+        return self.stats.get(pk) if model is PlayerStats else None
+
+    async def commit(self) -> None:
+        self.commits += 1
+
+
+def test_spool_round_trip_and_offset(tmp_path: Path) -> None:
+    spool = HandSpool(tmp_path / "spool.log", fsync_batch=2)
+    first, second, third = _record(), _record(), _record()
+
+    async def _append() -> None:
+        for record in (first, second, third):
+            spool.append(record)
+        assert spool.metrics.fsyncs == 1
+        await asyncio.sleep(0.1)
+        assert spool.metrics.fsyncs == 2
+
+    asyncio.run(_append())
+
+    records, offset = spool.read(2)
+    assert records == [first, second]
+    spool.commit(offset)
+    spool.close()
+
+    reopened = HandSpool(tmp_path / "spool.log")
+    records, offset = reopened.read(10)
+    assert records == [third]
+    reopened.commit(offset)
+    assert reopened.pending_bytes == 0
+    assert (tmp_path / "spool.log").stat().st_size == 0
+    reopened.close()
+
+
+def test_spool_drops_torn_tail(tmp_path: Path) -> None:
+    path = tmp_path / "spool.log"
+    spool = HandSpool(path)
+    spool.append(_record())
+    spool.close()
+    intact = path.stat().st_size
+    with open(path, "ab") as fh:
+        fh.write(b"\x00\x00\x01\x00garbage")
+
+    reopened = HandSpool(path)
+    records, _ = reopened.read(10)
+    assert len(records) == 1
+    assert path.stat().st_size == intact
+    assert reopened.metrics.truncated_bytes == 11
+    reopened.close()
+
+
+def test_record_without_finished_at_is_rejected() -> None:
+    payload = _record().to_json().replace(b'"finished_at":1700000000.0', b'"finished_at":0.0')
+    with pytest.raises(ValueError):
+        HandRecord.from_json(payload)
+
+
+def test_game_service_spools_and_drainer_replays(tmp_path: Path) -> None:
+    async def _run() -> None:
+        spool = HandSpool(tmp_path / "spool.log")
+        table = Table(table_id=1)
+        table.seat_player(1, 1500)
+        table.seat_player(2, 1500)
+        service = GameService(spool=spool)
+
+        await service.start_hand(table)
+        untouched = _FakeSession(set())
+        await service.apply_action(table, 2, PlayerAction.FOLD, 0, untouched)  # type: ignore[arg-type]
+        assert untouched.added == [] and untouched.commits == 0
+        assert spool.pending_bytes > 0
+
+        spool.append(duplicate := _record())
+        session = _FakeSession({duplicate.hand_uid})
+        assert await spool.drain(lambda: session, batch_size=10) == 2  # type: ignore[arg-type]
+
+        games = [obj for obj in session.added if isinstance(obj, PlayerGame)]
+        assert session.inserted == 1 and {game.table_id for game in games} == {1}
+        assert (session.stats[1].hands_won, session.stats[2].hands_lost) == (1, 1)
+        assert session.commits == 1
+        assert (spool.metrics.drained, spool.metrics.duplicates) == (1, 1)
+        assert spool.pending_bytes == 0
+        spool.close()
+
+    asyncio.run(_run())
@@ -0,0 +1,169 @@
+import asyncio
+import gzip
+import json
+from collections.abc import AsyncIterator, Generator
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from backend.auth.jwt_tokens import create_access_token
+from backend.models.finished_game import FinishedGame
+from backend.models.player_game import PlayerGame
+from backend.rest.api import stats as stats_api
+from backend.rest.main import app
+from backend.services.hand_archive import HandArchive
+from backend.services.history_export import encode_ndjson, iter_history
+from backend.services.history_partitions import partition_for
+
+# SQLite can't autoincrement a composite primary key, so the partitioned tables are declared by hand.
+_SCHEMA = (
+    "CREATE TABLE finished_games (uuid INTEGER, finished_at DATETIME, hand_uid VARCHAR(32), table_id INTEGER,"
+    " pot BIGINT, board JSON, winners JSON, PRIMARY KEY (uuid, finished_at))",
+    "CREATE TABLE player_games (id INTEGER, finished_at DATETIME, finished_game_uuid INTEGER, table_id INTEGER,"
+    " user_id INTEGER, hole_cards JSON, bet BIGINT, net_stack_delta BIGINT, resulting_balance BIGINT,"
+    " won_hand BOOLEAN, PRIMARY KEY (id, finished_at))",
+)
+
+
+async def _rows(count: int) -> AsyncIterator[dict[str, object]]:
+    for index in range(count):
+        yield {"id": count - index, "user_id": 7, "hole_cards": ["As", "Kd"], "won_hand": index % 2 == 0}
+
+
+def test_encode_ndjson_chunks_and_gzip() -> None:
+    async def _collect(compress: bool) -> list[bytes]:
+        return [chunk async for chunk in encode_ndjson(_rows(200), compress=compress, chunk_bytes=1024)]
+
+    plain = asyncio.run(_collect(False))
+    assert len(plain) > 1
+    assert all(len(chunk) < 1200 for chunk in plain)
+    lines = b"".join(plain).splitlines()
+    assert [json.loads(line)["id"] for line in lines] == list(range(200, 0, -1))
+
+    packed = asyncio.run(_collect(True))
+    assert gzip.decompress(b"".join(packed)) == b"".join(plain)
+
+
+def test_encode_ndjson_empty_history() -> None:
+    async def _collect() -> list[bytes]:
+        return [chunk async for chunk in encode_ndjson(_rows(0), compress=True)]
+
+    assert gzip.decompress(b"".join(asyncio.run(_collect()))) == b""
+
+
+class _History:
+    """Live rows 5..3 of user 7 in SQLite, archived rows 4..1 (4 and 3 overlap the live ones)."""
+
+    def __init__(self, tmp_path: Path) -> None:
+        self.engine = create_async_engine(
+            "sqlite+aiosqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        self.session_local = async_sessionmaker(self.engine, class_=AsyncSession, expire_on_commit=False)
+        self.archive = HandArchive(tmp_path)
+        self.statements: list[dict[str, Any]] = []
+        self.open_sessions = 0
+        asyncio.run(self._seed())
+        event.listen(self.engine.sync_engine, "before_cursor_execute", self._record)
+        archived = [_archived_row(entry_id) for entry_id in (4, 3, 2, 1)]
+        self.archive.write_segment(partition_for(datetime(2026, 1, 10, tzinfo=timezone.utc)), [(7, archived)])
+
+    def _record(self, conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+        if "player_games" in statement:
+            self.statements.append(dict(context.execution_options))
+
+    async def _seed(self) -> None:
+        finished_at = datetime(2026, 2, 10, tzinfo=timezone.utc)
+        async with self.engine.begin() as conn:
+            for ddl in _SCHEMA:
+                await conn.execute(text(ddl))
+        async with self.session_local() as session:
+            for entry_id, user_id in ((3, 7), (4, 7), (5, 7), (6, 8)):
+                session.add(
+                    FinishedGame(uuid=entry_id, finished_at=finished_at, table_id=1, pot=200, board=["As"], winners=[])
+                )
+                session.add(
+                    PlayerGame(
+                        id=entry_id,
+                        finished_at=finished_at,
+                        finished_game_uuid=entry_id,
+                        table_id=1,
+                        user_id=user_id,
+                        hole_cards=["Kd", "Qs"],
+                        bet=100,
+                        net_stack_delta=-100,
+                        won_hand=False,
+                    )
+                )
+            await session.commit()
+
+    def session_factory(self) -> AsyncSession:
+        history = self
+
+        class _Tracked(AsyncSession):
+            async def __aenter__(self) -> AsyncSession:
+                history.open_sessions += 1
+                return await super().__aenter__()
+
+            async def __aexit__(self, *exc: Any) -> None:
+                history.open_sessions -= 1
+                await super().__aexit__(*exc)
+
+        return _Tracked(self.engine, expire_on_commit=False)
+
+
+def _archived_row(entry_id: int) -> dict[str, object]:
+    return {"id": entry_id, "user_id": 7, "hole_cards": ["2c", "7d"], "board": [], "winners": [], "pot": 0}
+
+
+@pytest.fixture()
+def history(tmp_path: Path) -> Generator[_History, None, None]:
+    history = _History(tmp_path)
+    yield history
+    asyncio.run(history.engine.dispose())
+
+
+def test_iter_history_streams_live_rows_then_the_archive(history: _History) -> None:
+    async def _collect() -> tuple[list[dict[str, Any]], list[int]]:
+        rows, open_while_live = [], []
+        factory: Any = history.session_factory
+        async for row in iter_history(factory, history.archive, 7, fetch_size=2):
+            rows.append(row)
+            open_while_live.append(history.open_sessions)
+        return rows, open_while_live
+
+    rows, open_while_live = asyncio.run(_collect())
+    assert [row["id"] for row in rows] == [5, 4, 3, 2, 1]
+    assert rows[0]["hole_cards"] == ["Kd", "Qs"] and rows[-1]["hole_cards"] == ["2c", "7d"]
+    # The generator holds its own session while live rows stream and closes it before the archive.
+    assert open_while_live == [1, 1, 1, 0, 0] and history.open_sessions == 0
+    assert [options.get("yield_per") for options in history.statements] == [2]
+    assert history.statements[0]["stream_results"]
+
+
+def test_history_export_endpoints(history: _History, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(stats_api, "ReadSessionLocal", history.session_local)
+    monkeypatch.setattr(stats_api, "hand_archive", history.archive)
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {create_access_token(7)}"}
+
+    plain = client.get("/api/stats/me/history/export", headers=headers)
+    assert plain.status_code == 200
+    assert plain.headers["content-type"] == "application/x-ndjson"
+    assert plain.headers["content-disposition"] == 'attachment; filename="history-7.ndjson"'
+    assert [json.loads(line)["id"] for line in plain.content.splitlines()] == [5, 4, 3, 2, 1]
+
+    packed = client.get("/api/stats/7/history/export", params={"gzip": "true"}, headers=headers)
+    assert packed.status_code == 200
+    assert packed.headers["content-type"] == "application/gzip"
+    assert packed.headers["content-disposition"] == 'attachment; filename="history-7.ndjson.gz"'
+    assert gzip.decompress(packed.content) == plain.content
+
+    assert client.get("/api/stats/0/history/export", headers=headers).status_code == 400
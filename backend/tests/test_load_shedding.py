@@ -0,0 +1,80 @@
+import asyncio
+import re
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.auth.jwt_tokens import create_access_token
+from backend.rest.api.middleware import ConcurrencyLimitMiddleware, RouteGroupLimit, route_limits
+from backend.rest.main import app
+
+
+def test_route_group_queues_then_sheds_with_retry_after() -> None:
+    group = RouteGroupLimit(name="stats", pattern=re.compile(r"/api/stats(?:/.*)?"), limit=1, queue=1)
+    gate = asyncio.Event()
+    handled: list[str] = []
+
+    async def app(scope: dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["path"].startswith("/api/stats"):
+            await gate.wait()
+        handled.append(scope["path"])
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    middleware = ConcurrencyLimitMiddleware(app, [group])
+
+    async def call(path: str) -> tuple[int, dict[bytes, bytes]]:
+        messages: list[dict[str, Any]] = []
+
+        async def receive() -> dict[str, Any]:
+            return {"type": "http.request", "body": b""}
+
+        async def send(message: dict[str, Any]) -> None:
+            messages.append(message)
+
+        await middleware({"type": "http", "method": "GET", "path": path, "headers": []}, receive, send)
+        start = messages[0]
+        return start["status"], dict(start["headers"])
+
+    async def _run() -> list[tuple[int, dict[bytes, bytes]]]:
+        running = asyncio.create_task(call("/api/stats/me/stats"))
+        queued = asyncio.create_task(call("/api/stats/me/history"))
+        await asyncio.sleep(0)
+        assert (group.in_flight, group.queued) == (1, 1)
+        shed = await call("/api/stats/leaderboard/profit")
+        unlimited = await call("/api/tables/")
+        gate.set()
+        return [await running, await queued, shed, unlimited]
+
+    running, queued, shed, unlimited = asyncio.run(_run())
+    assert running[0] == queued[0] == unlimited[0] == 200
+    assert shed[0] == 503 and shed[1][b"retry-after"] == b"1"
+    assert handled == ["/api/tables/", "/api/stats/me/stats", "/api/stats/me/history"]
+    assert group.snapshot() == {"limit": 1, "queue": 1, "in_flight": 0, "queued": 0, "admitted": 2, "shed": 1}
+
+
+def test_history_exports_have_their_own_group() -> None:
+    def group_of(path: str) -> str | None:
+        return next((g.name for g in route_limits if g.pattern.fullmatch(path)), None)
+
+    assert group_of("/api/stats/me/history/export") == "export"
+    assert group_of("/api/stats/7/history/export") == "export"
+    assert group_of("/api/stats/7/history") == "stats"
+    assert group_of("/api/stats/me/stats") == "stats"
+
+
+def test_shed_and_unauthorized_responses_carry_cors_headers(monkeypatch: pytest.MonkeyPatch) -> None:
+    stats = next(g for g in route_limits if g.name == "stats")
+    monkeypatch.setattr(stats, "in_flight", stats.limit)
+    monkeypatch.setattr(stats, "queue", 0)
+    client = TestClient(app)
+    origin = {"Origin": "http://localhost:5173"}
+    headers = {**origin, "Authorization": f"Bearer {create_access_token(1)}"}
+
+    shed = client.get("/api/stats/leaderboard/profit", headers=headers)
+    unauthorized = client.get("/api/stats/me/stats", headers=origin)
+    monkeypatch.setattr(stats, "in_flight", 0)
+
+    assert shed.status_code == 503 and unauthorized.status_code == 401
+    assert shed.headers["access-control-allow-origin"] == unauthorized.headers["access-control-allow-origin"] == origin["Origin"]
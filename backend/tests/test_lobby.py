@@ -0,0 +1,109 @@
+from collections.abc import Generator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.auth.jwt_tokens import create_access_token
+from backend.rest.main import app
+from backend.services.table_store import LobbyEvent, LobbyQuery, TableStore
+
+
+@pytest.fixture()
+def client() -> Generator[TestClient, None, None]:
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def _auth() -> dict[str, str]:
+    return {"Authorization": f"Bearer {create_access_token(1)}"}
+
+
+def test_store_versions_and_events() -> None:
+    store = TableStore()
+    events: list[LobbyEvent] = []
+    store.add_listener(events.append)
+
+    table_id, record = store.create(max_players=6, buy_in=100, private=False)
+    store.create(max_players=6, buy_in=100, private=True)
+    first = store.lobby_snapshot()
+    assert store.lobby_snapshot() is first
+
+    record.table.seat_player(1, 100)
+    store.delete(table_id)
+
+    assert [e.kind for e in events] == ["table_added", "table_updated", "table_removed"]
+    assert [e.version for e in events] == [1, 2, 3]
+    assert events[1].summary is not None and events[1].summary.players_count == 1
+    second = store.lobby_snapshot()
+    assert second.version == 3
+    assert second.etag != first.etag
+    assert second.body == b"[]"
+
+
+def test_list_tables_etag_and_not_modified(client: TestClient) -> None:
+    first = client.get("/api/tables/", headers=_auth())
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    cached = client.get("/api/tables/", headers={**_auth(), "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+
+    created = client.post("/api/tables/create", json={"max_players": 6, "buy_in": 100}, headers=_auth())
+    changed = client.get("/api/tables/", headers={**_auth(), "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert created.json()["id"] in [t["id"] for t in changed.json()]
+
+
+def test_lobby_ws_pushes_snapshot_then_events(client: TestClient) -> None:
+    token = create_access_token(1)
+    with client.websocket_connect(f"/ws/lobby?token={token}") as ws:
+        snapshot = ws.receive_json()
+        assert snapshot["type"] == "lobby_snapshot"
+
+        created = client.post("/api/tables/create", json={"max_players": 6, "buy_in": 100}, headers=_auth()).json()
+        event = ws.receive_json()
+        assert event["type"] == "table_added"
+        assert event["payload"]["id"] == created["id"]
+        assert event["version"] > snapshot["version"]
+
+
+def test_lobby_ws_requires_token(client: TestClient) -> None:
+    with client.websocket_connect("/ws/lobby") as ws:
+        assert ws.receive_json()["code"] == "missing_token"
+
+
+def test_idle_tables_hibernate_and_rehydrate_on_get() -> None:
+    now = [0.0]
+    store = TableStore(clock=lambda: now[0])
+    idle_id, idle = store.create(max_players=6, buy_in=100, private=False)
+    idle.table.seat_player(1, 150)
+    idle.table.seat_player(2, 90)
+    idle.table.seat_player(3, 100, is_spectator=True)
+    idle.table.dealer = 1
+    busy_id, busy = store.create(max_players=6, buy_in=100, private=False)
+    busy.table.seat_player(4, 100)
+    busy.table.seat_player(5, 100)
+    busy.table.start_game()
+    empty_id, _ = store.create(max_players=6, buy_in=100, private=False)
+
+    now[0] = 60.0
+    assert store.hibernate_idle(30.0) == 2
+    metrics = store.hibernation_snapshot()
+    assert metrics["resident"] == 1 and metrics["hibernated"] == 2 and metrics["hibernated_bytes"] > 0
+    assert idle_id in store
+    assert store.query(LobbyQuery())[0] == [idle_id, busy_id, empty_id]
+    assert store.best_open_table(100, 6, user_id=1) == busy_id
+    assert len(list(store.encoded_tables())) == 2
+    assert store.delete_if_empty(empty_id) is True
+
+    record = store.get(idle_id)
+    assert record is not None and record is not idle
+    assert [(p.user_id, p.stack, p.position) for p in record.table.players] == [(1, 150, 0), (2, 90, 1)]
+    assert list(record.table.spectators) == [3]
+    assert record.table.dealer == 1
+    assert store.hibernation_snapshot()["rehydrations"] == 1
+
+    record.table.seat_player(6, 100)
+    assert store.summary(idle_id) is not None and store.summary(idle_id).players_count == 3
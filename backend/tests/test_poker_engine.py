@@ -154,7 +154,7 @@ def test_player_reset_for_new_hand_sets_out_if_stack_zero() -> None:
 
     p.reset_for_new_hand()
     assert p.status == PlayerStatus.OUT
-    assert p.hole_cards == []
+    assert p.hole_cards == ()
     assert p.bet == 0
 
 
@@ -336,3 +336,82 @@ def test_table_advances_dealer_after_hand_finished() -> None:
         pl = gs.players[idx]
         t.apply_action(pl.user_id, PlayerAction.FOLD)
     assert t.dealer == 1
+
+
+def test_hand_stats_track_preflop_roles_and_flags() -> None:
+    players = [PlayerState(user_id=uid, stack=5000, position=uid) for uid in range(4)]
+    game = GameState(players, dealer=0)
+    game.start_game()
+    stats = game.hand_stats.players
+    assert {uid: s.position for uid, s in stats.items()} == {1: "sb", 2: "bb", 3: "late", 0: "button"}
+
+    game.apply_action(players[3], PlayerAction.RAISE, 300)
+    game.apply_action(players[0], PlayerAction.RAISE, 900)
+    game.apply_action(players[1], PlayerAction.FOLD)
+    game.apply_action(players[2], PlayerAction.CALL)
+    game.apply_action(players[3], PlayerAction.CALL)
+    assert game.phase == GamePhase.FLOP
+
+    assert (stats[3].vpip, stats[3].pfr, stats[3].three_bet, stats[3].three_bet_chance) == (True, True, False, False)
+    assert (stats[0].vpip, stats[0].pfr, stats[0].three_bet, stats[0].three_bet_chance) == (True, True, True, True)
+    assert (stats[1].vpip, stats[1].three_bet_chance) == (False, False)
+    assert (stats[2].vpip, stats[2].pfr, stats[2].passive_actions) == (True, False, 1)
+    assert (stats[3].aggressive_actions, stats[3].passive_actions) == (1, 1)
+    assert sorted(uid for uid, s in stats.items() if s.saw_flop) == [0, 2, 3]
+
+    for player in (players[2], players[3], players[0]):
+        game.apply_action(player, PlayerAction.CHECK)
+    for _ in range(2):
+        for player in (players[2], players[3], players[0]):
+            game.apply_action(player, PlayerAction.CHECK)
+    assert not game.hand_active
+    assert sorted(uid for uid, s in stats.items() if s.showdown) == [0, 2, 3]
+
+
+def test_compact_seat_types_and_mid_hand_leave() -> None:
+    table = Table(max_players=3)
+    table.seat_player(1, 1000)
+    table.seat_player(2, 1000)
+    table.seat_player(3, 1000)
+    watcher = table.seat_player(9, 0, is_spectator=True)
+    assert not hasattr(table.players[0], "__dict__") and not hasattr(watcher, "__dict__")
+    assert [s.user_id for s in table.public_spectators()] == [9]
+
+    table.start_game()
+    game = table.game_state
+    assert game is not None
+    assert all(isinstance(p.hole_cards, tuple) and len(p.hole_cards) == 2 for p in table.players)
+
+    assert table.leave(1) == 1000 - table.players[0].bet
+    assert [p.user_id for p in table.public_players()] == [2, 3]
+    assert len(table.players) == 3 and table.players[0].last_action == PlayerAction.FOLD
+
+    while game.hand_active:
+        current = game.players[game.current_player_index]
+        table.apply_action(current.user_id, PlayerAction.FOLD)
+    assert [p.user_id for p in table.players] == [2, 3]
+
+
+def test_table_membership_indexes_follow_seat_changes() -> None:
+    table = Table(max_players=3)
+    for user_id in (1, 2, 3):
+        table.seat_player(user_id, 1000)
+    for user_id in range(100, 1100):
+        table.seat_player(user_id, 0, is_spectator=True)
+    assert table.is_spectator(555) and not table.is_spectator(1)
+    assert table.is_seated(2) and table.get_player(2) is table.players[1]
+
+    table.leave(555)
+    assert not table.is_spectator(555) and len(table.spectators) == 999
+    table.seat_player(555, 0, is_spectator=True)
+    assert [s.user_id for s in table.public_spectators()][-2:] == [1099, 555]
+
+    table.start_game()
+    table.leave(1)
+    assert table.get_player(1) is not None and not table.is_seated(1)
+
+    table.leave(2)
+    assert table.get_player(1) is None and table.get_player(2) is None
+    assert [p.user_id for p in table.players] == [3] and table.players[0].position == 0
+    with pytest.raises(RuntimeError, match="not at the table"):
+        table.apply_action(2, PlayerAction.FOLD)
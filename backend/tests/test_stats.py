@@ -1,9 +1,25 @@
 import asyncio
-
+from collections.abc import AsyncGenerator
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from backend.auth.jwt_tokens import create_access_token
+from backend.database.session import get_db
 from backend.models.player_stats import PlayerStats, StatsDelta, update_stats
 from backend.services.game_service import GameService
+from backend.services.leaderboard import Leaderboard, LeaderboardMetric
+from backend.rest.api import stats as stats_api
+from backend.rest.api.stats import _stats_out
 from backend.poker_engine.game_state import PlayerAction
 from backend.poker_engine.table import Table
+from backend.rest.main import app
+from backend.services.stats_cache import StatsCache, TTLCache
 
 
 class _FakeAsyncSession:
@@ -24,9 +40,18 @@ class _FakeAsyncSession:
             return self.stats_by_user.get(pk)
         return None
 
+    async def execute(self, stmt: Any) -> Any:
+        # The finished_games insert: every hand is new, RETURNING (uuid, hand_uid, finished_at).
+        params = stmt.compile(dialect=postgresql.dialect()).params
+        rows = [(1, params["hand_uid_m0"], params["finished_at_m0"])]
+        return SimpleNamespace(all=lambda: rows)
+
     async def commit(self) -> None:
         return None
 
+    async def rollback(self) -> None:
+        return None
+
 
 def test_update_stats_rules() -> None:
     stats = PlayerStats(user_id=1)
@@ -50,7 +75,7 @@ def test_game_service_updates_player_stats() -> None:
         table = Table(table_id=1)
         table.seat_player(1, 1500)
         table.seat_player(2, 1500)
-        gs = GameService()
+        gs = GameService(board=Leaderboard())
         session = _FakeAsyncSession()
 
         await gs.start_hand(table)
@@ -69,3 +94,127 @@ def test_game_service_updates_player_stats() -> None:
 
     asyncio.run(_run())
 
+
+
+def test_leaderboard_ranks_follow_stat_updates() -> None:
+    board = Leaderboard()
+    rows = {
+        user_id: PlayerStats(user_id=user_id, hands_won=won, hands_lost=0, max_balance=bal, won_stack=ws, lost_stack=ls)
+        for user_id, won, bal, ws, ls in [(1, 3, 1800, 500, 100), (2, 5, 1200, 50, 300), (3, 3, 2500, 900, 0)]
+    }
+    board.observe(rows.values())
+
+    assert board.top(LeaderboardMetric.NET_WINNINGS, limit=10) == [(1, 3, 900), (2, 1, 400), (3, 2, -250)]
+    assert board.top(LeaderboardMetric.HANDS_WON, limit=2, offset=1) == [(2, 1, 3), (3, 3, 3)]
+    assert board.rank(LeaderboardMetric.MAX_BALANCE, 2) == (3, 1200)
+    assert board.rank(LeaderboardMetric.MAX_BALANCE, 99) is None
+
+    update_stats(rows[2], [StatsDelta(user_id=2, won_hand=True, bet=10, net_stack_delta=1000, resulting_balance=3000)])
+    board.observe([rows[2]])
+
+    assert board.rank(LeaderboardMetric.NET_WINNINGS, 2) == (2, 750)
+    assert board.rank(LeaderboardMetric.MAX_BALANCE, 2) == (1, 3000)
+    assert board.rank(LeaderboardMetric.MAX_BALANCE, 3) == (2, 2500)
+    assert board.size(LeaderboardMetric.HANDS_WON) == 3
+
+
+def test_update_stats_accumulates_action_counters() -> None:
+    stats = PlayerStats(user_id=1)
+    update_stats(
+        stats,
+        [
+            StatsDelta(user_id=1, won_hand=True, bet=300, net_stack_delta=250, position="button", vpip=True,
+                       pfr=True, three_bet=True, three_bet_chance=True, aggressive_actions=2, saw_flop=True,
+                       showdown=True),
+            StatsDelta(user_id=1, won_hand=False, bet=100, net_stack_delta=-100, position="bb", passive_actions=1,
+                       three_bet_chance=True, saw_flop=True),
+        ],
+    )
+    out = _stats_out(stats)
+    assert (out.vpip, out.pfr, out.three_bet) == (50.0, 50.0, 50.0)
+    assert (out.aggression_factor, out.showdown_rate, out.showdown_win_rate) == (2.0, 50.0, 100.0)
+    assert out.positions["button"].model_dump() == {"hands": 1, "net": 250}
+    assert out.positions["bb"].model_dump() == {"hands": 1, "net": -100}
+    assert out.positions["early"].hands == 0
+
+
+def test_ttl_cache_expires_and_evicts_lru() -> None:
+    now = [0.0]
+    cache: TTLCache[int, str] = TTLCache(max_entries=2, ttl=10, clock=lambda: now[0])
+    cache.set(1, "a")
+    cache.set(2, "b")
+    assert cache.get(1) == "a"
+    cache.set(3, "c")
+    assert (cache.get(2), cache.get(1), cache.get(3)) == (None, "a", "c")
+    now[0] = 11
+    assert cache.get(1) is None
+    assert cache.metrics.snapshot() == {"hits": 3, "misses": 2, "evictions": 1, "invalidations": 0}
+
+
+def test_stats_cache_bounds_versions_without_reusing_etags() -> None:
+    cache = StatsCache(max_users=2, ttl=60)
+    before = cache.etag("stats", 1)
+    cache.invalidate([1])
+    invalidated = cache.etag("stats", 1)
+    cache.invalidate([2, 3])
+    assert len(cache._versions) == 2 and not cache.invalidated(1) and cache.invalidated(3)
+    # Forgotten users fall back to the highest evicted version, never to an older ETag.
+    assert cache.etag("stats", 1) == invalidated != before
+
+
+def test_stats_endpoint_etag_invalidated_by_finished_hand(monkeypatch: pytest.MonkeyPatch) -> None:
+    engines = [
+        create_async_engine(
+            "sqlite+aiosqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        for _ in range(2)
+    ]
+    replica, primary = (async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False) for engine in engines)
+
+    async def init_models() -> None:
+        # The replica has not seen the finished hand yet; the primary has.
+        for engine, session_local, hands_won in zip(engines, (replica, primary), (2, 3)):
+            async with engine.begin() as conn:
+                await conn.run_sync(PlayerStats.metadata.create_all, tables=[PlayerStats.__table__])
+            async with session_local() as session:
+                session.add(PlayerStats(user_id=1, hands_won=hands_won, hands_lost=1))
+                await session.commit()
+
+    asyncio.run(init_models())
+
+    async def override_get_db() -> AsyncGenerator[AsyncSession, None]:
+        async with replica() as session:
+            yield session
+
+    cache = StatsCache(max_users=16, ttl=60)
+    monkeypatch.setattr(stats_api, "stats_cache", cache)
+    monkeypatch.setattr(stats_api, "SessionLocal", primary)
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        client = TestClient(app)
+        headers = {"Authorization": f"Bearer {create_access_token(1)}"}
+        first = client.get("/api/stats/me/stats", headers=headers)
+        assert first.status_code == 200 and first.json()["hands_won"] == 2
+        etag = first.headers["ETag"]
+
+        cached = client.get("/api/stats/me/stats", headers={**headers, "If-None-Match": etag})
+        assert cached.status_code == 304
+
+        async def _finish_hand() -> None:
+            table = Table(table_id=1)
+            table.seat_player(1, 1500)
+            table.seat_player(2, 1500)
+            service = GameService(board=Leaderboard(), cache=cache)
+            await service.start_hand(table)
+            await service.apply_action(table, 2, PlayerAction.FOLD, 0, _FakeAsyncSession())  # type: ignore[arg-type]
+
+        asyncio.run(_finish_hand())
+        fresh = client.get("/api/stats/me/stats", headers={**headers, "If-None-Match": etag})
+        assert fresh.status_code == 200 and fresh.json()["hands_won"] == 3
+        assert fresh.headers["ETag"] != etag
+    finally:
+        app.dependency_overrides.clear()
+        for engine in engines:
+            asyncio.run(engine.dispose())
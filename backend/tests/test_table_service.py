@@ -3,9 +3,9 @@ import asyncio
 import pytest
 
 from backend.models.user import User
-from backend.rest.schemas.table import TableCreateRequest
-from backend.services.table_service import InsufficientBalanceError, TableNotFoundError, TableService
-from backend.services.table_store import TableStore
+from backend.rest.schemas.table import QuickSeatRequest, TableCreateRequest
+from backend.services.table_service import InsufficientBalanceError, TableFullError, TableNotFoundError, TableService
+from backend.services.table_store import LobbyQuery, TableStore
 
 
 async def _noop_notify(_: int) -> None:
@@ -16,16 +16,52 @@ async def _noop_maybe_start(_: int) -> bool:
     return False
 
 
+class _FakeLedger:
+    async def available(self, db: "_FakeAsyncSession", user_id: int) -> int | None:
+        user = db.users.get(user_id)
+        return None if user is None else int(user.balance)
+
+    async def debit(self, db: "_FakeAsyncSession", user_id: int, amount: int, *, table_id: int | None = None) -> int | None:
+        user = db.users.get(user_id)
+        if user is None or int(user.balance) < amount:
+            return None
+        user.balance = int(user.balance) - amount
+        return int(user.balance)
+
+    async def credit(self, db: "_FakeAsyncSession", user_id: int, amount: int, *, table_id: int | None = None) -> int | None:
+        user = db.users.get(user_id)
+        if user is None:
+            return None
+        user.balance = int(user.balance) + amount
+        return int(user.balance)
+
+
+class _FakeDirectory:
+    def __init__(self) -> None:
+        self.names: dict[int, str] = {}
+
+    async def resolve(self, db: "_FakeAsyncSession", user_ids: list[int]) -> dict[int, str]:
+        for user_id in user_ids:
+            if user_id in db.users:
+                self.names[user_id] = str(db.users[user_id].username)
+        return {user_id: self.names[user_id] for user_id in user_ids if user_id in self.names}
+
+
 def _service_with_fixed_ids(ids: list[int]) -> TableService:
-    it = iter(ids)
-    store = TableStore(id_factory=lambda: next(it))
-    return TableService(store, notify_table_changed=_noop_notify, maybe_start_game=_noop_maybe_start)
+    service, _store = _service_and_store_with_fixed_ids(ids)
+    return service
 
 
 def _service_and_store_with_fixed_ids(ids: list[int]) -> tuple[TableService, TableStore]:
     it = iter(ids)
     store = TableStore(id_factory=lambda: next(it))
-    service = TableService(store, notify_table_changed=_noop_notify, maybe_start_game=_noop_maybe_start)
+    service = TableService(
+        store,
+        notify_table_changed=_noop_notify,
+        maybe_start_game=_noop_maybe_start,
+        ledger=_FakeLedger(),  # type: ignore[arg-type]
+        directory=_FakeDirectory(),  # type: ignore[arg-type]
+    )
     return service, store
 
 
@@ -164,3 +200,90 @@ def test_private_tables_are_not_listed() -> None:
     service.create_table(TableCreateRequest(max_players=6, buy_in=5000, private=False))
     tables = service.list_tables()
     assert [t.id for t in tables] == ["2"]
+
+
+def test_store_allocates_monotonic_ids() -> None:
+    store = TableStore()
+    ids = [store.create(max_players=6, buy_in=100, private=False)[0] for _ in range(3)]
+    assert ids == sorted(ids)
+    assert len(set(ids)) == 3
+
+
+def test_lobby_query_filters_and_paginates() -> None:
+    async def _run() -> None:
+        service, store = _service_and_store_with_fixed_ids([1, 2, 3, 4, 5])
+        db = _FakeAsyncSession({1: User(id=1, username="u1", password_hash="x", balance=10_000)})
+        service.create_table(TableCreateRequest(max_players=2, buy_in=100, private=False))
+        service.create_table(TableCreateRequest(max_players=6, buy_in=500, private=False))
+        service.create_table(TableCreateRequest(max_players=6, buy_in=1000, private=True))
+        service.create_table(TableCreateRequest(max_players=6, buy_in=2000, private=False))
+        service.create_table(TableCreateRequest(max_players=9, buy_in=500, private=False))
+
+        by_buy_in, _ = service.query_lobby(LobbyQuery(min_buy_in=200, max_buy_in=1500))
+        assert [t.id for t in by_buy_in] == ["2", "5"]
+
+        with_private, _ = service.query_lobby(LobbyQuery(include_private=True, min_buy_in=1000, max_buy_in=1000))
+        assert [t.id for t in with_private] == ["3"]
+
+        roomy, _ = service.query_lobby(LobbyQuery(min_open_seats=7))
+        assert [t.id for t in roomy] == ["5"]
+
+        store.get(1).table.seat_player(2, 100)  # type: ignore[union-attr]
+        await service.join_table(1, user_id=1, db=db)
+        not_full, _ = service.query_lobby(LobbyQuery(not_full=True))
+        assert [t.id for t in not_full] == ["2", "4", "5"]
+
+        await service.leave_table(1, user_id=1, db=db)
+        not_full_again, _ = service.query_lobby(LobbyQuery(not_full=True))
+        assert [t.id for t in not_full_again] == ["1", "2", "4", "5"]
+
+        page1, cursor = service.query_lobby(LobbyQuery(), limit=2)
+        assert [t.id for t in page1] == ["1", "2"]
+        page2, cursor2 = service.query_lobby(LobbyQuery(), cursor=cursor, limit=2)
+        assert [t.id for t in page2] == ["4", "5"]
+        assert cursor2 is None
+
+    asyncio.run(_run())
+
+
+def test_quick_seat_spreads_players_and_creates_tables() -> None:
+    async def _run() -> None:
+        service, store = _service_and_store_with_fixed_ids([1, 2, 3, 4])
+        db = _FakeAsyncSession(
+            {uid: User(id=uid, username=f"u{uid}", password_hash="x", balance=10_000) for uid in range(1, 8)}
+        )
+        service.create_table(TableCreateRequest(max_players=2, buy_in=100, private=False))
+        service.create_table(TableCreateRequest(max_players=2, buy_in=100, private=False))
+        service.create_table(TableCreateRequest(max_players=2, buy_in=500, private=False))
+        store.get(1).table.seat_player(100, 100)  # type: ignore[union-attr]
+
+        first = await service.quick_seat(QuickSeatRequest(buy_in=100, max_players=2), user_id=1, db=db)
+        assert first.id == "1"
+        assert first.players_count == 2
+
+        second = await service.quick_seat(QuickSeatRequest(buy_in=100), user_id=2, db=db)
+        assert second.id == "2"
+
+        third = await service.quick_seat(QuickSeatRequest(buy_in=100, max_players=2), user_id=3, db=db)
+        assert third.id == "2"
+
+        created = await service.quick_seat(QuickSeatRequest(buy_in=100, max_players=2), user_id=4, db=db)
+        assert created.id == "4"
+        assert created.players_count == 1
+        assert int(db.users[4].balance) == 9_900
+
+    asyncio.run(_run())
+
+
+def test_join_full_table_raises() -> None:
+    async def _run() -> None:
+        service, store = _service_and_store_with_fixed_ids([1])
+        db = _FakeAsyncSession({1: User(id=1, username="u1", password_hash="x", balance=10_000)})
+        service.create_table(TableCreateRequest(max_players=2, buy_in=100, private=False))
+        store.get(1).table.seat_player(10, 100)  # type: ignore[union-attr]
+        store.get(1).table.seat_player(11, 100)  # type: ignore[union-attr]
+        with pytest.raises(TableFullError):
+            await service.join_table(1, user_id=1, db=db)
+        assert int(db.users[1].balance) == 10_000
+
+    asyncio.run(_run())
@@ -0,0 +1,151 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from backend.database.base import Base
+from backend.models.chip_ledger import ChipLedgerEntry
+from backend.models.user import User
+from backend.poker_engine.game_state import PlayerAction
+from backend.poker_engine.table import Table
+from backend.services.chip_ledger import ChipLedger
+from backend.services.game_service import GameService
+from backend.services.table_codec import decode_table, encode_table, rebuild_table
+from backend.services.table_snapshot import TableSnapshotter
+from backend.services.table_store import TableStore
+
+
+def test_snapshot_restores_tables_and_rolls_back_running_hand(tmp_path: Path) -> None:
+    store = TableStore(id_factory=iter([7, 8, 9]).__next__)
+    _, playing = store.create(max_players=6, buy_in=1000, private=True)
+    store.create(max_players=6, buy_in=500, private=False)
+    table = playing.table
+    for user_id in (1, 2, 3):
+        table.seat_player(user_id, 1000)
+    table.seat_player(4, 1000, is_spectator=True)
+    table.dealer = 1
+
+    async def _play() -> None:
+        service = GameService()
+        await service.start_hand(table)
+        game = table.game_state
+        assert game is not None and game.current_player_index is not None
+        actor = game.players[game.current_player_index].user_id
+        table.apply_action(actor, PlayerAction.CALL)
+
+    asyncio.run(_play())
+    game = table.game_state
+    assert game is not None and game.pot > 0
+
+    snapshotter = TableSnapshotter(tmp_path / "tables.snap")
+    assert snapshotter.write(store) == 1
+
+    written_at, [image] = snapshotter.load()
+    assert written_at is not None
+    assert image.hand_active
+    # Only what the rollback needs: no cards, no deck, stacks from before the blinds.
+    assert [(seat.user_id, seat.stack) for seat in image.seats] == [(1, 1000), (2, 1000), (3, 1000)]
+    assert image.dealer_id == 2
+
+    fresh = TableStore()
+    [record] = snapshotter.restore(fresh)
+    restored = record.table
+    assert fresh.get(7) is record and fresh.get(8) is None
+    assert record.private is True and record.buy_in == 1000
+    assert restored.game_state is None
+    assert restored.dealer == 1
+    assert [(p.user_id, p.stack, p.position) for p in restored.players] == [(1, 1000, 0), (2, 1000, 1), (3, 1000, 2)]
+    assert list(restored.spectators) == [4]
+    assert snapshotter.metrics.rolled_back_hands == 1
+
+    assert snapshotter.restore(fresh) == []
+
+
+def test_dealer_survives_mid_hand_leavers() -> None:
+    def _restored_dealer(leaver: int) -> int:
+        table = Table(table_id=1)
+        for user_id in (1, 2, 3, 4):
+            table.seat_player(user_id, 1000)
+        table.start_game()
+        table.dealer = 2
+        table.leave(leaver)
+        image, _ = decode_table(memoryview(encode_table(table, buy_in=1000, private=False)))
+        restored = rebuild_table(image)
+        return restored.players[restored.dealer].user_id
+
+    assert _restored_dealer(1) == 3
+    # The button itself left: it goes to the next player still seated.
+    assert _restored_dealer(3) == 4
+
+
+def test_corrupt_snapshot_is_ignored(tmp_path: Path) -> None:
+    store = TableStore()
+    _, record = store.create(max_players=6, buy_in=100, private=False)
+    record.table.seat_player(1, 100)
+    snapshotter = TableSnapshotter(tmp_path / "tables.snap")
+    snapshotter.write(store)
+
+    data = bytearray(snapshotter.path.read_bytes())
+    data[-1] ^= 0xFF
+    snapshotter.path.write_bytes(bytes(data))
+    assert snapshotter.restore(TableStore()) == []
+    assert TableSnapshotter(tmp_path / "missing.snap").restore(TableStore()) == []
+
+
+def test_reconcile_settles_chips_moved_after_the_snapshot(tmp_path: Path) -> None:
+    store = TableStore(id_factory=iter([7, 8]).__next__)
+    _, kept = store.create(max_players=6, buy_in=500, private=False)
+    _, abandoned = store.create(max_players=6, buy_in=500, private=False)
+    kept.table.seat_player(1, 700)
+    kept.table.seat_player(2, 300)
+    abandoned.table.seat_player(4, 500)
+    snapshotter = TableSnapshotter(tmp_path / "tables.snap")
+    snapshotter.write(store)
+
+    fresh = TableStore()
+    records = snapshotter.restore(fresh)
+    assert snapshotter.restored_written_at is not None
+    written_at = datetime.fromtimestamp(snapshotter.restored_written_at, timezone.utc)
+    before, after = written_at - timedelta(seconds=5), written_at + timedelta(seconds=1)
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+    session_local = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def _run() -> tuple[list[int], list[tuple[int, int, str]]]:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[User.__table__, ChipLedgerEntry.__table__])
+        async with session_local() as session:
+            session.add_all([User(id=i, username=f"u{i}", password_hash="x", balance=0) for i in (1, 2, 3, 4)])
+            session.add_all(
+                [
+                    # Older than the snapshot: already reflected in it.
+                    ChipLedgerEntry(user_id=2, amount=-500, reason="buy_in", table_id=7, created_at=before),
+                    # Player 1 cashed out after the last write: the restored seat must go.
+                    ChipLedgerEntry(user_id=1, amount=700, reason="cashout", table_id=7, created_at=after),
+                    # Player 3 bought in after the last write: the seat is lost, so refund it.
+                    ChipLedgerEntry(user_id=3, amount=-500, reason="buy_in", table_id=7, created_at=after),
+                    ChipLedgerEntry(user_id=4, amount=500, reason="cashout", table_id=8, created_at=after),
+                ]
+            )
+            await session.commit()
+            alive = await snapshotter.reconcile(session, fresh, records, ledger=ChipLedger())
+            rows = await session.execute(
+                select(ChipLedgerEntry.user_id, ChipLedgerEntry.amount, ChipLedgerEntry.reason)
+                .where(ChipLedgerEntry.id > 4)
+            )
+            return [record.table.table_id for record in alive], [tuple(row) for row in rows.all()]
+
+    try:
+        alive, new_rows = asyncio.run(_run())
+    finally:
+        asyncio.run(engine.dispose())
+
+    assert alive == [7]
+    assert [p.user_id for p in fresh.get(7).table.players] == [2]  # type: ignore[union-attr]
+    assert 8 not in fresh
+    assert new_rows == [(3, 500, "cashout")]
+    assert snapshotter.metrics.reconciled_seats == 2
+    assert snapshotter.metrics.refunded_buy_ins == 1
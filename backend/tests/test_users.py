@@ -0,0 +1,86 @@
+import asyncio
+from collections.abc import AsyncGenerator
+
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from backend.auth.jwt_tokens import create_access_token
+from backend.database.session import get_db
+from backend.models.user import User
+from backend.poker_engine.table import Table
+from backend.rest.main import app
+from backend.services.table_store import TableStore
+from backend.services.user_directory import user_directory
+from backend.ws_api import tables as ws_tables
+
+
+def test_batch_user_lookup_uses_directory() -> None:
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    session_local = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    queries: list[int] = []
+
+    async def init_models() -> None:
+        async with engine.begin() as conn:
+            await conn.run_sync(User.metadata.create_all, tables=[User.__table__])
+        async with session_local() as session:
+            session.add_all(
+                [
+                    User(id=901, username="alice", password_hash="x", balance=0),
+                    User(id=902, username="bob", password_hash="x", balance=0),
+                ]
+            )
+            await session.commit()
+
+    asyncio.run(init_models())
+
+    async def override_get_db() -> AsyncGenerator[AsyncSession, None]:
+        async with session_local() as session:
+            original = session.execute
+
+            async def counting_execute(*args, **kwargs):  # type: ignore[no-untyped-def]
+                queries.append(1)
+                return await original(*args, **kwargs)
+
+            session.execute = counting_execute  # type: ignore[method-assign]
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        client = TestClient(app)
+        headers = {"Authorization": f"Bearer {create_access_token(1)}"}
+        res = client.get("/api/users", params={"ids": "902,999,901,902"}, headers=headers)
+        assert res.status_code == 200
+        assert res.json() == [{"id": 902, "username": "bob"}, {"id": 901, "username": "alice"}]
+        assert len(queries) == 1
+
+        assert client.get("/api/users", params={"ids": "901,902"}, headers=headers).status_code == 200
+        assert client.get("/api/users/901", headers=headers).json()["username"] == "alice"
+        assert len(queries) == 1
+
+        assert client.get("/api/users", params={"ids": "1,x"}, headers=headers).status_code == 400
+        too_many = ",".join(str(i) for i in range(1000))
+        rejected = client.get("/api/users", params={"ids": too_many}, headers=headers)
+        assert rejected.json()["detail"]["code"] == "too_many_ids"
+    finally:
+        app.dependency_overrides.clear()
+        asyncio.run(engine.dispose())
+
+
+def test_table_state_embeds_cached_usernames() -> None:
+    store = TableStore(id_factory=lambda: 1)
+    ws_tables.table_store = store
+    table_id, record = store.create(max_players=6, buy_in=1000, private=False)
+    table: Table = record.table
+    table.seat_player(911, 1000)
+    table.seat_player(912, 1000, is_spectator=True)
+    user_directory.remember(911, "carol")
+    user_directory.remember(912, "dave")
+
+    state = ws_tables._build_table_state(table_id, viewer_id=911, show_all=False)
+    assert [(p["user_id"], p["username"]) for p in state["players"]] == [(911, "carol")]
+    assert state["spectators"] == [{"user_id": 912, "username": "dave"}]
@@ -0,0 +1,48 @@
+import json
+
+import pytest
+
+from backend.ws_api import admission
+from backend.ws_api.admission import InboundLimiter, MessageRejected, admission_metrics
+from backend.ws_api.tables import TABLE_MESSAGE_TYPES
+
+
+def _codes(limiter: InboundLimiter, messages: list[str]) -> list[str | None]:
+    codes: list[str | None] = []
+    for raw in messages:
+        try:
+            limiter.admit(raw)
+            codes.append(None)
+        except MessageRejected as exc:
+            codes.append(exc.code if exc.notify else "silent")
+    return codes
+
+
+def test_limiter_throttles_and_validates_before_the_lock(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(admission.settings, "ws_message_burst", 3)
+    monkeypatch.setattr(admission.settings, "ws_messages_per_second", 1.0)
+    monkeypatch.setattr(admission.settings, "ws_show_all_toggle_burst", 1)
+    now = [0.0]
+    limiter = InboundLimiter(TABLE_MESSAGE_TYPES, clock=lambda: now[0])
+    toggle = json.dumps({"type": "toggle_show_all", "payload": {"show": True}})
+    fold = json.dumps({"type": "player_action", "payload": {"action": "fold"}})
+    before = admission_metrics.snapshot()["dropped"].get("rate_limited", 0)
+
+    assert _codes(limiter, [toggle, toggle, fold, fold, fold]) == [None, "rate_limited", None, "rate_limited", "silent"]
+    now[0] = 10.0
+    assert _codes(limiter, [
+        "{not json",
+        "x" * 5000,
+        json.dumps({"type": "chat", "payload": {}}),
+    ]) == ["invalid_json", "message_too_large", "unknown_message_type"]
+    now[0] = 20.0
+    assert _codes(limiter, [
+        json.dumps({"type": "player_action", "payload": {"action": "dance"}}),
+        json.dumps({"type": "player_action", "payload": {"action": "raise", "amount": -5}}),
+        json.dumps({"type": "player_action", "payload": {"action": "raise", "amount": 50}}),
+    ]) == ["invalid_action", "invalid_amount", None]
+    now[0] = 30.0
+    # Under the limit in characters, over it in UTF-8 bytes.
+    wide = json.dumps({"type": "player_action", "payload": {"action": "fold", "note": "ж" * 2100}}, ensure_ascii=False)
+    assert _codes(limiter, [wide]) == ["message_too_large"]
+    assert admission_metrics.snapshot()["dropped"]["rate_limited"] - before == 3
@@ -0,0 +1,78 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from backend.services.table_store import TableStore
+from backend.ws_api import tables as ws_tables
+
+
+class _FakeLedger:
+    def __init__(self, failures: int = 0) -> None:
+        self.batches: list[tuple[dict[int, int], int | None]] = []
+        self.failures = failures
+
+    async def credit_many(self, db: object, credits: dict[int, int], *, table_id: int | None = None) -> None:
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("database is down")
+        self.batches.append((dict(credits), table_id))
+
+
+class _FakeSessionFactory:
+    async def __aenter__(self) -> object:
+        return object()
+
+    async def __aexit__(self, *exc: Any) -> None:
+        return None
+
+
+def test_expired_grace_periods_cash_out_in_one_batch(monkeypatch: pytest.MonkeyPatch) -> None:
+    store = TableStore(id_factory=lambda: 81)
+    ledger = _FakeLedger()
+    monkeypatch.setattr(ws_tables, "table_store", store)
+    monkeypatch.setattr(ws_tables, "chip_ledger", ledger)
+    monkeypatch.setattr(ws_tables, "SessionLocal", _FakeSessionFactory)
+    monkeypatch.setattr(ws_tables, "LEAVE_GRACE_SECONDS", 0.01)
+    table_id, record = store.create(max_players=6, buy_in=1000, private=False)
+    for user_id in (1, 2, 3):
+        record.table.seat_player(user_id, 1000)
+
+    async def _run() -> None:
+        for user_id in (1, 2, 3):
+            ws_tables._schedule_delayed_leave(table_id, user_id)
+        ws_tables._schedule_delayed_leave(table_id, 1)
+        # User 3 reconnects before the grace period ends.
+        ws_tables._cancel_pending_leave(table_id, 3)
+        await ws_tables._leave_sweeps[table_id]
+
+    asyncio.run(_run())
+    assert ledger.batches == [({1: 1000, 2: 1000}, table_id)]
+    assert [p.user_id for p in record.table.players] == [3]
+    assert table_id not in ws_tables._pending_leaves and table_id not in ws_tables._leave_sweeps
+
+
+def test_failed_cashout_keeps_the_seats_and_retries(monkeypatch: pytest.MonkeyPatch) -> None:
+    store = TableStore(id_factory=lambda: 82)
+    ledger = _FakeLedger(failures=1)
+    monkeypatch.setattr(ws_tables, "table_store", store)
+    monkeypatch.setattr(ws_tables, "chip_ledger", ledger)
+    monkeypatch.setattr(ws_tables, "SessionLocal", _FakeSessionFactory)
+    monkeypatch.setattr(ws_tables, "LEAVE_GRACE_SECONDS", 0.01)
+    monkeypatch.setattr(ws_tables, "LEAVE_RETRY_SECONDS", 0.01)
+    table_id, record = store.create(max_players=6, buy_in=1000, private=False)
+    record.table.seat_player(1, 700)
+    record.table.seat_player(2, 1000)
+
+    async def _run() -> list[int]:
+        ws_tables._schedule_delayed_leave(table_id, 1)
+        sweep = ws_tables._leave_sweeps[table_id]
+        while ledger.failures:
+            await asyncio.sleep(0.005)
+        seated_after_failure = [p.user_id for p in record.table.players]
+        await sweep
+        return seated_after_failure
+
+    assert asyncio.run(_run()) == [1, 2]
+    assert ledger.batches == [({1: 700}, table_id)]
+    assert [p.user_id for p in record.table.players] == [2]
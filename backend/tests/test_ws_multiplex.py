@@ -0,0 +1,40 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.auth.jwt_tokens import create_access_token
+from backend.rest.main import app
+from backend.services.table_store import TableStore
+from backend.ws_api import tables as ws_tables
+
+
+def test_one_socket_subscribes_to_many_tables(monkeypatch: pytest.MonkeyPatch) -> None:
+    store = TableStore(id_factory=iter([61, 62]).__next__)
+    monkeypatch.setattr(ws_tables, "table_store", store)
+    left: list[tuple[int, int]] = []
+    monkeypatch.setattr(ws_tables, "_schedule_delayed_leave", lambda *key: left.append(key))
+    first, record = store.create(max_players=6, buy_in=1000, private=False)
+    second, _ = store.create(max_players=6, buy_in=1000, private=False)
+    record.table.seat_player(5, 1000)
+
+    client = TestClient(app)
+    with client.websocket_connect(f"/ws?token={create_access_token(5)}") as ws:
+        ws.send_json({"type": "subscribe", "table_id": first})
+        ws.send_json({"type": "subscribe", "table_id": second})
+        states = [ws.receive_json(), ws.receive_json()]
+        assert [(m["type"], m["table_id"]) for m in states] == [("table_state", first), ("table_state", second)]
+        assert ws_tables.multiplex_metrics.subscriptions == 2
+
+        ws.send_json({"type": "subscribe", "table_id": 999})
+        assert ws.receive_json() == {
+            "type": "error", "code": "table_not_found", "message": "Table not found", "table_id": 999,
+        }
+        ws.send_json({"type": "unsubscribe", "table_id": second})
+        ws.send_json({"type": "toggle_show_all", "table_id": second, "payload": {"show": True}})
+        assert ws.receive_json()["code"] == "not_subscribed"
+        ws.send_json({"type": "player_action", "table_id": first, "payload": {}})
+        error = ws.receive_json()
+        assert (error["code"], error["table_id"]) == ("missing_action", first)
+
+    assert left == [(second, 5), (first, 5)]
+    assert ws_tables.multiplex_metrics.snapshot()["connections"] == 0
+    assert first not in ws_tables._table_conns and second not in ws_tables._table_conns
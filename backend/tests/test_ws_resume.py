@@ -0,0 +1,115 @@
+import asyncio
+import json
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from backend.models.user import User
+from backend.services.table_store import TableStore
+from backend.services.user_directory import UserDirectory
+from backend.ws_api import tables as ws_tables
+
+
+class _FakeSocket:
+    def __init__(self) -> None:
+        self.sent: list[str] = []
+
+    async def send_text(self, text: str) -> None:
+        self.sent.append(text)
+
+
+def _seqs(socket: _FakeSocket) -> list[int]:
+    return [json.loads(text)["seq"] for text in socket.sent]
+
+
+def test_reconnect_replays_only_missed_frames(monkeypatch: pytest.MonkeyPatch) -> None:
+    store = TableStore(id_factory=lambda: 71)
+    monkeypatch.setattr(ws_tables, "table_store", store)
+    monkeypatch.setattr(ws_tables.settings, "ws_resume_events", 2)
+    table_id, record = store.create(max_players=6, buy_in=1000, private=False)
+    record.table.seat_player(1, 1000)
+
+    async def _run() -> dict[str, _FakeSocket]:
+        sockets = {name: _FakeSocket() for name in ("player", "current", "recent", "seated", "stale")}
+        await ws_tables._attach(table_id, sockets["player"], 1)
+        for _ in range(3):
+            await ws_tables._broadcast_state(table_id)
+        await ws_tables._attach(table_id, sockets["current"], 2, last_seq=3)
+        await ws_tables._attach(table_id, sockets["recent"], 3, last_seq=1)
+        await ws_tables._attach(table_id, sockets["seated"], 1, last_seq=2)
+        await ws_tables._attach(table_id, sockets["stale"], 4, last_seq=0)
+        ws_tables._table_conns.pop(table_id)
+        ws_tables._event_logs.pop(table_id)
+        return sockets
+
+    before = ws_tables.resume_metrics.snapshot()
+    sockets = asyncio.run(_run())
+    after = ws_tables.resume_metrics.snapshot()
+
+    assert _seqs(sockets["player"]) == [0, 1, 2, 3]
+    assert sockets["current"].sent == []
+    assert _seqs(sockets["recent"]) == [2, 3]
+    assert _seqs(sockets["seated"]) == [3]
+    assert _seqs(sockets["stale"]) == [3]
+    assert after["resumes"] - before["resumes"] == 3
+    assert after["snapshot_fallbacks"] - before["snapshot_fallbacks"] == 1
+
+
+def test_attach_registers_after_the_replay(monkeypatch: pytest.MonkeyPatch) -> None:
+    store = TableStore(id_factory=lambda: 72)
+    monkeypatch.setattr(ws_tables, "table_store", store)
+    table_id, record = store.create(max_players=6, buy_in=1000, private=False)
+    record.table.seat_player(1, 1000)
+    record.table.seat_player(2, 1000)
+
+    async def _run() -> tuple[_FakeSocket, _FakeSocket]:
+        player, rejoining = _FakeSocket(), _FakeSocket()
+        await ws_tables._attach(table_id, player, 1)
+        await ws_tables._broadcast_state(table_id)
+        lock = ws_tables._get_lock(table_id)
+        async with lock:
+            # A reconnect arrives while a broadcast holds the table lock.
+            attaching = asyncio.create_task(ws_tables._attach(table_id, rejoining, 2, last_seq=0))
+            await asyncio.sleep(0)
+            await ws_tables._broadcast_state(table_id)
+        await attaching
+        await ws_tables._broadcast_state(table_id)
+        ws_tables._table_conns.pop(table_id)
+        ws_tables._event_logs.pop(table_id)
+        return player, rejoining
+
+    player, rejoining = asyncio.run(_run())
+    assert _seqs(player) == [0, 1, 2, 3]
+    assert _seqs(rejoining) == [1, 2, 3]
+
+
+def test_attach_resolves_names_the_directory_lost(monkeypatch: pytest.MonkeyPatch) -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+    session_local = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    directory = UserDirectory(max_entries=16)
+    store = TableStore(id_factory=lambda: 73)
+    monkeypatch.setattr(ws_tables, "table_store", store)
+    monkeypatch.setattr(ws_tables, "user_directory", directory)
+    monkeypatch.setattr(ws_tables, "ReadSessionLocal", session_local)
+    table_id, record = store.create(max_players=6, buy_in=1000, private=False)
+    record.table.seat_player(1, 1000)
+    record.table.seat_player(2, 1000, is_spectator=True)
+
+    async def _run() -> dict[str, object]:
+        async with engine.begin() as conn:
+            await conn.run_sync(User.metadata.create_all, tables=[User.__table__])
+        async with session_local() as session:
+            session.add_all([User(id=1, username="ann", password_hash="x"), User(id=2, username="bob", password_hash="x")])
+            await session.commit()
+        socket = _FakeSocket()
+        await ws_tables._attach(table_id, socket, 1)
+        ws_tables._table_conns.pop(table_id)
+        ws_tables._event_logs.pop(table_id)
+        await engine.dispose()
+        return json.loads(socket.sent[0])["payload"]
+
+    state = asyncio.run(_run())
+    assert [p["username"] for p in state["players"]] == ["ann"]  # type: ignore[index]
+    assert [s["username"] for s in state["spectators"]] == ["bob"]  # type: ignore[index]
+    assert directory.metrics.misses == 2
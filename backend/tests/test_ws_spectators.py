@@ -0,0 +1,103 @@
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.rest.main import app
+from backend.services.table_store import TableStore
+from backend.ws_api import tables as ws_tables
+
+
+class _FakeSocket:
+    def __init__(self) -> None:
+        self.sent: list[str] = []
+
+    async def send_text(self, text: str) -> None:
+        self.sent.append(text)
+
+
+def test_spectators_get_shared_throttled_frames(monkeypatch: pytest.MonkeyPatch) -> None:
+    store = TableStore(id_factory=lambda: 41)
+    monkeypatch.setattr(ws_tables, "table_store", store)
+    monkeypatch.setattr(ws_tables, "SPECTATOR_MIN_INTERVAL", 0.05)
+    table_id, record = store.create(max_players=6, buy_in=1000, private=False)
+    table = record.table
+    table.seat_player(1, 1000)
+    table.seat_player(2, 1000, is_spectator=True)
+
+    player, watchers = _FakeSocket(), [_FakeSocket() for _ in range(3)]
+    conns = {player: ws_tables._Conn(websocket=player, user_id=1)}  # type: ignore[dict-item]
+    for user_id, socket in enumerate(watchers, start=2):
+        conns[socket] = ws_tables._Conn(websocket=socket, user_id=user_id)  # type: ignore[index]
+    monkeypatch.setitem(ws_tables._table_conns, table_id, conns)  # type: ignore[arg-type]
+
+    async def _run() -> None:
+        await ws_tables._broadcast_state(table_id)
+        await asyncio.sleep(0)
+        for _ in range(4):
+            await ws_tables._broadcast_state(table_id)
+        feed = ws_tables._spectator_feeds[table_id]
+        # A new street arrives while an update of the previous one is still pending.
+        await ws_tables._broadcast_state(table_id)
+        feed.phase = "flop"
+        await ws_tables._broadcast_state(table_id)
+        assert feed.task is not None
+        await feed.task
+        ws_tables._drop_spectator_feed(table_id)
+
+    before = ws_tables.spectator_feed_metrics.snapshot()
+    asyncio.run(_run())
+    after = ws_tables.spectator_feed_metrics.snapshot()
+
+    assert len(player.sent) == 7
+    # First update goes out at once, the rest coalesce; the pre-flop final state is not lost.
+    assert len(watchers[0].sent) == 3
+    assert all(socket.sent == watchers[0].sent for socket in watchers)
+    assert [json.loads(text)["type"] for text in watchers[0].sent] == ["table_state"] * 3
+    assert after["street_flushes"] - before["street_flushes"] == 1
+    assert after["deliveries"] - before["deliveries"] == 9
+
+
+def test_sse_watchers_share_the_public_frame(monkeypatch: pytest.MonkeyPatch) -> None:
+    store = TableStore(id_factory=iter([51, 52]).__next__)
+    monkeypatch.setattr(ws_tables, "table_store", store)
+    monkeypatch.setattr(ws_tables, "SPECTATOR_MIN_INTERVAL", 0.0)
+    table_id, record = store.create(max_players=6, buy_in=1000, private=False)
+    private_id, _ = store.create(max_players=6, buy_in=1000, private=True)
+    record.table.seat_player(1, 1000)
+    assert ws_tables.subscribe_public_state(private_id) is None
+
+    async def _run() -> list[bytes | None]:
+        first = ws_tables.subscribe_public_state(table_id)
+        second = ws_tables.subscribe_public_state(table_id)
+        assert first is not None and second is not None
+        frames = [first.get_nowait(), second.get_nowait()]
+        record.table.seat_player(2, 1000)
+        await ws_tables._broadcast_state(table_id)
+        feed = ws_tables._spectator_feeds[table_id]
+        assert feed.task is not None
+        await feed.task
+        frames += [first.get_nowait(), second.get_nowait()]
+        store.delete(table_id)
+        await ws_tables._broadcast_state(table_id)
+        frames.append(first.get_nowait())
+        ws_tables.unsubscribe_public_state(table_id, first)
+        ws_tables.unsubscribe_public_state(table_id, second)
+        return frames
+
+    initial, initial_2, update, update_2, closed = asyncio.run(_run())
+    assert initial == initial_2 and update is update_2 and closed is None
+    assert initial is not None and update is not None
+    assert initial.startswith(b"event: table_state\ndata: ") and initial.endswith(b"\n\n")
+    state = json.loads(update.split(b"data: ", 1)[1])["payload"]
+    assert [p["user_id"] for p in state["players"]] == [1, 2]
+    assert table_id not in ws_tables._public_streams and table_id not in ws_tables._spectator_feeds
+
+
+def test_sse_endpoint_needs_no_token_and_hides_unknown_tables() -> None:
+    client = TestClient(app)
+    res = client.get("/api/sse/tables/987654")
+    assert res.status_code == 404
+    assert res.json()["detail"]["code"] == "table_not_found"
+
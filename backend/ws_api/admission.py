@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import json
+import time
+from collections.abc import Callable, Collection
+from dataclasses import dataclass, field
+from typing import Any, NoReturn
+
+from backend.poker_engine.player_state import PlayerAction
+from backend.rest.core.config import settings
+
+_ACTIONS = frozenset(action.value for action in PlayerAction)
+
+
+class MessageRejected(Exception):
+    """An inbound frame that is dropped before it reaches a table.
+
+    ``notify`` is False for repeated rate-limit drops so a flooding client is told once per
+    streak instead of getting one error frame back per message.
+    """
+
+    def __init__(self, code: str, message: str, *, table_id: int | None = None, notify: bool = True) -> None:
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.table_id = table_id
+        self.notify = notify
+
+
+@dataclass(slots=True)
+class TokenBucket:
+    """Refills ``rate`` tokens per second up to ``burst``; each admitted message takes one."""
+
+    rate: float
+    burst: float
+    updated: float
+    tokens: float = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.tokens = self.burst
+
+    def allow(self, now: float) -> bool:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+@dataclass(slots=True)
+class AdmissionMetrics:
+    admitted: int = 0
+    dropped: dict[str, int] = field(default_factory=dict)
+
+    def drop(self, code: str) -> None:
+        self.dropped[code] = self.dropped.get(code, 0) + 1
+
+    def snapshot(self) -> dict[str, Any]:
+        return {"admitted": self.admitted, "dropped": dict(self.dropped)}
+
+
+admission_metrics = AdmissionMetrics()
+
+
+def _optional_int(value: Any) -> bool:
+    return value is None or (isinstance(value, int) and not isinstance(value, bool))
+
+
+class InboundLimiter:
+    """Per-connection admission control for inbound WebSocket frames.
+
+    Everything here runs before the table lock: a token bucket for all messages and a
+    stricter one for ``toggle_show_all``, a size cap, JSON decoding and a shape check of
+    the message type and payload.
+    """
+
+    def __init__(self, allowed_types: Collection[str], *, clock: Callable[[], float] = time.monotonic) -> None:
+        self._allowed_types = allowed_types
+        self._clock = clock
+        now = clock()
+        self._messages = TokenBucket(settings.ws_messages_per_second, settings.ws_message_burst, now)
+        self._toggles = TokenBucket(settings.ws_show_all_toggles_per_second, settings.ws_show_all_toggle_burst, now)
+        self._throttled = False
+
+    def admit(self, raw: str) -> dict[str, Any]:
+        """Return the decoded message or raise ``MessageRejected``."""
+        now = self._clock()
+        if not self._messages.allow(now):
+            self._reject_rate_limited()
+        if len(raw.encode()) > settings.ws_max_message_bytes:
+            self._reject("message_too_large", "Message is too large")
+        try:
+            msg = json.loads(raw)
+        except json.JSONDecodeError:
+            self._reject("invalid_json", "Invalid JSON")
+        if not isinstance(msg, dict):
+            self._reject("invalid_message", "Message must be an object")
+
+        table_id = msg.get("table_id")
+        if not _optional_int(table_id):
+            self._reject("invalid_table_id", "Invalid table_id")
+        msg_type = msg.get("type")
+        if msg_type not in self._allowed_types:
+            self._reject("unknown_message_type", "Unknown message type", table_id)
+        payload = msg.get("payload")
+        if payload is None:
+            payload = msg["payload"] = {}
+        if not isinstance(payload, dict):
+            self._reject("invalid_payload", "Payload must be an object", table_id)
+
+        if msg_type == "player_action":
+            action = payload.get("action")
+            if not isinstance(action, str):
+                self._reject("missing_action", "Missing action", table_id)
+            if action not in _ACTIONS:
+                self._reject("invalid_action", "Invalid action", table_id)
+            amount = payload.get("amount")
+            if not _optional_int(amount) or (amount is not None and amount < 0):
+                self._reject("invalid_amount", "Amount must be a non-negative integer", table_id)
+        elif msg_type == "toggle_show_all":
+            if not isinstance(payload.get("show", False), bool):
+                self._reject("invalid_payload", "show must be a boolean", table_id)
+            if not self._toggles.allow(now):
+                self._reject_rate_limited(table_id)
+
+        self._throttled = False
+        admission_metrics.admitted += 1
+        return msg
+
+    def _reject(self, code: str, message: str, table_id: int | None = None) -> NoReturn:
+        admission_metrics.drop(code)
+        raise MessageRejected(code, message, table_id=table_id)
+
+    def _reject_rate_limited(self, table_id: int | None = None) -> NoReturn:
+        admission_metrics.drop("rate_limited")
+        notify, self._throttled = not self._throttled, True
+        raise MessageRejected("rate_limited", "Too many messages", table_id=table_id, notify=notify)
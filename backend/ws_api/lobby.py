@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from dataclasses import dataclass, field
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+
+from backend.services.table_store import LobbyEvent, table_store
+
+router = APIRouter(tags=["ws"])
+
+LOBBY_QUEUE_SIZE = 256
+
+
+@dataclass(slots=True, eq=False)
+class _LobbyWatcher:
+    websocket: WebSocket
+    queue: asyncio.Queue[str] = field(default_factory=lambda: asyncio.Queue(maxsize=LOBBY_QUEUE_SIZE))
+    resync: bool = False
+
+
+_watchers: set[_LobbyWatcher] = set()
+
+
+def _snapshot_frame() -> str:
+    snapshot = table_store.lobby_snapshot()
+    return f'{{"type":"lobby_snapshot","version":{snapshot.version},"payload":{snapshot.body.decode()}}}'
+
+
+def _event_frame(event: LobbyEvent) -> str:
+    if event.summary is not None and event.kind != "table_removed":
+        payload = event.summary.model_dump_json()
+    else:
+        payload = json.dumps({"id": str(event.table_id)})
+    return f'{{"type":"{event.kind}","version":{event.version},"payload":{payload}}}'
+
+
+def _publish(event: LobbyEvent) -> None:
+    """Encode the event once and queue it for every lobby watcher.
+
+    A watcher that falls ``LOBBY_QUEUE_SIZE`` events behind is switched to a full resync
+    instead of buffering without bound.
+    """
+    if not _watchers:
+        return
+    frame = _event_frame(event)
+    for watcher in _watchers:
+        if watcher.resync:
+            continue
+        try:
+            watcher.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            watcher.resync = True
+
+
+table_store.add_listener(_publish)
+
+
+async def _pump(watcher: _LobbyWatcher) -> None:
+    try:
+        await watcher.websocket.send_text(_snapshot_frame())
+        while True:
+            frame = await watcher.queue.get()
+            if watcher.resync:
+                while not watcher.queue.empty():
+                    watcher.queue.get_nowait()
+                watcher.resync = False
+                frame = _snapshot_frame()
+            await watcher.websocket.send_text(frame)
+    except (WebSocketDisconnect, RuntimeError):
+        _watchers.discard(watcher)
+
+
+@router.websocket("/ws/lobby")
+async def lobby_ws(websocket: WebSocket) -> None:
+    await websocket.accept()
+
+    if getattr(websocket.state, "user_id", None) is None:
+        if websocket.query_params.get("token"):
+            error = {"type": "error", "code": "invalid_token", "message": "Invalid token"}
+        else:
+            error = {"type": "error", "code": "missing_token", "message": "Missing token"}
+        await websocket.send_text(json.dumps(error))
+        await websocket.close(code=1008)
+        return
+
+    watcher = _LobbyWatcher(websocket=websocket)
+    _watchers.add(watcher)
+    pump = asyncio.create_task(_pump(watcher))
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        _watchers.discard(watcher)
+        pump.cancel()
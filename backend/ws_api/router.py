@@ -1,6 +1,8 @@
 from fastapi import APIRouter
 
+from .lobby import router as lobby_router
 from .tables import router as tables_router
 
 router = APIRouter()
 router.include_router(tables_router)
+router.include_router(lobby_router)
@@ -2,53 +2,175 @@ from __future__ import annotations
 
 import asyncio
 import json
-from dataclasses import dataclass
-from typing import Any
+import logging
+import time
+from collections import deque
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Any, Protocol
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
 from backend.auth.jwt_tokens import decode_access_token
-from backend.database.session import SessionLocal
-from backend.models.user import User
+from backend.database.session import ReadSessionLocal, SessionLocal
 from backend.poker_engine.game_state import PlayerAction
 from backend.poker_engine.player_state import PlayerStatus
+from backend.rest.core.config import settings
+from backend.services.chip_ledger import chip_ledger
 from backend.services.game_service import GameService
-from backend.services.table_store import table_store
+from backend.services.hand_spool import hand_spool
+from backend.services.table_store import TableRecord, table_store
+from backend.services.user_directory import user_directory
+from backend.ws_api.admission import InboundLimiter, MessageRejected
+
+logger = logging.getLogger("hsepoker.ws")
 
 router = APIRouter(tags=["ws"])
 
-_game_service = GameService()
+_game_service = GameService(spool=hand_spool)
+
+
+def _ws_error(code: str, message: str, table_id: int | None = None) -> dict[str, Any]:
+    error: dict[str, Any] = {"type": "error", "code": code, "message": message}
+    if table_id is not None:
+        error["table_id"] = table_id
+    return error
 
 
-def _ws_error(code: str, message: str) -> dict[str, Any]:
-    return {"type": "error", "code": code, "message": message}
+class _TextSender(Protocol):
+    async def send_text(self, data: str) -> None: ...
 
 
 @dataclass(slots=True)
 class _Conn:
-    websocket: WebSocket
+    """One socket's membership in one table; ``websocket`` is the socket or its shared outbox."""
+
+    websocket: _TextSender
     user_id: int
     show_all: bool = False
 
 
-_table_conns: dict[int, dict[WebSocket, _Conn]] = {}
+_table_conns: dict[int, dict[_TextSender, _Conn]] = {}
 _table_locks: dict[int, asyncio.Lock] = {}
-_pending_leave_tasks: dict[tuple[int, int], asyncio.Task[None]] = {}
+# Disconnected users by table, with the monotonic time their reconnect grace ends. One sweep
+# task per table cashes out everyone whose grace has expired with a single ledger write.
+_pending_leaves: dict[int, dict[int, float]] = {}
+_leave_sweeps: dict[int, asyncio.Task[None]] = {}
 _pending_next_hand_tasks: dict[int, asyncio.Task[None]] = {}
 
+TABLE_MESSAGE_TYPES = frozenset({"player_action", "toggle_show_all"})
+MULTIPLEX_MESSAGE_TYPES = TABLE_MESSAGE_TYPES | {"subscribe", "unsubscribe"}
+
 LEAVE_GRACE_SECONDS = 60
+LEAVE_RETRY_SECONDS = 5
 NEXT_HAND_DELAY_SECONDS = 5
+SPECTATOR_MIN_INTERVAL = 1.0 / settings.ws_spectator_updates_per_second
+
+
+@dataclass(slots=True)
+class _SpectatorFeed:
+    """Pending spectator frames of one table, keyed by ``show_all``.
+
+    ``frames`` is the newest unsent update; when the phase moves on before it went out it is
+    queued in ``street_finals`` instead of being overwritten, so every street's final state
+    reaches spectators.
+    """
+
+    frames: dict[bool, str] | None = None
+    phase: str | None = None
+    street_finals: list[dict[bool, str]] = field(default_factory=list)
+    last_sent: float = float("-inf")
+    task: asyncio.Task[None] | None = None
+    public_frame: bytes | None = None
 
 
-async def _credit_balance(user_id: int, amount: int) -> None:
-    if amount <= 0:
+@dataclass(slots=True)
+class SpectatorFeedMetrics:
+    published: int = 0
+    coalesced: int = 0
+    street_flushes: int = 0
+    frames_sent: int = 0
+    deliveries: int = 0
+    sse_streams: int = 0
+    sse_deliveries: int = 0
+    sse_dropped: int = 0
+
+    def snapshot(self) -> dict[str, int]:
+        return {
+            "published": self.published,
+            "coalesced": self.coalesced,
+            "street_flushes": self.street_flushes,
+            "frames_sent": self.frames_sent,
+            "deliveries": self.deliveries,
+            "sse_streams": self.sse_streams,
+            "sse_deliveries": self.sse_deliveries,
+            "sse_dropped": self.sse_dropped,
+        }
+
+
+class _EventLog:
+    """Sequence counter and the most recent public ``table_state`` frames of one table.
+
+    Every broadcast gets the next ``seq``; a reconnecting client that reports the last seq
+    it saw is replayed just the frames it missed, as long as they are still in the ring.
+    """
+
+    __slots__ = ("seq", "_events")
+
+    def __init__(self, size: int) -> None:
+        self.seq = 0
+        self._events: deque[tuple[int, str]] = deque(maxlen=size)
+
+    def record(self, text_for_seq: Callable[[int], str]) -> str:
+        self.seq += 1
+        text = text_for_seq(self.seq)
+        self._events.append((self.seq, text))
+        return text
+
+    def skip(self) -> None:
+        """Advance past a change nobody saw; older frames can no longer be replayed gaplessly."""
+        self.seq += 1
+        self._events.clear()
+
+    def since(self, last_seq: int) -> list[str] | None:
+        """Frames after ``last_seq``, or ``None`` if that point is unknown or already evicted."""
+        if last_seq > self.seq or last_seq < 0:
+            return None
+        if last_seq == self.seq:
+            return []
+        if not self._events or self._events[0][0] > last_seq + 1:
+            return None
+        return [text for seq, text in self._events if seq > last_seq]
+
+
+@dataclass(slots=True)
+class ResumeMetrics:
+    resumes: int = 0
+    replayed_events: int = 0
+    snapshot_fallbacks: int = 0
+
+    def snapshot(self) -> dict[str, int]:
+        return {
+            "resumes": self.resumes,
+            "replayed_events": self.replayed_events,
+            "snapshot_fallbacks": self.snapshot_fallbacks,
+        }
+
+
+_event_logs: dict[int, _EventLog] = {}
+resume_metrics = ResumeMetrics()
+_spectator_feeds: dict[int, _SpectatorFeed] = {}
+# Read-only SSE watchers per table: each gets the public (no hole cards) spectator frame,
+# already framed as an SSE event; ``None`` tells the stream the table is gone.
+_public_streams: dict[int, set[asyncio.Queue[bytes | None]]] = {}
+spectator_feed_metrics = SpectatorFeedMetrics()
+
+
+async def _cash_out(table_id: int, credits: dict[int, int]) -> None:
+    if not credits:
         return
     async with SessionLocal() as session:
-        user = await session.get(User, user_id)
-        if user is None:
-            return
-        user.balance = int(user.balance) + int(amount)
-        await session.commit()
+        await chip_ledger.credit_many(session, credits, table_id=table_id)
 
 
 def _get_lock(table_id: int) -> asyncio.Lock:
@@ -59,7 +181,7 @@ def _get_lock(table_id: int) -> asyncio.Lock:
     return lock
 
 
-def _build_table_state(table_id: int, *, viewer_id: int, show_all: bool) -> dict[str, Any]:
+def _build_table_state(table_id: int, *, viewer_id: int | None, show_all: bool) -> dict[str, Any]:
     record = table_store.get(table_id)
     if record is None:
         raise KeyError("table_not_found")
@@ -112,8 +234,9 @@ def _build_table_state(table_id: int, *, viewer_id: int, show_all: bool) -> dict
             hole_cards = list(s.get("hole_cards") or [])
             if not (reveal_all or uid == viewer_id):
                 hole_cards = []
-            player_entry = {
+            player_entry: dict[str, Any] = {
                 "user_id": uid,
+                "username": user_directory.username(uid),
                 "position": int(s.get("position", 0)),
                 "stack": int(s.get("stack", 0)),
                 "bet": int(s.get("bet", 0)),
@@ -130,6 +253,7 @@ def _build_table_state(table_id: int, *, viewer_id: int, show_all: bool) -> dict
 
             player_entry = {
                 "user_id": int(p.user_id),
+                "username": user_directory.username(int(p.user_id)),
                 "position": int(p.position),
                 "stack": int(p.stack),
                 "bet": int(getattr(p, "bet", 0)),
@@ -146,6 +270,10 @@ def _build_table_state(table_id: int, *, viewer_id: int, show_all: bool) -> dict
         "pot": pot,
         "board": board,
         "players": players,
+        "spectators": [
+            {"user_id": int(s.user_id), "username": user_directory.username(int(s.user_id))}
+            for s in table.public_spectators()
+        ],
         "winners": winners,
         "best_hand_rank": best_hand_rank,
         "best_hand_cards": best_hand_cards,
@@ -156,8 +284,12 @@ def _build_table_state(table_id: int, *, viewer_id: int, show_all: bool) -> dict
 
 
 async def _try_send(conn: _Conn, message: dict[str, Any]) -> bool:
+    return await _try_send_text(conn, json.dumps(message))
+
+
+async def _try_send_text(conn: _Conn, text: str) -> bool:
     try:
-        await conn.websocket.send_text(json.dumps(message))
+        await conn.websocket.send_text(text)
         return True
     except (WebSocketDisconnect, RuntimeError):
         return False
@@ -170,8 +302,8 @@ async def _broadcast_error(table_id: int, code: str, message: str) -> None:
     if not conns_map:
         return
     conns = list(conns_map.values())
-    dead_sockets: list[WebSocket] = []
-    payload = _ws_error(code, message)
+    dead_sockets: list[_TextSender] = []
+    payload = _ws_error(code, message, table_id)
     for conn in conns:
         ok = await _try_send(conn, payload)
         if not ok:
@@ -181,15 +313,22 @@ async def _broadcast_error(table_id: int, code: str, message: str) -> None:
 
 
 async def _broadcast_state(table_id: int) -> None:
-    conns_map = _table_conns.get(table_id)
-    if not conns_map:
+    conns_map = _table_conns.get(table_id, {})
+    streams = _public_streams.get(table_id)
+    log = _event_logs.get(table_id)
+    if not conns_map and not streams:
+        if log is not None:
+            log.skip()
         return
     conns = list(conns_map.values())
-    dead_sockets: list[WebSocket] = []
+    dead_sockets: list[_TextSender] = []
 
     record = table_store.get(table_id)
     if record is None:
-        message = _ws_error("table_not_found", "Table not found")
+        _event_logs.pop(table_id, None)
+        for queue in streams or ():
+            _offer(queue, None)
+        message = _ws_error("table_not_found", "Table not found", table_id)
         for conn in conns:
             ok = await _try_send(conn, message)
             if not ok:
@@ -198,54 +337,252 @@ async def _broadcast_state(table_id: int) -> None:
             conns_map.pop(ws, None)
         return
 
+    public: str | None = None
+    if log is not None:
+        public = log.record(lambda seq: _encode_state(table_id, viewer_id=None, show_all=False, seq=seq))
+
+    # Seated players get their own view (their hole cards) right away; everyone else is in
+    # the spectator tier and is served shared, throttled frames from a background task.
+    table = record.table
+    spectators: list[_Conn] = []
     for conn in conns:
-        try:
-            state = _build_table_state(table_id, viewer_id=conn.user_id, show_all=conn.show_all)
-            ok = await _try_send(conn, {"type": "table_state", "payload": state})
-            if not ok:
-                dead_sockets.append(conn.websocket)
-        except Exception as exc:
-            ok = await _try_send(conn, _ws_error("broadcast_failed", str(exc)))
-            if not ok:
-                dead_sockets.append(conn.websocket)
+        if not table.is_seated(conn.user_id):
+            spectators.append(conn)
+            continue
+        if not await _send_state(conn, table_id):
+            dead_sockets.append(conn.websocket)
 
     for ws in dead_sockets:
         conns_map.pop(ws, None)
 
+    if spectators or streams:
+        frames = {False: public or _encode_state(table_id, viewer_id=None, show_all=False)}
+        if any(conn.show_all for conn in spectators):
+            frames[True] = _encode_state(table_id, viewer_id=None, show_all=True)
+        phase = table.game_state.phase.value if table.game_state is not None else None
+        _publish_spectator_frames(table_id, frames, phase)
+
+
+def _encode_state(table_id: int, *, viewer_id: int | None, show_all: bool, seq: int | None = None) -> str:
+    state = _build_table_state(table_id, viewer_id=viewer_id, show_all=show_all)
+    if seq is None:
+        log = _event_logs.get(table_id)
+        seq = log.seq if log is not None else 0
+    return json.dumps({"type": "table_state", "table_id": table_id, "seq": seq, "payload": state})
+
+
+async def _send_state(conn: _Conn, table_id: int) -> bool:
+    try:
+        text = _encode_state(table_id, viewer_id=conn.user_id, show_all=conn.show_all)
+    except Exception as exc:
+        return await _try_send(conn, _ws_error("broadcast_failed", str(exc), table_id))
+    return await _try_send_text(conn, text)
+
+
+def _publish_spectator_frames(table_id: int, frames: dict[bool, str], phase: str | None) -> None:
+    feed = _spectator_feeds.get(table_id)
+    if feed is None:
+        feed = _spectator_feeds[table_id] = _SpectatorFeed()
+    spectator_feed_metrics.published += 1
+    if feed.frames is not None:
+        if feed.phase != phase:
+            feed.street_finals.append(feed.frames)
+            spectator_feed_metrics.street_flushes += 1
+        else:
+            spectator_feed_metrics.coalesced += 1
+    feed.frames, feed.phase = frames, phase
+    if feed.task is None or feed.task.done():
+        feed.task = asyncio.create_task(_run_spectator_feed(table_id, feed))
+
+
+async def _run_spectator_feed(table_id: int, feed: _SpectatorFeed) -> None:
+    """Send queued street finals at once, then the newest frame at most every ``SPECTATOR_MIN_INTERVAL``."""
+    loop = asyncio.get_running_loop()
+    while feed.street_finals or feed.frames is not None:
+        if feed.street_finals:
+            await _fan_out_to_spectators(table_id, feed.street_finals.pop(0))
+            feed.last_sent = loop.time()
+            continue
+        delay = feed.last_sent + SPECTATOR_MIN_INTERVAL - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+            continue
+        frames, feed.frames = feed.frames, None
+        if frames is not None:
+            await _fan_out_to_spectators(table_id, frames)
+            feed.last_sent = loop.time()
+
+
+async def _fan_out_to_spectators(table_id: int, frames: dict[bool, str]) -> None:
+    record = table_store.get(table_id)
+    if record is None:
+        return
+    _push_public_frame(table_id, frames[False])
+    conns_map = _table_conns.get(table_id)
+    if not conns_map:
+        return
+    table = record.table
+    targets = [conn for conn in conns_map.values() if not table.is_seated(conn.user_id)]
+    results = await asyncio.gather(
+        *(_try_send_text(conn, frames.get(conn.show_all, frames[False])) for conn in targets)
+    )
+    spectator_feed_metrics.frames_sent += 1
+    spectator_feed_metrics.deliveries += len(targets)
+    for conn, ok in zip(targets, results):
+        if not ok:
+            conns_map.pop(conn.websocket, None)
+
+
+def _sse_event(text: str) -> bytes:
+    return f"event: table_state\ndata: {text}\n\n".encode()
+
+
+def _offer(queue: asyncio.Queue[bytes | None], frame: bytes | None) -> None:
+    """Queue ``frame`` for one SSE watcher, dropping its oldest frame if it is not keeping up."""
+    if queue.full():
+        queue.get_nowait()
+        spectator_feed_metrics.sse_dropped += 1
+    queue.put_nowait(frame)
+
+
+def _push_public_frame(table_id: int, text: str) -> None:
+    frame = _sse_event(text)
+    feed = _spectator_feeds.get(table_id)
+    if feed is not None:
+        feed.public_frame = frame
+    streams = _public_streams.get(table_id)
+    if not streams:
+        return
+    for queue in streams:
+        _offer(queue, frame)
+    spectator_feed_metrics.sse_deliveries += len(streams)
+
+
+def subscribe_public_state(table_id: int) -> asyncio.Queue[bytes | None] | None:
+    """Register an SSE watcher of a public table; ``None`` if there is no such table.
+
+    The queue starts with the current public state and then receives the same throttled
+    frames as WebSocket spectators.
+    """
+    record = table_store.get(table_id)
+    if record is None or record.private:
+        return None
+    feed = _spectator_feeds.get(table_id)
+    frame = feed.public_frame if feed is not None else None
+    if frame is None:
+        frame = _sse_event(_encode_state(table_id, viewer_id=None, show_all=False))
+    queue: asyncio.Queue[bytes | None] = asyncio.Queue(maxsize=settings.sse_queue_frames)
+    queue.put_nowait(frame)
+    _public_streams.setdefault(table_id, set()).add(queue)
+    spectator_feed_metrics.sse_streams += 1
+    return queue
+
+
+def unsubscribe_public_state(table_id: int, queue: asyncio.Queue[bytes | None]) -> None:
+    streams = _public_streams.get(table_id)
+    if streams is None or queue not in streams:
+        return
+    streams.discard(queue)
+    spectator_feed_metrics.sse_streams -= 1
+    if not streams:
+        _public_streams.pop(table_id, None)
+        if table_id not in _table_conns:
+            _drop_spectator_feed(table_id)
+
+
+def _drop_spectator_feed(table_id: int) -> None:
+    feed = _spectator_feeds.pop(table_id, None)
+    if feed is not None and feed.task is not None and not feed.task.done():
+        feed.task.cancel()
+
 
 def _cancel_pending_leave(table_id: int, user_id: int) -> None:
-    task = _pending_leave_tasks.pop((table_id, user_id), None)
-    if task is not None and not task.done():
-        task.cancel()
+    pending = _pending_leaves.get(table_id)
+    if pending is not None:
+        pending.pop(user_id, None)
 
 
 def _schedule_delayed_leave(table_id: int, user_id: int) -> None:
-    if (table_id, user_id) in _pending_leave_tasks:
+    pending = _pending_leaves.setdefault(table_id, {})
+    if user_id in pending:
         return
+    pending[user_id] = time.monotonic() + LEAVE_GRACE_SECONDS
+    if table_id not in _leave_sweeps:
+        _leave_sweeps[table_id] = asyncio.create_task(_sweep_leaves(table_id))
 
-    async def _leave_later() -> None:
+
+async def _sweep_leaves(table_id: int) -> None:
+    try:
+        while pending := _pending_leaves.get(table_id):
+            await asyncio.sleep(max(0.0, min(pending.values()) - time.monotonic()))
+            async with _get_lock(table_id):
+                await _expire_leaves(table_id)
+    finally:
+        _leave_sweeps.pop(table_id, None)
+
+
+async def _expire_leaves(table_id: int) -> None:
+    """Cash out, in one batch, everyone at the table whose grace expired and who did not reconnect."""
+    pending = _pending_leaves.get(table_id, {})
+    now = time.monotonic()
+    expired = [user_id for user_id, deadline in pending.items() if deadline <= now]
+    for user_id in expired:
+        del pending[user_id]
+    if not pending:
+        _pending_leaves.pop(table_id, None)
+    if not expired:
+        return
+
+    record = table_store.get(table_id)
+    if record is not None:
+        connected = {c.user_id for c in (_table_conns.get(table_id) or {}).values()}
+        leaving = [user_id for user_id in expired if user_id not in connected]
+        # Credit before the seats go: if the write fails, the chips are still on the table
+        # and the users are retried later. The table lock keeps the stacks unchanged meanwhile.
+        credits: dict[int, int] = {}
+        for user_id in leaving:
+            player = record.table.get_player(user_id)
+            if player is not None and player.stack > 0:
+                credits[user_id] = int(player.stack)
         try:
-            await asyncio.sleep(LEAVE_GRACE_SECONDS)
-            lock = _get_lock(table_id)
-            async with lock:
-                conns_map = _table_conns.get(table_id) or {}
-                still_connected = any(c.user_id == user_id for c in conns_map.values())
-                if still_connected:
-                    return
+            await _cash_out(table_id, credits)
+        except Exception:
+            logger.exception("cashout of %s at table %s failed, retrying", sorted(credits), table_id)
+            retry_at = time.monotonic() + LEAVE_RETRY_SECONDS
+            _pending_leaves.setdefault(table_id, {}).update(dict.fromkeys(leaving, retry_at))
+            return
+        for user_id in leaving:
+            record.table.leave(user_id)
+        table_store.delete_if_empty(table_id)
+    await _broadcast_state(table_id)
 
-                record = table_store.get(table_id)
-                if record is not None:
-                    try:
-                        cashout = record.table.leave(user_id)
-                        await _credit_balance(user_id, cashout)
-                    except Exception:
-                        pass
-                    table_store.delete_if_empty(table_id)
-                await _broadcast_state(table_id)
-        finally:
-            _pending_leave_tasks.pop((table_id, user_id), None)
 
-    _pending_leave_tasks[(table_id, user_id)] = asyncio.create_task(_leave_later())
+def table_members(record: TableRecord) -> list[int]:
+    """User ids of everyone seated or watching at the table."""
+    return [p.user_id for p in record.table.players] + list(record.table.spectators)
+
+
+def schedule_reconnect_grace(records: Iterable[TableRecord]) -> None:
+    """Give everyone at restored tables the usual grace period to reconnect before they are cashed out."""
+    for record in records:
+        for user_id in table_members(record):
+            _schedule_delayed_leave(record.table.table_id, user_id)
+
+
+async def resolve_usernames(user_ids: Iterable[int]) -> None:
+    """Load the names the directory lacks, in one query, so state broadcasts carry them.
+
+    The directory is filled by REST joins; after a restart, a restore or an eviction it
+    would otherwise broadcast ``"username": null`` until the user joins again.
+    """
+    missing = [user_id for user_id in dict.fromkeys(user_ids) if user_directory.username(user_id) is None]
+    if not missing:
+        return
+    try:
+        async with ReadSessionLocal() as session:
+            await user_directory.resolve(session, missing)
+    except Exception:
+        logger.exception("resolving usernames %s failed", missing)
 
 
 def _cancel_pending_next_hand(table_id: int) -> None:
@@ -324,146 +661,317 @@ async def maybe_start_game(table_id: int) -> bool:
         return True
 
 
-@router.websocket("/ws/tables/{table_id}")
-async def table_ws(websocket: WebSocket, table_id: str) -> None:
-    await websocket.accept()
+@dataclass(slots=True)
+class MultiplexMetrics:
+    connections: int = 0
+    subscriptions: int = 0
+    overflows: int = 0
+
+    def snapshot(self) -> dict[str, int]:
+        return {
+            "connections": self.connections,
+            "subscriptions": self.subscriptions,
+            "overflows": self.overflows,
+        }
+
+
+multiplex_metrics = MultiplexMetrics()
+
+
+class _Outbox:
+    """Outbound queue of one multiplexed socket, shared by every table it is subscribed to.
+
+    A single writer task sends frames in order, so a table broadcast only enqueues. A client
+    that falls ``max_frames`` behind is disconnected (close code 1013) instead of buffering
+    without bound.
+    """
+
+    def __init__(self, websocket: WebSocket, max_frames: int) -> None:
+        self.websocket = websocket
+        self.closed = False
+        self._queue: asyncio.Queue[str | None] = asyncio.Queue(maxsize=max_frames + 1)
+        self._max_frames = max_frames
+        self._writer = asyncio.create_task(self._drain())
+
+    async def send_text(self, data: str) -> None:
+        if self.closed:
+            raise RuntimeError("socket is closed")
+        if self._queue.qsize() >= self._max_frames:
+            self.closed = True
+            multiplex_metrics.overflows += 1
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(None)
+            raise RuntimeError("socket outbox overflow")
+        self._queue.put_nowait(data)
+
+    async def _drain(self) -> None:
+        try:
+            while (text := await self._queue.get()) is not None:
+                await self.websocket.send_text(text)
+            await self.websocket.close(code=1013)
+        except Exception:
+            pass
+        finally:
+            self.closed = True
 
+    def close(self) -> None:
+        self.closed = True
+        self._writer.cancel()
+
+
+async def _send_json(sender: _TextSender, message: dict[str, Any]) -> None:
+    await sender.send_text(json.dumps(message))
+
+
+async def _authenticate(websocket: WebSocket) -> int | None:
+    """Resolve the socket's user (set by the auth middleware or ``?token=``); reject it if unknown."""
+    user_id = getattr(websocket.state, "user_id", None)
+    if user_id is not None:
+        return int(user_id)
     token = websocket.query_params.get("token")
     if not token:
-        await websocket.send_text(json.dumps(_ws_error("missing_token", "Missing token")))
+        await _send_json(websocket, _ws_error("missing_token", "Missing token"))
         await websocket.close(code=1008)
-        return
-
+        return None
     try:
-        user_id = decode_access_token(token)
+        return decode_access_token(token)
     except Exception:
-        await websocket.send_text(json.dumps(_ws_error("invalid_token", "Invalid token")))
+        await _send_json(websocket, _ws_error("invalid_token", "Invalid token"))
         await websocket.close(code=1008)
+        return None
+
+
+async def _attach(table_id: int, sender: _TextSender, user_id: int, last_seq: int | None = None) -> _Conn:
+    """Join ``sender`` to the table and bring it up to date, privately.
+
+    With ``last_seq`` only the frames broadcast since then are replayed (nothing if it is
+    current); otherwise, or when they are no longer buffered, it gets one full snapshot.
+    The connection only receives broadcasts once that is sent, all under the table lock,
+    so no frame arrives twice or ahead of the replay.
+    """
+    conn = _Conn(websocket=sender, user_id=user_id)
+    record = table_store.get(table_id)
+    await resolve_usernames([user_id] + (table_members(record) if record is not None else []))
+    async with _get_lock(table_id):
+        log = _event_logs.get(table_id)
+        if log is None:
+            log = _event_logs[table_id] = _EventLog(settings.ws_resume_events)
+        missed = log.since(last_seq) if last_seq is not None else None
+        if missed is None:
+            if last_seq is not None:
+                resume_metrics.snapshot_fallbacks += 1
+            await _send_state(conn, table_id)
+        else:
+            resume_metrics.resumes += 1
+            resume_metrics.replayed_events += len(missed)
+            record = table_store.get(table_id)
+            if missed and record is not None and record.table.is_seated(user_id):
+                # Buffered frames are the public view; the newest one is re-sent with the hole cards.
+                missed.pop()
+                missed.append(_encode_state(table_id, viewer_id=user_id, show_all=False))
+            for text in missed:
+                await _try_send_text(conn, text)
+        _table_conns.setdefault(table_id, {})[sender] = conn
+        _cancel_pending_leave(table_id, user_id)
+    return conn
+
+
+async def _detach(table_id: int, conn: _Conn) -> None:
+    async with _get_lock(table_id):
+        conns_map = _table_conns.get(table_id)
+        if conns_map is not None:
+            conns_map.pop(conn.websocket, None)
+
+        still_connected = False
+        conns_map = _table_conns.get(table_id)
+        if conns_map is not None:
+            still_connected = any(c.user_id == conn.user_id for c in conns_map.values())
+
+        record = table_store.get(table_id)
+        if not still_connected and record is not None:
+            _schedule_delayed_leave(table_id, conn.user_id)
+
+        if not _table_conns.get(table_id):
+            _table_conns.pop(table_id, None)
+            _table_locks.pop(table_id, None)
+            log = _event_logs.get(table_id)
+            if record is None:
+                _event_logs.pop(table_id, None)
+            elif log is not None:
+                log.skip()
+            if table_id not in _public_streams:
+                _drop_spectator_feed(table_id)
+
+
+async def _handle_table_message(conn: _Conn, table_id: int, msg_type: Any, payload: dict[str, Any]) -> None:
+    """Apply one message that already passed ``InboundLimiter.admit``."""
+    user_id = conn.user_id
+    if msg_type == "toggle_show_all" and payload.get("show", False) == conn.show_all:
+        return  # nothing changes for this viewer, so the table lock is not needed
+
+    async def reply_error(code: str, message: str) -> None:
+        await _send_json(conn.websocket, _ws_error(code, message, table_id))
+
+    async with _get_lock(table_id):
+        record = table_store.get(table_id)
+        if record is None:
+            await reply_error("table_not_found", "Table not found")
+            return
+
+        table = record.table
+
+        if msg_type == "toggle_show_all":
+            if not table.is_spectator(user_id):
+                await reply_error("spectator_only", "Show cards is available to spectators only")
+                return
+            conn.show_all = bool(payload.get("show", False))
+            await _send_state(conn, table_id)
+            return
+
+        player_action = PlayerAction(payload["action"])
+        amount = payload.get("amount") or 0
+
+        if table.is_spectator(user_id):
+            await reply_error("spectator_cannot_act", "Spectators cannot act")
+            return
+
+        if not table.is_seated(user_id):
+            await reply_error("player_not_seated", "Player is not seated at this table")
+            return
+
+        if table.game_state is None:
+            _cancel_pending_next_hand(table_id)
+            try:
+                await _game_service.start_hand(table)
+            except Exception as exc:
+                await reply_error("start_hand_failed", str(exc))
+                return
+        elif not getattr(table.game_state, "hand_active", False):
+            await reply_error("hand_not_active", "Hand is finished. Wait for the next hand.")
+            return
+
+        try:
+            async with SessionLocal() as session:
+                await _game_service.apply_action(table, user_id, player_action, amount, session)
+        except Exception as exc:
+            await reply_error("action_failed", str(exc))
+            return
+
+        await _broadcast_state(table_id)
+        if table.game_state is not None and not getattr(table.game_state, "hand_active", False):
+            _schedule_next_hand(table_id)
+
+
+@router.websocket("/ws/tables/{table_id}")
+async def table_ws(websocket: WebSocket, table_id: str) -> None:
+    await websocket.accept()
+
+    user_id = await _authenticate(websocket)
+    if user_id is None:
         return
 
     try:
         table_id_int = int(table_id)
     except ValueError:
-        await websocket.send_text(json.dumps(_ws_error("invalid_table_id", "Invalid table_id")))
+        await _send_json(websocket, _ws_error("invalid_table_id", "Invalid table_id"))
         await websocket.close(code=1008)
         return
 
     if table_store.get(table_id_int) is None:
-        await websocket.send_text(json.dumps(_ws_error("table_not_found", "Table not found")))
+        await _send_json(websocket, _ws_error("table_not_found", "Table not found", table_id_int))
         await websocket.close(code=1008)
         return
 
-    conn = _Conn(websocket=websocket, user_id=user_id)
-    _table_conns.setdefault(table_id_int, {})[websocket] = conn
-    _cancel_pending_leave(table_id_int, user_id)
-
-    lock = _get_lock(table_id_int)
-    async with lock:
-        await _broadcast_state(table_id_int)
-
+    try:
+        last_seq = int(websocket.query_params["last_seq"]) if "last_seq" in websocket.query_params else None
+    except ValueError:
+        last_seq = None
+    conn = await _attach(table_id_int, websocket, user_id, last_seq)
+    inbound = InboundLimiter(TABLE_MESSAGE_TYPES)
     try:
         while True:
             raw = await websocket.receive_text()
             try:
-                msg = json.loads(raw)
-            except json.JSONDecodeError:
-                await websocket.send_text(json.dumps(_ws_error("invalid_json", "Invalid JSON")))
+                msg = inbound.admit(raw)
+            except MessageRejected as exc:
+                if exc.notify:
+                    await _send_json(websocket, _ws_error(exc.code, exc.message, exc.table_id))
                 continue
+            await _handle_table_message(conn, table_id_int, msg["type"], msg["payload"])
+    except WebSocketDisconnect:
+        pass
+    finally:
+        await _detach(table_id_int, conn)
 
-            msg_type = msg.get("type")
-            payload = msg.get("payload") or {}
 
-            async with lock:
-                record = table_store.get(table_id_int)
-                if record is None:
-                    await websocket.send_text(json.dumps(_ws_error("table_not_found", "Table not found")))
-                    continue
+@router.websocket("/ws")
+async def multiplex_ws(websocket: WebSocket) -> None:
+    """One socket for many tables.
 
-                table = record.table
+    Clients send ``{"type": "subscribe" | "unsubscribe", "table_id": N}`` (a subscribe may
+    carry ``last_seq`` to resume) and then the usual table messages with a ``table_id``; every
+    table frame sent back carries its ``table_id``. All subscribed tables write to the same
+    outbox.
+    """
+    await websocket.accept()
 
-                if msg_type == "toggle_show_all":
-                    is_spectator = any(s.user_id == user_id for s in table.spectators)
-                    if not is_spectator:
-                        await websocket.send_text(
-                            json.dumps(_ws_error("spectator_only", "Show cards is available to spectators only"))
-                        )
-                        continue
-                    conn.show_all = bool(payload.get("show", False))
-                    await _broadcast_state(table_id_int)
-                    continue
-
-                if msg_type != "player_action":
-                    await websocket.send_text(json.dumps(_ws_error("unknown_message_type", "Unknown message type")))
-                    continue
-
-                action_str = payload.get("action")
-                amount = payload.get("amount") or 0
-
-                is_spectator = any(s.user_id == user_id for s in table.spectators)
-                if is_spectator:
-                    await websocket.send_text(json.dumps(_ws_error("spectator_cannot_act", "Spectators cannot act")))
-                    continue
-
-                is_seated = any(p.user_id == user_id for p in table.public_players())
-                if not is_seated:
-                    await websocket.send_text(
-                        json.dumps(_ws_error("player_not_seated", "Player is not seated at this table"))
-                    )
-                    continue
-
-                if not isinstance(action_str, str):
-                    await websocket.send_text(json.dumps(_ws_error("missing_action", "Missing action")))
-                    continue
-
-                if table.game_state is None:
-                    _cancel_pending_next_hand(table_id_int)
-                    try:
-                        await _game_service.start_hand(table)
-                    except Exception as exc:
-                        await websocket.send_text(json.dumps(_ws_error("start_hand_failed", str(exc))))
-                        continue
-                elif not getattr(table.game_state, "hand_active", False):
-                    await websocket.send_text(
-                        json.dumps(_ws_error("hand_not_active", "Hand is finished. Wait for the next hand."))
-                    )
-                    continue
+    user_id = await _authenticate(websocket)
+    if user_id is None:
+        return
 
-                try:
-                    player_action = PlayerAction(action_str)
-                except ValueError:
-                    await websocket.send_text(json.dumps(_ws_error("invalid_action", "Invalid action")))
-                    continue
+    outbox = _Outbox(websocket, settings.ws_outbox_frames)
+    inbound = InboundLimiter(MULTIPLEX_MESSAGE_TYPES)
+    subscriptions: dict[int, _Conn] = {}
+    multiplex_metrics.connections += 1
+    try:
+        while True:
+            raw = await websocket.receive_text()
+            try:
+                msg = inbound.admit(raw)
+            except MessageRejected as exc:
+                if exc.notify:
+                    await _send_json(outbox, _ws_error(exc.code, exc.message, exc.table_id))
+                continue
 
-                try:
-                    async with SessionLocal() as session:
-                        await _game_service.apply_action(table, user_id, player_action, int(amount), session)
-                except Exception as exc:
-                    await websocket.send_text(json.dumps(_ws_error("action_failed", str(exc))))
-                    continue
+            msg_type = msg["type"]
+            table_id = msg.get("table_id")
+            if table_id is None:
+                await _send_json(outbox, _ws_error("invalid_table_id", "Invalid table_id"))
+                continue
 
-                await _broadcast_state(table_id_int)
-                if table.game_state is not None and not getattr(table.game_state, "hand_active", False):
-                    _schedule_next_hand(table_id_int)
+            if msg_type == "subscribe":
+                if table_id in subscriptions:
+                    await _send_state(subscriptions[table_id], table_id)
+                elif len(subscriptions) >= settings.ws_max_subscriptions:
+                    await _send_json(outbox, _ws_error("too_many_tables", "Too many subscribed tables", table_id))
+                elif table_store.get(table_id) is None:
+                    await _send_json(outbox, _ws_error("table_not_found", "Table not found", table_id))
+                else:
+                    last_seq = msg.get("last_seq")
+                    if not isinstance(last_seq, int) or isinstance(last_seq, bool):
+                        last_seq = None
+                    subscriptions[table_id] = await _attach(table_id, outbox, user_id, last_seq)
+                    multiplex_metrics.subscriptions += 1
+                continue
 
-    except WebSocketDisconnect:
+            if msg_type == "unsubscribe":
+                conn = subscriptions.pop(table_id, None)
+                if conn is not None:
+                    multiplex_metrics.subscriptions -= 1
+                    await _detach(table_id, conn)
+                continue
+
+            subscribed = subscriptions.get(table_id)
+            if subscribed is None:
+                await _send_json(outbox, _ws_error("not_subscribed", "Subscribe to the table first", table_id))
+                continue
+            await _handle_table_message(subscribed, table_id, msg_type, msg["payload"])
+    except (WebSocketDisconnect, RuntimeError):
         pass
     finally:
-        lock = _get_lock(table_id_int)
-        async with lock:
-            conns_map = _table_conns.get(table_id_int)
-            if conns_map is not None:
-                conns_map.pop(websocket, None)
-
-            still_connected = False
-            conns_map = _table_conns.get(table_id_int)
-            if conns_map is not None:
-                still_connected = any(c.user_id == user_id for c in conns_map.values())
-
-            if not still_connected:
-                record = table_store.get(table_id_int)
-                if record is not None:
-                    _schedule_delayed_leave(table_id_int, user_id)
-
-            if not _table_conns.get(table_id_int):
-                _table_conns.pop(table_id_int, None)
-                _table_locks.pop(table_id_int, None)
+        for table_id, conn in subscriptions.items():
+            await _detach(table_id, conn)
+        multiplex_metrics.subscriptions -= len(subscriptions)
+        multiplex_metrics.connections -= 1
+        outbox.close()
@@ -28,7 +28,7 @@ export default function TablePage() {
   const [betAmount, setBetAmount] = useState(200);
 
   const { status: wsStatus, state, lastError, send, reconnect, disconnect } = useTableSocket(tableId ?? null, auth.token);
-  const { displayName, ensure: ensureNames } = useUsernames(auth.token);
+  const { displayName, ensure: ensureNames, remember: rememberNames } = useUsernames(auth.token);
 
   const refreshInfo = useCallback(async () => {
     if (!tableId) return;
@@ -92,10 +92,14 @@ export default function TablePage() {
   const canAct = iAmSeated && !iAmSpectator && wsStatus === "open" && Boolean(state?.hand_active);
   const canToggleShowAll = iAmSpectator && wsStatus === "open";
 
+  useEffect(() => {
+    rememberNames([...(state?.players ?? []), ...(state?.spectators ?? [])]);
+  }, [rememberNames, state?.players, state?.spectators]);
+
   useEffect(() => {
     const ids = new Set<number>();
     if (myId) ids.add(myId);
-    for (const p of state?.players ?? []) ids.add(p.user_id);
+    for (const p of state?.players ?? []) if (!p.username) ids.add(p.user_id);
     for (const w of state?.winners ?? []) ids.add(w);
     if (info) {
       for (const s of info.seats) ids.add(s.user_id);
@@ -18,6 +18,7 @@ export type TableInfo = TableSummary & {
 
 export type TableStatePlayer = {
   user_id: number;
+  username?: string | null;
   position: number;
   stack: number;
   bet: number;
@@ -32,6 +33,7 @@ export type TableState = {
   pot: number;
   board: string[];
   players: TableStatePlayer[];
+  spectators?: Array<{ user_id: number; username?: string | null }>;
   winners?: number[];
   best_hand_rank?: string | null;
   best_hand_cards?: string[];
@@ -41,6 +43,6 @@ export type TableState = {
 };
 
 export type WsEnvelope =
-  | { type: "table_state"; payload: TableState }
-  | { type: "error"; code?: string; message: string }
+  | { type: "table_state"; table_id: number; seq: number; payload: TableState }
+  | { type: "error"; code?: string; message: string; table_id?: number }
   | { type: string; [k: string]: unknown };
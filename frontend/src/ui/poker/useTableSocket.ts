@@ -12,6 +12,7 @@ export function useTableSocket(tableId: string | null, token: string | null) {
   const connectIdRef = useRef(0);
   const openedRef = useRef(false);
   const attemptRef = useRef(0);
+  const lastSeqRef = useRef<number | null>(null);
 
   const urls = useMemo(() => {
     if (!tableId || !token) return null;
@@ -37,7 +38,8 @@ export function useTableSocket(tableId: string | null, token: string | null) {
     setLastError(null);
 
     const url = urls[Math.min(attemptRef.current, urls.length - 1)];
-    const ws = new WebSocket(url);
+    const resume = lastSeqRef.current !== null ? `&last_seq=${lastSeqRef.current}` : "";
+    const ws = new WebSocket(url + resume);
     wsRef.current = ws;
 
     ws.onopen = () => {
@@ -68,6 +70,7 @@ export function useTableSocket(tableId: string | null, token: string | null) {
         const msg = JSON.parse(String(ev.data)) as WsEnvelope;
         const msgAny = msg as any;
         if (msgAny?.type === "table_state" && msgAny?.payload) {
+          if (typeof msgAny.seq === "number") lastSeqRef.current = msgAny.seq;
           setState(msgAny.payload as TableState);
         } else if (msgAny?.type === "error") {
           const message = typeof msgAny?.message === "string" ? msgAny.message : "WebSocket error";
@@ -83,6 +86,7 @@ export function useTableSocket(tableId: string | null, token: string | null) {
   useEffect(() => {
     if (!urls) return;
     attemptRef.current = 0;
+    lastSeqRef.current = null;
     connect();
     return () => disconnect();
   }, [connect, disconnect, urls]);
@@ -3,6 +3,9 @@ import { apiGet } from "@/ui/lib/http";
 
 export type UserPublic = { id: number; username: string };
 
+// Mirrors the backend's users_batch_max_ids: larger requests are rejected with 400.
+const USERS_BATCH_MAX_IDS = 100;
+
 export function useUsernames(token: string | null) {
   const [names, setNames] = useState<Record<number, string>>({});
   const inflight = useRef<Set<number>>(new Set());
@@ -15,26 +18,47 @@ export function useUsernames(token: string | null) {
       if (missing.length === 0) return;
 
       missing.forEach((id) => inflight.current.add(id));
-      try {
-        const results = await Promise.allSettled(missing.map((id) => apiGet<UserPublic>(`/users/${id}`, token)));
-        setNames((prev) => {
-          const next = { ...prev };
-          for (const r of results) {
-            if (r.status === "fulfilled") next[r.value.id] = r.value.username;
-          }
-          return next;
-        });
-      } finally {
-        missing.forEach((id) => inflight.current.delete(id));
+      const batches: number[][] = [];
+      for (let i = 0; i < missing.length; i += USERS_BATCH_MAX_IDS) {
+        batches.push(missing.slice(i, i + USERS_BATCH_MAX_IDS));
       }
+      await Promise.all(
+        batches.map(async (batch) => {
+          try {
+            const users = await apiGet<UserPublic[]>(`/users?ids=${batch.join(",")}`, token);
+            setNames((prev) => {
+              const next = { ...prev };
+              for (const u of users) next[u.id] = u.username;
+              return next;
+            });
+          } catch {
+            // Names are cosmetic; fall back to "#id" until the next attempt.
+          } finally {
+            batch.forEach((id) => inflight.current.delete(id));
+          }
+        }),
+      );
     },
     [names, token],
   );
 
+  const remember = useCallback((entries: Array<{ user_id: number; username?: string | null }>) => {
+    setNames((prev) => {
+      let next: Record<number, string> | null = null;
+      for (const e of entries) {
+        if (e.username && prev[e.user_id] !== e.username) {
+          next = next ?? { ...prev };
+          next[e.user_id] = e.username;
+        }
+      }
+      return next ?? prev;
+    });
+  }, []);
+
   const displayName = useMemo(() => {
     return (userId: number) => names[userId] ?? `#${userId}`;
   }, [names]);
 
-  return { names, ensure, displayName };
+  return { names, ensure, remember, displayName };
 }
 